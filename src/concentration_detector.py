@@ -1,14 +1,31 @@
 # concentration_detector.py
 import cv2
+import time
 import logging
-from typing import Tuple, Dict
+import threading
+import numpy as np
+from typing import Tuple, Dict, List, Optional
 
 from src.modules.face_mesh_processor import FaceMeshProcessor
+from src.modules.landmark_features import (FaceFeatures, F_YAW, F_PITCH, F_ROLL,
+                                           extract_features, gather_landmarks, gaze_vector)
+from src.modules.landmark_filter import LandmarkFilterBank
 from src.modules.eye_analyzer import EyeAnalyzer
 from src.modules.head_pose_analyzer import HeadPoseAnalyzer
 from src.modules.concentration_analyzer import ConcentrationAnalyzer
 from src.modules.result_smoother import ResultSmoother
 from src.modules.performance_tracker import PerformanceTracker
+from src.modules.rule_engine import RuleEngine, DEFAULT_RULES, HEAD_POSE_ANGLE_RULES
+from src.modules.head_pose_estimator import HeadPoseEstimator
+from src.modules.sampling_profiler import SamplingProfiler
+from src.modules.event_stream import TransitionEventStream
+from src.modules.eye_state_engine import EyeState, EyeStateEngine
+from src.modules.detector_config import DetectorConfig, BACKEND_FIELDS, MESH_FIELDS
+from src.modules.landmark_backends import LandmarkBackend, MediaPipeBackend, ReplayBackend, SyntheticBackend
+from src.modules.motion_gate import MotionGate
+from src.modules.runtime_tuning import CoreLayout, apply_layout
+from src.modules.attention_heatmap import AttentionHeatmap
+from src.modules.session_state import decode_state, encode_state
 
 logger = logging.getLogger(__name__)
 
@@ -23,19 +40,186 @@ class ConcentrationDetector:
                  gaze_ratio_threshold: float = 0.55,
                  iris_alignment_threshold: float = 0.14,
                  ear_threshold: float = 0.25,
-                 history_size: int = 30):
+                 history_size: int = 30,
+                 vote_window: int = 5,
+                 landmark_filtering: bool = False,
+                 refine_landmarks: bool = True,
+                 inference_scale: float = 1.0,
+                 inference_stride: int = 1,
+                 use_head_pose_angles: bool = False,
+                 vertical_gaze_threshold: float = 0.7,
+                 landmark_backend: str = "mediapipe",
+                 landmark_source: str = ""):
         """Initialize all components with configurable parameters."""
         
         # Initialize components
-        self.face_processor = FaceMeshProcessor(detection_confidence, tracking_confidence)
+        self.landmark_backend = self._create_backend(landmark_backend, landmark_source, detection_confidence,
+                                                     tracking_confidence, refine_landmarks)
         self.eye_analyzer = EyeAnalyzer(ear_threshold)
         self.head_analyzer = HeadPoseAnalyzer(face_tilt_threshold, head_pose_threshold)
-        self.concentration_analyzer = ConcentrationAnalyzer(gaze_ratio_threshold, iris_alignment_threshold)
-        self.smoother = ResultSmoother(history_size)
+        self.concentration_analyzer = ConcentrationAnalyzer(gaze_ratio_threshold, iris_alignment_threshold,
+                                                            vertical_gaze_threshold)
+        self.smoother = ResultSmoother(history_size, vote_window)
         self.performance_tracker = PerformanceTracker()
         
+        # solvePnP head pose gives scale-independent tilt/turn thresholds in degrees
+        self.head_pose_estimator = HeadPoseEstimator() if use_head_pose_angles else None
+        self.rule_engine = RuleEngine(HEAD_POSE_ANGLE_RULES if use_head_pose_angles else DEFAULT_RULES)
+        
+        # Streaming blink / PERCLOS statistics per face, refreshed by process_frame
+        self.eye_state_engine = EyeStateEngine(close_threshold=ear_threshold,
+                                               open_threshold=ear_threshold + 0.03)
+        self.eye_states: Dict[int, EyeState] = {}
+        
+        # Optional One-Euro filtering of landmarks; lets vote_window shrink for faster reactions
+        self.landmark_filter = LandmarkFilterBank() if landmark_filtering else None
+        
+        # Quality knobs, adjusted at runtime by the QualityController
+        self.inference_scale = inference_scale
+        self.inference_stride = inference_stride
+        self.refine_landmarks = refine_landmarks
+        self._last_faces = None
+        self._frames_since_inference = 0
+        
+        # Skips Face Mesh on still or empty scenes, enabled with enable_motion_gating()
+        self.motion_gate: Optional[MotionGate] = None
+        
+        # On-demand sampling profiler; created only when a profile is requested
+        self.profiler: Optional[SamplingProfiler] = None
+        self._profile_request = None
+        
+        # Session gaze histogram, enabled with enable_attention_heatmap()
+        self.attention_heatmap: Optional[AttentionHeatmap] = None
+        
+        # Debounced state-transition events, enabled with enable_events()
+        self.event_stream: Optional[TransitionEventStream] = None
+        # Timestamp of the last processed frame; ends the episode flushed on cleanup
+        self._last_timestamp: Optional[float] = None
+        
+        # Settings in effect; request_config() swaps in new ones between frames
+        self.config = DetectorConfig(
+            detection_confidence=detection_confidence, tracking_confidence=tracking_confidence,
+            refine_landmarks=refine_landmarks, face_tilt_threshold=face_tilt_threshold,
+            head_pose_threshold=head_pose_threshold, gaze_ratio_threshold=gaze_ratio_threshold,
+            iris_alignment_threshold=iris_alignment_threshold,
+            vertical_gaze_threshold=vertical_gaze_threshold, ear_threshold=ear_threshold,
+            history_size=history_size, vote_window=vote_window,
+            inference_scale=inference_scale, inference_stride=inference_stride,
+            landmark_backend=landmark_backend, landmark_source=landmark_source)
+        self._pending_config: Optional[DetectorConfig] = None
+        
         logger.info("ConcentrationDetector initialized successfully")
     
+    @staticmethod
+    def _create_backend(name: str, source: str, detection_confidence: float, tracking_confidence: float,
+                        refine_landmarks: bool) -> LandmarkBackend:
+        """Build a landmark backend by its DetectorConfig name."""
+        if name == 'synthetic':
+            return SyntheticBackend()
+        if name == 'replay':
+            return ReplayBackend(source)
+        if name != 'mediapipe':
+            raise ValueError(f"Unknown landmark backend: {name}")
+        return MediaPipeBackend(FaceMeshProcessor(detection_confidence, tracking_confidence, refine_landmarks))
+    
+    @property
+    def face_processor(self):
+        """FaceMeshProcessor of the MediaPipe backend; None with other backends."""
+        return getattr(self.landmark_backend, 'processor', None)
+    
+    def set_landmark_backend(self, backend: LandmarkBackend) -> LandmarkBackend:
+        """
+        Detect landmarks with `backend` from the next frame on.
+        
+        Returns the previous backend without cleaning it up, so it can be wrapped
+        (e.g. by RecordingBackend) or reused.
+        """
+        previous, self.landmark_backend = self.landmark_backend, backend
+        self._last_faces = None
+        return previous
+    
+    @classmethod
+    def from_config(cls, config: DetectorConfig, **kwargs) -> "ConcentrationDetector":
+        """Create a detector from a validated DetectorConfig."""
+        config.validate()
+        settings = config._asdict()
+        roll_threshold = settings.pop('roll_threshold')
+        yaw_threshold = settings.pop('yaw_threshold')
+        detector = cls(**settings, **kwargs)
+        detector.head_analyzer.roll_threshold = roll_threshold
+        detector.head_analyzer.yaw_threshold = yaw_threshold
+        detector.config = config
+        return detector
+    
+    def request_config(self, config: DetectorConfig):
+        """Apply `config` before the next frame; safe to call from other threads."""
+        self._pending_config = config.validate()
+    
+    def apply_config(self, config: DetectorConfig) -> List[str]:
+        """
+        Apply new settings now, keeping smoothing and tracking state.
+        
+        Face Mesh is rebuilt only when one of its settings changed, and the landmark
+        backend is replaced only when it or its source changed. Call from the
+        processing thread (or use request_config). Returns the changed settings.
+        """
+        config.validate()
+        changed = config.changed_fields(self.config)
+        if not changed:
+            return changed
+        
+        self.eye_analyzer.ear_threshold = config.ear_threshold
+        self.head_analyzer.face_tilt_threshold = config.face_tilt_threshold
+        self.head_analyzer.head_pose_threshold = config.head_pose_threshold
+        self.head_analyzer.roll_threshold = config.roll_threshold
+        self.head_analyzer.yaw_threshold = config.yaw_threshold
+        self.concentration_analyzer.gaze_ratio_threshold = config.gaze_ratio_threshold
+        self.concentration_analyzer.iris_alignment_threshold = config.iris_alignment_threshold
+        self.concentration_analyzer.vertical_gaze_threshold = config.vertical_gaze_threshold
+        self.smoother.resize(config.history_size, config.vote_window)
+        
+        if 'ear_threshold' in changed:
+            for tracker in self.eye_state_engine.trackers.values():
+                tracker.close_threshold = config.ear_threshold
+                tracker.open_threshold = config.ear_threshold + 0.03
+            self.eye_state_engine.tracker_kwargs.update(close_threshold=config.ear_threshold,
+                                                        open_threshold=config.ear_threshold + 0.03)
+        
+        # Only touch quality knobs the config changed, so QualityController adjustments survive
+        if 'refine_landmarks' in changed:
+            self.refine_landmarks = config.refine_landmarks
+        if any(name in changed for name in BACKEND_FIELDS):
+            backend = self._create_backend(config.landmark_backend, config.landmark_source,
+                                           config.detection_confidence, config.tracking_confidence,
+                                           self.refine_landmarks)
+            self.set_landmark_backend(backend).cleanup()
+        elif any(name in changed for name in MESH_FIELDS):
+            self.landmark_backend.reconfigure(config.detection_confidence, config.tracking_confidence,
+                                              self.refine_landmarks)
+            self._last_faces = None
+        
+        if 'inference_scale' in changed:
+            self.set_quality(inference_scale=config.inference_scale)
+        if 'inference_stride' in changed:
+            self.set_quality(inference_stride=config.inference_stride)
+        
+        self.config = config
+        logger.info(f"Config applied: {', '.join(changed)}")
+        return changed
+    
+    def get_rule_params(self) -> Dict[str, float]:
+        """Collect the thresholds the concentration rules are evaluated with."""
+        return {
+            'ear_threshold': self.eye_analyzer.ear_threshold,
+            'face_tilt_threshold': self.head_analyzer.face_tilt_threshold,
+            'head_pose_threshold': self.head_analyzer.head_pose_threshold,
+            'gaze_ratio_threshold': self.concentration_analyzer.gaze_ratio_threshold,
+            'iris_alignment_threshold': self.concentration_analyzer.iris_alignment_threshold,
+            'roll_threshold': self.head_analyzer.roll_threshold,
+            'yaw_threshold': self.head_analyzer.yaw_threshold,
+            'vertical_gaze_threshold': self.concentration_analyzer.vertical_gaze_threshold
+        }
+    
     def is_concentrated(self, face_landmarks, frame_width: int, frame_height: int) -> Tuple[bool, str, float]:
         """
         Determine if the user is concentrated based on gaze and head pose.
@@ -44,59 +228,164 @@ class ConcentrationDetector:
             tuple: (is_concentrated: bool, status_message: str, confidence: float)
         """
         try:
-            # Check for blinks first
-            if self.eye_analyzer.detect_blinks(face_landmarks, frame_width, frame_height):
-                return False, "Eyes Closed", 0.0
-            
-            # Check face tilt
-            is_tilted, tilt_confidence = self.head_analyzer.check_face_tilt(face_landmarks, frame_width, frame_height)
-            if is_tilted:
-                return False, "Face Tilted", tilt_confidence
-            
-            # Calculate gaze ratios
-            try:
-                left_gaze_ratio, right_gaze_ratio = self.eye_analyzer.calculate_gaze_ratios(
-                    face_landmarks, frame_width, frame_height)
-            except ValueError as e:
-                return False, str(e), 0.0
-            
-            # Analyze head pose
-            has_head_turn, head_direction, _ = self.head_analyzer.analyze_head_pose(face_landmarks)
-            
-            # Analyze concentration based on gaze and head pose
-            if has_head_turn:
-                return self.concentration_analyzer.analyze_gaze_direction(
-                    left_gaze_ratio, right_gaze_ratio, head_direction)
-            else:
-                return self.concentration_analyzer.analyze_gaze_direction(
-                    left_gaze_ratio, right_gaze_ratio, "center")
-            
+            points = gather_landmarks(face_landmarks)
         except Exception as e:
-            logger.error(f"Error in concentration detection: {e}")
+            logger.error("Error in concentration detection: %s", e)
             return False, "Detection Error", 0.0
+        
+        return self.is_concentrated_points(points, frame_width, frame_height)
+    
+    def is_concentrated_points(self, points: np.ndarray, frame_width: int,
+                               frame_height: int, face_id: int = 0) -> Tuple[bool, str, float]:
+        """Determine concentration from landmarks gathered with LANDMARK_INDICES."""
+        return self._evaluate_points(points, frame_width, frame_height, face_id)[1]
+    
+    def _evaluate_points(self, points: np.ndarray, frame_width: int, frame_height: int,
+                         face_id: int) -> Tuple[Optional[FaceFeatures], Tuple[bool, str, float]]:
+        """Compute a face's features and concentration decision; features are None on error."""
+        try:
+            # Compute every feature in one pass, then let the first matching rule decide
+            vector = extract_features(points, frame_width, frame_height)
+            if self.head_pose_estimator is not None:
+                pose = self.head_pose_estimator.estimate(points, frame_width, frame_height, face_id)
+                if pose is not None:
+                    vector[F_YAW], vector[F_PITCH], vector[F_ROLL] = pose
+            features = FaceFeatures.from_vector(vector)
+            return features, self.rule_engine.evaluate(features, self.get_rule_params())
+            
+        except Exception as e:
+            logger.error("Error in concentration detection: %s", e)
+            return None, (False, "Detection Error", 0.0)
     
-    def process_frame(self, frame):
-        """Process a single frame and return concentration status."""
+    def is_concentrated_batch(self, points: np.ndarray, frame_width: int,
+                              frame_height: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Vectorized concentration decisions for a batch of faces.
+        
+        Args:
+            points: (N, K, 3) landmarks gathered with LANDMARK_INDICES
+        
+        Returns:
+            tuple: (is_concentrated, rule_index, confidence) arrays; map rule_index
+            to a status message with rule_engine.reasons
+        """
+        features = extract_features(points, frame_width, frame_height)
+        if self.head_pose_estimator is not None:
+            for i, face_points in enumerate(points):
+                pose = self.head_pose_estimator.estimate(face_points, frame_width, frame_height, face_id=None)
+                if pose is not None:
+                    features[i, F_YAW:F_ROLL + 1] = pose
+        return self.rule_engine.evaluate_batch(features, self.get_rule_params())
+    
+    def set_quality(self, inference_scale: float = None, inference_stride: int = None,
+                    refine_landmarks: bool = None):
+        """Apply runtime quality settings; arguments left as None are unchanged."""
+        if inference_scale is not None:
+            self.inference_scale = inference_scale
+        if inference_stride is not None:
+            self.inference_stride = max(1, inference_stride)
+        if refine_landmarks is not None:
+            self.refine_landmarks = refine_landmarks
+            self.landmark_backend.set_refine_landmarks(refine_landmarks)
+            self._last_faces = None
+    
+    def _run_inference(self, frame) -> List[np.ndarray]:
+        """Run the landmark backend on the frame."""
+        if not self.landmark_backend.uses_pixels:
+            return self.landmark_backend.detect(None)
+        
+        # Landmarks are normalized, so a downscaled input needs no remapping
+        if self.inference_scale != 1.0:
+            frame = cv2.resize(frame, None, fx=self.inference_scale, fy=self.inference_scale,
+                               interpolation=cv2.INTER_AREA)
+        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        
+        return self.landmark_backend.detect(frame_rgb)
+    
+    def _detect_faces(self, frame, timestamp: float) -> List[np.ndarray]:
+        """
+        Return gathered landmarks for each face in the frame.
+        
+        Between strided inferences the previous landmarks are reused, or predicted
+        forward when landmark filtering is enabled.
+        """
+        if self._last_faces is not None and self._frames_since_inference < self.inference_stride - 1:
+            self._frames_since_inference += 1
+            self.landmark_backend.skip_frame()
+            if self.landmark_filter is None:
+                return self._last_faces
+            
+            predicted = [self.landmark_filter.predict(face_id, timestamp)
+                         for face_id in range(len(self._last_faces))]
+            return [points if points is not None else last
+                    for points, last in zip(predicted, self._last_faces)]
+        
+        # Nothing moved since the last inference, so its landmarks still hold
+        if self.motion_gate is not None:
+            if self._last_faces is None:
+                self.motion_gate.reset()
+            if not self.motion_gate.should_infer(frame, timestamp):
+                self.landmark_backend.skip_frame()
+                return self._last_faces
+        
+        faces = self._run_inference(frame)
+        if self.motion_gate is not None:
+            self.motion_gate.report_faces(len(faces), timestamp)
+        
+        if self.landmark_filter is not None:
+            faces = [self.landmark_filter.filter(face_id, points, timestamp)
+                     for face_id, points in enumerate(faces)]
+        
+        self._last_faces = faces
+        self._frames_since_inference = 0
+        return faces
+    
+    def process_frame(self, frame, capture_time: float = None, timestamp: float = None):
+        """
+        Process a single frame and return concentration status.
+        
+        If capture_time (time.perf_counter) is given, the recorded latency is
+        measured from capture rather than from the start of processing.
+        `timestamp` (seconds) times filtering, blinks and motion gating instead of
+        the processing time, e.g. the frame's position in a recording.
+        """
+        start_time = capture_time if capture_time is not None else time.perf_counter()
+        if timestamp is None:
+            timestamp = start_time
         self.performance_tracker.increment_frame()
+        if self._profile_request is not None:
+            self._start_requested_profile()
+        if self._pending_config is not None:
+            config, self._pending_config = self._pending_config, None
+            self.apply_config(config)
         
         # Mirror the frame for better user experience
         frame = cv2.flip(frame, 1)
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
         frame_height, frame_width = frame.shape[:2]
         
         # Process frame
-        results = self.face_processor.process_frame(frame_rgb)
+        faces = self._detect_faces(frame, timestamp)
         
         concentration_status = "No Face Detected"
         status_color = (0, 0, 255)  # Red
         confidence = 0.0
+        smoothed_concentrated = False
+        status_msg = concentration_status
+        self.eye_states = {}
         
-        if results.multi_face_landmarks:
-            for face_landmarks in results.multi_face_landmarks:
-                is_concentrated, status_msg, conf = self.is_concentrated(
-                    face_landmarks, frame_width, frame_height
+        if faces:
+            for face_id, points in enumerate(faces):
+                features, (is_concentrated, status_msg, conf) = self._evaluate_points(
+                    points, frame_width, frame_height, face_id
                 )
                 
+                # Blink events and PERCLOS from the same EARs
+                if features is not None:
+                    self.eye_states[face_id] = self.eye_state_engine.update(
+                        face_id, features.left_ear, features.right_ear, timestamp)
+                    if self.attention_heatmap is not None:
+                        self.attention_heatmap.add(*gaze_vector(np.asarray(features)))
+                
                 # Apply smoothing
                 smoothed_concentrated = self.smoother.smooth_result(is_concentrated)
                 
@@ -109,18 +398,206 @@ class ConcentrationDetector:
                 
                 confidence = conf
         
+        if self.event_stream is not None:
+            self.event_stream.update(smoothed_concentrated, status_msg, confidence, timestamp)
+        self._last_timestamp = timestamp
+        
+        self.performance_tracker.record_latency(time.perf_counter() - start_time)
         return frame, concentration_status, status_color, confidence
     
+    def get_eye_state(self, face_id: int = 0) -> Optional[EyeState]:
+        """Blink and PERCLOS statistics of a face as of the last processed frame."""
+        return self.eye_states.get(face_id)
+    
+    def enable_events(self, min_duration: float = 1.0, cooldown: float = 0.0,
+                      callback=None, queue_size: int = 0) -> TransitionEventStream:
+        """Emit debounced transition events instead of requiring consumers to poll every frame."""
+        if self.event_stream is None:
+            self.event_stream = TransitionEventStream(min_duration, cooldown, queue_size=queue_size)
+        if callback is not None:
+            self.event_stream.subscribe(callback)
+        return self.event_stream
+    
+    def enable_attention_heatmap(self, **heatmap_kwargs) -> AttentionHeatmap:
+        """Accumulate every face's 2D gaze point into a session heatmap (see AttentionHeatmap)."""
+        if self.attention_heatmap is None:
+            self.attention_heatmap = AttentionHeatmap(**heatmap_kwargs)
+        return self.attention_heatmap
+    
+    def enable_motion_gating(self, callback=None, **gate_kwargs) -> MotionGate:
+        """
+        Run Face Mesh only when the scene changes, and back off further when nobody is there.
+        
+        `callback(idle)` is called when the gate enters or leaves the idle state, e.g.
+        to lower the camera frame rate. See MotionGate for the keyword arguments.
+        """
+        if self.motion_gate is None:
+            self.motion_gate = MotionGate(**gate_kwargs)
+        if callback is not None:
+            self.motion_gate.subscribe(callback)
+        return self.motion_gate
+    
+    def apply_core_layout(self, layout: CoreLayout) -> bool:
+        """
+        Confine this detector to a CoreLayout (see runtime_tuning.plan_layouts).
+        
+        Call from the processing thread: it sets OpenCV's thread count, pins the
+        thread and restarts Face Mesh so MediaPipe's workers inherit the cores.
+        Returns True if the thread was pinned.
+        """
+        pinned = apply_layout(layout)
+        self.landmark_backend.restart()
+        self._last_faces = None
+        logger.info(f"Core layout applied: cores={list(layout.cores)}, opencv_threads={layout.opencv_threads}")
+        return pinned
+    
+    def request_profile(self, duration: float = 10.0, output_path: Optional[str] = None,
+                        all_threads: bool = False):
+        """
+        Profile the next `duration` seconds of processing.
+        
+        Only records the request, so it is safe to call from signal handlers and
+        other threads; sampling starts at the next process_frame call and follows
+        the thread that runs it unless all_threads is set.
+        """
+        self._profile_request = (duration, output_path, all_threads)
+    
+    def _start_requested_profile(self):
+        duration, output_path, all_threads = self._profile_request
+        self._profile_request = None
+        if self.profiler is None:
+            self.profiler = SamplingProfiler()
+        self.profiler.start(duration, output_path, None if all_threads else threading.get_ident())
+    
+    def stop_profiling(self) -> Optional[str]:
+        """Stop a running profile early; returns the path of the written profile."""
+        self._profile_request = None
+        if self.profiler is None or not self.profiler.running:
+            return None
+        return self.profiler.stop()
+    
     def get_performance_stats(self) -> Dict[str, float]:
         """Get performance statistics."""
         return self.performance_tracker.get_stats()
     
+    def get_state(self) -> dict:
+        """
+        JSON-serializable per-session state: config, smoothing history, stride
+        position, landmark filter and head pose warm starts, backend position,
+        blink and PERCLOS trackers, event debouncing, motion gate and heatmap.
+        
+        Restoring it with set_state() continues the session exactly where it was.
+        MediaPipe's internal tracking is not included; Face Mesh re-detects the
+        face on the first frame after a restore. Subscribers, profiling and
+        performance counters belong to the process and are not included either.
+        """
+        return {
+            'config': self.config._asdict(),
+            'inference_scale': self.inference_scale,
+            'inference_stride': self.inference_stride,
+            'refine_landmarks': self.refine_landmarks,
+            'smoother': self.smoother.get_state(),
+            'last_faces': None if self._last_faces is None else [points.tolist() for points in self._last_faces],
+            'frames_since_inference': self._frames_since_inference,
+            'landmark_filter': None if self.landmark_filter is None else self.landmark_filter.get_state(),
+            'head_pose': None if self.head_pose_estimator is None else self.head_pose_estimator.get_state(),
+            'backend': self.landmark_backend.get_state(),
+            'eye_states': self.eye_state_engine.export_state(),
+            'event_stream': None if self.event_stream is None else self.event_stream.get_state(),
+            'motion_gate': None if self.motion_gate is None else self.motion_gate.get_state(),
+            'attention_heatmap': None if self.attention_heatmap is None else self.attention_heatmap.get_state()
+        }
+    
+    def set_state(self, state: dict, time_offset: float = 0.0):
+        """
+        Restore state from get_state(); call from the processing thread.
+        
+        `time_offset` is added to saved frame timestamps, for when the clock that
+        timed them (time.perf_counter by default) differs in this process.
+        Events, motion gating and the heatmap are enabled (with default settings)
+        if the state has them and this detector does not.
+        """
+        self.apply_config(DetectorConfig(**state['config']))
+        self.set_quality(inference_scale=state['inference_scale'], inference_stride=state['inference_stride'],
+                         refine_landmarks=state.get('refine_landmarks', self.refine_landmarks))
+        self.smoother.set_state(state['smoother'])
+        self.landmark_backend.set_state(state['backend'])
+        
+        last_faces = state['last_faces']
+        self._last_faces = None if last_faces is None else [np.array(points, dtype=np.float64)
+                                                             for points in last_faces]
+        self._frames_since_inference = state['frames_since_inference']
+        if self.landmark_filter is not None and state['landmark_filter'] is not None:
+            self.landmark_filter.set_state(state['landmark_filter'], time_offset)
+        elif state['landmark_filter'] is not None:
+            logger.warning("Restored state has landmark filters, but landmark filtering is disabled")
+        if self.head_pose_estimator is not None and state['head_pose'] is not None:
+            self.head_pose_estimator.set_state(state['head_pose'])
+        elif state['head_pose'] is not None:
+            logger.warning("Restored state has head pose tracking, but head pose angles are disabled")
+        
+        # Absent from checkpoints written before these were included
+        self.eye_state_engine.import_state(state.get('eye_states', {}), time_offset)
+        self.eye_states = {face_id: tracker.state() for face_id, tracker in self.eye_state_engine.trackers.items()}
+        if state.get('event_stream') is not None:
+            if self.event_stream is None:
+                logger.info("Enabling transition events to restore their state")
+            self.enable_events().set_state(state['event_stream'], time_offset)
+        if state.get('motion_gate') is not None:
+            if self.motion_gate is None:
+                logger.info("Enabling motion gating to restore its state")
+            self.enable_motion_gating().set_state(state['motion_gate'], time_offset)
+        heatmap_state = state.get('attention_heatmap')
+        if heatmap_state is not None:
+            if self.attention_heatmap is None:
+                logger.info("Enabling the attention heatmap to restore its counts")
+                bins_y, bins_x = heatmap_state['counts']['shape']
+                self.enable_attention_heatmap(bins=(bins_x, bins_y),
+                                              x_range=tuple(heatmap_state.get('x_range', (0.0, 1.0))),
+                                              y_range=tuple(heatmap_state.get('y_range', (0.0, 1.0))))
+            self.attention_heatmap.set_state(heatmap_state)
+    
+    def snapshot(self, timestamp: Optional[float] = None) -> bytes:
+        """
+        Compact message holding get_state(), for moving the session to another worker.
+        
+        `timestamp` is the current time on the clock passed to process_frame(), if
+        frames are timed with one; time.perf_counter() otherwise.
+        """
+        state = self.get_state()
+        state['clock'] = time.perf_counter() if timestamp is None else timestamp
+        return encode_state(state)
+    
+    def restore(self, data: bytes, timestamp: Optional[float] = None):
+        """
+        Continue a session from snapshot(), possibly taken in another process.
+        
+        Saved timestamps are shifted so the snapshot's time maps to `timestamp`
+        (time.perf_counter() by default); smoothing and blink windows continue as
+        if the session had never moved.
+        """
+        state = decode_state(data)
+        now = time.perf_counter() if timestamp is None else timestamp
+        self.set_state(state, time_offset=now - state['clock'])
+    
     def reset_history(self):
         """Reset the smoothing history."""
         self.smoother.clear_history()
+        if self.landmark_filter is not None:
+            self.landmark_filter.reset()
+        if self.head_pose_estimator is not None:
+            self.head_pose_estimator.reset()
+        self.eye_state_engine.reset()
+        self.eye_states.clear()
+        if self.motion_gate is not None:
+            self.motion_gate.reset()
         logger.info("Detection history reset")
     
     def cleanup(self):
         """Clean up all resources."""
-        self.face_processor.cleanup()
+        self.landmark_backend.cleanup()
+        self.performance_tracker.disable_resource_monitoring()
+        self.stop_profiling()
+        if self.event_stream is not None:
+            self.event_stream.flush(time.perf_counter() if self._last_timestamp is None else self._last_timestamp)
         logger.info("ConcentrationDetector cleaned up")
\ No newline at end of file
@@ -1,39 +1,324 @@
 # concentration_detector.py
+import os
 import cv2
+import time
+import signal
+import argparse
 import logging
 
 from src.concentration_detector import ConcentrationDetector
+from src.modules.batch_scoring import JobManifest
 from src.modules.camera_manager import CameraManager
+from src.modules.deadline_scheduler import DeadlineScheduler
+from src.modules.detector_config import ConfigWatcher, load_config
 from src.modules.display_manager import DisplayManager
+from src.modules.frame_source import open_source
+from src.modules.landmark_backends import RecordingBackend
+from src.modules.landmark_transport import CentralScorer, CentralServer, EdgeSender
+from src.modules.pipeline_logging import PipelineLogging
+from src.modules.quality_controller import QualityController
+from src.modules.runtime_tuning import benchmark_layouts, plan_layouts, set_opencv_threads, source_workload
+from src.modules.threaded_frame_reader import ThreadedFrameReader
+from src.modules.video_recorder import VideoRecorder
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-def main():
-    """Main function to run the concentration detection system."""
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Real-time concentration detection")
+    parser.add_argument("--source", default="0",
+                        help="Camera index, video file or directory of images (default: camera 0)")
+    parser.add_argument("--mjpeg", action="store_true",
+                        help="Capture the camera as MJPG at 1280x720 and decode JPEGs on a thread pool")
+    parser.add_argument("--decode-scale", type=int, default=1, choices=(1, 2, 4, 8),
+                        help="With --mjpeg, decode frames at 1/N of the capture size")
+    parser.add_argument("--prefetch", type=int, default=8,
+                        help="Frames to decode ahead for file sources")
+    parser.add_argument("--target-fps", type=float, default=None,
+                        help="Lower camera and inference quality when the loop falls below this rate")
+    parser.add_argument("--latency-slo", type=float, default=None, metavar="SECONDS",
+                        help="Lower camera and inference quality when p95 frame latency exceeds this")
+    parser.add_argument("--config", default=None, metavar="PATH",
+                        help="JSON detector config; edits are applied while running")
+    parser.add_argument("--motion-gating", action="store_true",
+                        help="Skip face detection on still or empty scenes")
+    parser.add_argument("--idle-fps", type=float, default=5.0,
+                        help="Camera frame rate while no face has been seen for a while (with --motion-gating)")
+    parser.add_argument("--record", default=None, metavar="DIR",
+                        help="Save the annotated video to this directory")
+    parser.add_argument("--record-events", action="store_true",
+                        help="With --record, only save clips around distraction episodes")
+    parser.add_argument("--pre-roll", type=float, default=5.0,
+                        help="Seconds kept before each distraction clip")
+    parser.add_argument("--post-roll", type=float, default=5.0,
+                        help="Seconds recorded after each distraction ends")
+    parser.add_argument("--record-landmarks", default=None, metavar="PATH",
+                        help="Save each frame's landmarks to this .npz file for the replay backend")
+    parser.add_argument("--heatmap", default=None, metavar="PATH",
+                        help="Save the session's gaze heatmap to this .npz file on exit")
+    parser.add_argument("--monitor-resources", type=float, default=0, metavar="SECONDS",
+                        help="Sample memory, fds and threads at this interval; SIGUSR1 logs a report")
+    parser.add_argument("--trace-allocations", action="store_true",
+                        help="With --monitor-resources, also report top allocation sites (slows the loop)")
+    parser.add_argument("--layout", default=None, metavar="I/N",
+                        help="Run as instance I of N detectors on this host, pinned to its share of the cores")
+    parser.add_argument("--opencv-threads", type=int, default=None,
+                        help="OpenCV thread pool size (default: one per core of the --layout share)")
+    parser.add_argument("--benchmark-layouts", type=int, default=0, metavar="N",
+                        help="Benchmark thread and pinning layouts for N instances, print the best and exit")
+    parser.add_argument("--send-landmarks", default=None, metavar="HOST:PORT",
+                        help="Edge mode: run only Face Mesh and send landmarks to a central service")
+    parser.add_argument("--stream-id", type=int, default=None,
+                        help="Stream ID reported with --send-landmarks, unique among the edges")
+    parser.add_argument("--serve-landmarks", type=int, default=None, metavar="PORT",
+                        help="Central mode: score landmarks received from edge devices")
+    parser.add_argument("--batch", nargs="+", default=None, metavar="SOURCE",
+                        help="Score video files or image directories to CSV, resuming unfinished jobs")
+    parser.add_argument("--batch-output", default="batch_scores", metavar="DIR",
+                        help="Output directory and job manifest location for --batch")
+    parser.add_argument("--checkpoint-interval", type=int, default=300, metavar="FRAMES",
+                        help="Frames between --batch checkpoints")
+    parser.add_argument("--schedule", nargs="+", default=None, metavar="SOURCE",
+                        help="Serve several sources from one inference worker, earliest deadline first")
+    parser.add_argument("--priorities", nargs="+", type=int, default=None, metavar="CLASS",
+                        help="Priority class per --schedule source (0 is most important)")
+    parser.add_argument("--deadline", type=float, default=0.1, metavar="SECONDS",
+                        help="Time from capture by which a --schedule result is due")
+    parser.add_argument("--log-burst", type=int, default=5,
+                        help="Repeats of one log message allowed per --log-interval before suppression")
+    parser.add_argument("--log-interval", type=float, default=10.0,
+                        help="Seconds per log rate-limit window")
+    parser.add_argument("--profile-seconds", type=float, default=10.0,
+                        help="Length of the sampling profile started with 'p' or SIGUSR2")
+    return parser.parse_args(argv)
+
+def run_edge(args):
+    """Capture frames and ship their landmarks to the central service."""
+    if args.stream_id is None:
+        raise ValueError("--send-landmarks needs a --stream-id that no other edge uses")
+    host, port = args.send_landmarks.rsplit(':', 1)
+    source = open_source(args.source, prefetch_depth=args.prefetch, mjpeg=args.mjpeg,
+                         decode_scale=args.decode_scale)
+    sender = EdgeSender(host, int(port), args.stream_id)
+    try:
+        while True:
+            ret, frame = source.read_frame()
+            if not ret:
+                logger.info("End of source reached")
+                break
+            sender.process_frame(frame)
+    except KeyboardInterrupt:
+        logger.info("Interrupted by user")
+    finally:
+        source.release()
+        sender.close()
+        logger.info(f"Sent {sender.sent_packets} packets ({sender.bytes_sent} bytes), "
+                    f"dropped {sender.dropped_packets}")
+
+def run_central(args):
+    """Score landmarks from edge devices and log each stream's state changes."""
+    states = {}
+    
+    def on_results(results):
+        for result in results:
+            if states.get(result.stream_id) != result.concentrated:
+                states[result.stream_id] = result.concentrated
+                logger.info(f"Stream {result.stream_id}: "
+                            f"{'Concentrated' if result.concentrated else 'Not Concentrated'} ({result.reason})")
+    
+    server = CentralServer(CentralScorer(load_config(args.config)), port=args.serve_landmarks,
+                           callback=on_results).start()
+    try:
+        while True:
+            time.sleep(1.0)
+    except KeyboardInterrupt:
+        logger.info("Interrupted by user")
+    finally:
+        server.stop()
+
+def run_batch(args):
+    """Score the --batch sources, resuming any jobs interrupted in earlier runs."""
+    manifest = JobManifest(os.path.join(args.batch_output, "manifest.json"), args.batch_output)
+    manifest.add(args.batch)
+    config = load_config(args.config)
+    try:
+        counts = manifest.run(lambda: ConcentrationDetector.from_config(config), args.checkpoint_interval)
+    except KeyboardInterrupt:
+        logger.info("Interrupted by user; rerun to resume from the last checkpoint")
+        return
+    logger.info(f"Batch jobs: {counts}")
+
+def run_scheduled(args):
+    """Share one inference worker between the --schedule sources and log their on-time ratios."""
+    priorities = args.priorities or [0] * len(args.schedule)
+    if len(priorities) != len(args.schedule):
+        raise ValueError("--priorities needs one class per --schedule source")
+    
+    config = load_config(args.config)
+    scheduler = DeadlineScheduler().start()
+    detectors, readers = [], []
+    try:
+        for stream_id, (source, priority) in enumerate(zip(args.schedule, priorities)):
+            # Recordings are released at their frame rate, like a camera would deliver them
+            frame_source = open_source(source, prefetch_depth=args.prefetch)
+            if isinstance(frame_source, CameraManager):
+                readers.append(ThreadedFrameReader(frame_source).start())
+            else:
+                readers.append(ThreadedFrameReader(frame_source, getattr(frame_source, 'fps', None) or 30.0,
+                                                   pace=True).start())
+            
+            # The first frame initializes Face Mesh and would set a service time far over any deadline
+            detectors.append(ConcentrationDetector.from_config(config))
+            packet = readers[-1].next(timeout=5.0)
+            if packet is not None:
+                detectors[-1].process_frame(packet.frame)
+                detectors[-1].reset_history()
+            scheduler.add_stream(stream_id, detectors[-1], deadline=args.deadline, priority=priority)
+        
+        last_sequences = [0] * len(readers)
+        next_report = time.monotonic() + 10.0
+        while not all(reader.failed for reader in readers):
+            for stream_id, reader in enumerate(readers):
+                packet = reader.latest()
+                if packet is not None and packet.sequence > last_sequences[stream_id]:
+                    last_sequences[stream_id] = packet.sequence
+                    scheduler.submit(stream_id, packet.frame, packet.timestamp)
+            
+            if time.monotonic() >= next_report:
+                for stream_id, stats in scheduler.get_stats().items():
+                    logger.info(f"Stream {stream_id} (class {stats.priority}): {stats.on_time_ratio:.0%} on time, "
+                                f"{stats.expired} expired, {stats.superseded} superseded")
+                next_report += 10.0
+            time.sleep(0.002)
+        logger.info("End of all sources reached")
+    except KeyboardInterrupt:
+        logger.info("Interrupted by user")
+    finally:
+        for reader in readers:
+            reader.stop()
+            reader.camera.release()
+        scheduler.stop()
+        for detector in detectors:
+            detector.cleanup()
+
+def run_benchmark(args):
+    """Benchmark core layouts on the first frames of the source and log them, best first."""
+    results = benchmark_layouts(args.benchmark_layouts, source_workload(args.source))
+    for result in results:
+        logger.info(f"{'pinned' if result.pinned else 'unpinned'}, opencv_threads={result.opencv_threads}: "
+                    f"{result.total_fps:.1f} FPS total, {result.fps_per_instance:.1f} FPS per instance, "
+                    f"p95 {result.p95_latency * 1000:.1f}ms")
+    logger.info(f"Best layout: {results[0]}")
+    
+def run_detector(args):
+    """Run the detector on the source with the preview window."""
     try:
         # Initialize components
-        detector = ConcentrationDetector()
-        camera = CameraManager()
+        detector = ConcentrationDetector.from_config(load_config(args.config))
+        if args.layout:
+            index, instances = map(int, args.layout.split('/'))
+            layout = plan_layouts(instances, opencv_threads=args.opencv_threads)[index]
+            detector.apply_core_layout(layout)
+        elif args.opencv_threads is not None:
+            set_opencv_threads(args.opencv_threads)
+        watcher = ConfigWatcher(args.config, detector).start() if args.config else None
+        source = open_source(args.source, prefetch_depth=args.prefetch, mjpeg=args.mjpeg,
+                             decode_scale=args.decode_scale)
         display = DisplayManager()
         
-        frame_width, frame_height = camera.get_dimensions()
+        if args.heatmap:
+            detector.enable_attention_heatmap()
+        
+        # Saved on cleanup; replay with landmark_backend "replay" and landmark_source PATH
+        if args.record_landmarks:
+            detector.set_landmark_backend(RecordingBackend(detector.landmark_backend, args.record_landmarks))
+        
+        if args.monitor_resources > 0:
+            monitor = detector.performance_tracker.enable_resource_monitoring(
+                args.monitor_resources, use_tracemalloc=args.trace_allocations)
+            monitor.install_signal_handler()
+        
+        # Profiles are written as collapsed stacks under profiles/
+        if hasattr(signal, 'SIGUSR2'):
+            signal.signal(signal.SIGUSR2, lambda *_: detector.request_profile(args.profile_seconds))
+        
+        # Live cameras are read on a background thread; file sources are read in order
+        if isinstance(source, CameraManager):
+            if args.layout:
+                source.set_cpu_affinity(layout.cores)
+            reader = ThreadedFrameReader(source).start()
+        else:
+            reader = None
+        
+        # Quality adapts to wall-clock latency, so recordings are always scored at full quality
+        quality = None
+        if args.target_fps or args.latency_slo:
+            if reader is None:
+                logger.warning("--target-fps and --latency-slo only apply to cameras; ignoring them")
+            else:
+                # The MJPG capture size is chosen up front; quality levels then only adjust inference
+                quality = QualityController(detector, None if args.mjpeg else reader,
+                                            target_fps=args.target_fps, latency_slo=args.latency_slo)
+        
+        if args.motion_gating:
+            # Only live cameras can slow down; recordings are still gated but read in full
+            on_idle = None
+            if reader is not None:
+                active_fps = source.fps
+                on_idle = lambda idle: reader.set_fps(args.idle_fps if idle else active_fps)
+            detector.enable_motion_gating(on_idle)
+        
+        recorder = None
+        if args.record:
+            # Encode at the source rate; the recorder paces frames by their timestamps
+            record_fps = getattr(source, 'fps', 0) or 30.0
+            if args.record_events:
+                recorder = VideoRecorder(args.record, fps=record_fps, pre_roll=args.pre_roll,
+                                         post_roll=args.post_roll).start()
+                
+                # A clip spans each debounced distraction episode plus the pre- and post-roll
+                def on_transition(event):
+                    if event.next_state is not None and not event.next_state.startswith("Concentrated"):
+                        recorder.begin_event()
+                    else:
+                        recorder.end_event()
+                detector.enable_events(callback=on_transition)
+            else:
+                recorder = VideoRecorder(args.record, fps=record_fps).start()
+                recorder.begin_event()
         
         while True:
-            ret, frame = camera.read_frame()
-            if not ret:
-                logger.warning("Failed to read frame")
-                break
+            if reader is not None:
+                packet = reader.next(timeout=1.0)
+                if packet is None:
+                    if reader.failed:
+                        logger.warning("Failed to read frame")
+                        break
+                    continue
+                frame, capture_time = packet.frame, packet.timestamp
+            else:
+                ret, frame = source.read_frame()
+                if not ret:
+                    logger.info("End of source reached")
+                    break
+                capture_time = None
             
-            # Process frame
-            processed_frame, concentration_status, status_color, confidence = detector.process_frame(frame)
+            # Process frame; latency is measured from capture time when known
+            processed_frame, concentration_status, status_color, confidence = detector.process_frame(
+                frame, capture_time)
+            if quality is not None:
+                quality.update()
             
-            # Draw status and info
+            # Draw status and info (resolution may change with the quality level)
+            frame_height = processed_frame.shape[0]
             display.draw_status(processed_frame, concentration_status, status_color, confidence)
             display.draw_info(processed_frame, frame_height)
             
             cv2.imshow("Concentration Detection", processed_frame)
+            if recorder is not None:
+                recorder.submit(processed_frame, capture_time)
             
             # Handle key presses
             key = cv2.waitKey(1) & 0xFF
@@ -41,6 +326,8 @@ def main():
                 break
             elif key == ord('r'):
                 detector.reset_history()
+            elif key == ord('p'):
+                detector.request_profile(args.profile_seconds)
         
     except KeyboardInterrupt:
         logger.info("Interrupted by user")
@@ -48,10 +335,21 @@ def main():
         logger.error(f"Unexpected error: {e}")
     finally:
         # Cleanup
-        if 'camera' in locals():
-            camera.release()
+        if locals().get('watcher') is not None:
+            watcher.stop()
+        if locals().get('reader') is not None:
+            reader.stop()
+        if locals().get('recorder') is not None:
+            recorder.close()
+        if 'source' in locals():
+            source.release()
         cv2.destroyAllWindows()
         if 'detector' in locals():
+            if detector.attention_heatmap is not None:
+                detector.attention_heatmap.save(args.heatmap)
+                logger.info(f"Gaze heatmap saved to {args.heatmap}")
+            if detector.performance_tracker.resource_monitor is not None:
+                logger.info(detector.performance_tracker.get_resource_report())
             detector.cleanup()
         
         # Print performance stats
@@ -61,6 +359,28 @@ def main():
                        f"{stats['total_frames']} frames, "
                        f"{stats['runtime']:.1f}s runtime")
 
+def main(argv=None):
+    """Main function to run the concentration detection system."""
+    args = parse_args(argv)
+    
+    # Log handlers run on a listener thread and repeated messages are rate limited
+    pipeline_logging = PipelineLogging(args.log_interval, args.log_burst).start()
+    try:
+        if args.send_landmarks:
+            run_edge(args)
+        elif args.serve_landmarks is not None:
+            run_central(args)
+        elif args.schedule:
+            run_scheduled(args)
+        elif args.batch:
+            run_batch(args)
+        elif args.benchmark_layouts:
+            run_benchmark(args)
+        else:
+            run_detector(args)
+    finally:
+        pipeline_logging.stop()
+
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
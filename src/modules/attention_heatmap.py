@@ -0,0 +1,108 @@
+import time
+import numpy as np
+from typing import NamedTuple, Optional, Tuple
+
+from src.modules.session_state import pack_array, unpack_array
+
+class HeatmapSnapshot(NamedTuple):
+    """A copy of the heatmap at one point in time."""
+    counts: np.ndarray       # (bins_y, bins_x) samples per bin
+    x_edges: np.ndarray
+    y_edges: np.ndarray
+    total: int               # samples inside the grid
+    outside: int             # samples beyond the range, not binned
+    timestamp: float
+    
+    def normalized(self) -> np.ndarray:
+        """Fraction of in-grid samples per bin."""
+        return self.counts / self.total if self.total else np.zeros(self.counts.shape)
+
+class AttentionHeatmap:
+    """
+    Session-long 2D histogram of gaze points with O(1) updates.
+    
+    Gaze points (see landmark_features.gaze_vector) are binned into a fixed grid,
+    so memory stays constant however long the session runs and no per-frame
+    points are stored. NaN points (no iris data) are ignored.
+    """
+    
+    def __init__(self, bins: Tuple[int, int] = (32, 24), x_range: Tuple[float, float] = (0.0, 1.0),
+                 y_range: Tuple[float, float] = (0.0, 1.0)):
+        self.bins_x, self.bins_y = bins
+        self.x_range = x_range
+        self.y_range = y_range
+        self._x_scale = self.bins_x / (x_range[1] - x_range[0])
+        self._y_scale = self.bins_y / (y_range[1] - y_range[0])
+        self.counts = np.zeros((self.bins_y, self.bins_x), dtype=np.int64)
+        self.total = 0
+        self.outside = 0
+    
+    def add(self, x: float, y: float) -> bool:
+        """Add one gaze point; returns False if it was NaN or outside the grid."""
+        column = (x - self.x_range[0]) * self._x_scale
+        row = (y - self.y_range[0]) * self._y_scale
+        if not (0 <= column <= self.bins_x and 0 <= row <= self.bins_y):
+            # NaN fails every comparison, so it is dropped without being counted
+            if column == column and row == row:
+                self.outside += 1
+            return False
+        # The upper range edge belongs to the last bin, as with np.histogram2d
+        self.counts[min(int(row), self.bins_y - 1), min(int(column), self.bins_x - 1)] += 1
+        self.total += 1
+        return True
+    
+    def add_batch(self, points: np.ndarray) -> int:
+        """Add (N, 2) gaze points at once; returns how many were binned."""
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        points = points[~np.isnan(points).any(axis=1)]
+        columns = (points[:, 0] - self.x_range[0]) * self._x_scale
+        rows = (points[:, 1] - self.y_range[0]) * self._y_scale
+        inside = (columns >= 0) & (columns <= self.bins_x) & (rows >= 0) & (rows <= self.bins_y)
+        
+        columns = np.minimum(columns[inside].astype(np.intp), self.bins_x - 1)
+        rows = np.minimum(rows[inside].astype(np.intp), self.bins_y - 1)
+        np.add.at(self.counts, (rows, columns), 1)
+        
+        binned = int(inside.sum())
+        self.total += binned
+        self.outside += len(points) - binned
+        return binned
+    
+    def snapshot(self) -> HeatmapSnapshot:
+        """Copy the current counts for export."""
+        return HeatmapSnapshot(self.counts.copy(),
+                               np.linspace(*self.x_range, self.bins_x + 1),
+                               np.linspace(*self.y_range, self.bins_y + 1),
+                               self.total, self.outside, time.time())
+    
+    def save(self, path: str, snapshot: Optional[HeatmapSnapshot] = None):
+        """Write a snapshot (the current one by default) as a compressed .npz file."""
+        snapshot = snapshot or self.snapshot()
+        np.savez_compressed(path, **snapshot._asdict())
+    
+    @staticmethod
+    def load(path: str) -> HeatmapSnapshot:
+        """Read a snapshot written by save()."""
+        with np.load(path) as data:
+            return HeatmapSnapshot(data['counts'], data['x_edges'], data['y_edges'], int(data['total']),
+                                   int(data['outside']), float(data['timestamp']))
+    
+    def get_state(self) -> dict:
+        """JSON-serializable counts, for moving a session elsewhere."""
+        return {'counts': pack_array(self.counts), 'total': self.total, 'outside': self.outside,
+                'x_range': list(self.x_range), 'y_range': list(self.y_range)}
+    
+    def set_state(self, state: dict):
+        """Restore counts from get_state(); the grid must have the same shape."""
+        counts = unpack_array(state['counts'])
+        if counts.shape != self.counts.shape:
+            raise ValueError(f"Heatmap shape {counts.shape} does not match {self.counts.shape}")
+        self.counts[:] = counts
+        self.total = state['total']
+        self.outside = state['outside']
+    
+    def reset(self):
+        """Clear all counts, e.g. at the start of a new session."""
+        self.counts.fill(0)
+        self.total = 0
+        self.outside = 0
@@ -0,0 +1,204 @@
+import os
+import csv
+import json
+import time
+import logging
+from typing import Callable, Dict, List, Optional, Sequence
+
+from src.modules.frame_source import FrameSource, open_source
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_VERSION = 1
+OUTPUT_COLUMNS = ('frame', 'time', 'status', 'concentrated', 'confidence')
+
+def write_json_atomic(path: str, data):
+    """Write JSON so readers see either the old or the new file, never a torn one."""
+    temporary = path + ".tmp"
+    with open(temporary, "w") as json_file:
+        json.dump(data, json_file)
+        json_file.flush()
+        os.fsync(json_file.fileno())
+    os.replace(temporary, path)
+
+class BatchScoringJob:
+    """
+    Scores a video file or image directory into a per-frame CSV, resumably.
+    
+    Every `checkpoint_interval` frames the output is flushed to disk and a
+    checkpoint records the next frame index, the output file size and the
+    detector state (see ConcentrationDetector.get_state). A rerun after a crash
+    truncates the output to the checkpointed size, restores the detector and
+    continues from that frame, producing the same file as an uninterrupted run.
+    Temporal state is driven by the frame's time in the recording, not wall time.
+    """
+    
+    def __init__(self, source_path: str, output_path: str, detector_factory: Callable,
+                 checkpoint_path: Optional[str] = None, checkpoint_interval: int = 300,
+                 default_fps: float = 30.0, prefetch_depth: int = 8):
+        self.source_path = source_path
+        self.output_path = output_path
+        self.checkpoint_path = checkpoint_path or output_path + ".checkpoint.json"
+        self.detector_factory = detector_factory
+        self.checkpoint_interval = max(1, checkpoint_interval)
+        self.default_fps = default_fps
+        self.prefetch_depth = prefetch_depth
+        
+        self.frame_index = 0
+        self.complete = False
+    
+    def load_checkpoint(self) -> Optional[Dict]:
+        """The saved checkpoint, or None if the job has not checkpointed yet."""
+        try:
+            with open(self.checkpoint_path) as checkpoint_file:
+                checkpoint = json.load(checkpoint_file)
+        except FileNotFoundError:
+            return None
+        if checkpoint.get('version') != CHECKPOINT_VERSION or checkpoint.get('source') != self.source_path:
+            raise ValueError(f"Checkpoint {self.checkpoint_path} does not belong to this job")
+        return checkpoint
+    
+    def _save_checkpoint(self, output, detector):
+        output.flush()
+        os.fsync(output.fileno())
+        write_json_atomic(self.checkpoint_path, {
+            'version': CHECKPOINT_VERSION,
+            'source': self.source_path,
+            'frame_index': self.frame_index,
+            'output_offset': output.tell(),
+            'complete': self.complete,
+            'detector': detector.get_state(),
+            'saved_at': time.time()
+        })
+    
+    def _open_source(self) -> FrameSource:
+        source = open_source(self.source_path, prefetch_depth=self.prefetch_depth)
+        if not isinstance(source, FrameSource):
+            source.release()
+            raise ValueError(f"Batch jobs need a video file or image directory, got {self.source_path!r}")
+        return source
+    
+    def run(self, max_frames: Optional[int] = None) -> bool:
+        """
+        Score frames, resuming from the checkpoint if there is one.
+        
+        Stops after `max_frames` frames when given (checkpointing first).
+        Returns True once the whole source has been scored.
+        """
+        checkpoint = self.load_checkpoint()
+        if checkpoint is not None and checkpoint['complete']:
+            self.frame_index, self.complete = checkpoint['frame_index'], True
+            return True
+        
+        detector = self.detector_factory()
+        source = self._open_source()
+        inner = getattr(source, 'source', source)
+        fps = getattr(inner, 'fps', 0) or self.default_fps
+        
+        if checkpoint is None:
+            self.frame_index = 0
+            output = open(self.output_path, "w", newline="")
+            csv.writer(output).writerow(OUTPUT_COLUMNS)
+        else:
+            # Rows written after the checkpoint are dropped and scored again
+            detector.set_state(checkpoint['detector'])
+            self.frame_index = checkpoint['frame_index']
+            output = open(self.output_path, "r+", newline="")
+            output.truncate(checkpoint['output_offset'])
+            output.seek(checkpoint['output_offset'])
+            logger.info(f"Resuming {self.source_path} at frame {self.frame_index}")
+        
+        writer = csv.writer(output)
+        processed = 0
+        try:
+            source.seek(self.frame_index)
+            while max_frames is None or processed < max_frames:
+                ret, frame = source.read_frame()
+                if not ret:
+                    self.complete = True
+                    break
+                
+                media_time = self.frame_index / fps
+                _, status, _, confidence = detector.process_frame(frame, timestamp=media_time)
+                writer.writerow((self.frame_index, f"{media_time:.3f}", status,
+                                 int(status.startswith("Concentrated")), f"{confidence:.4f}"))
+                self.frame_index += 1
+                processed += 1
+                
+                if self.frame_index % self.checkpoint_interval == 0:
+                    self._save_checkpoint(output, detector)
+            
+            self._save_checkpoint(output, detector)
+        finally:
+            output.close()
+            source.release()
+            detector.cleanup()
+        
+        if self.complete:
+            logger.info(f"Scored {self.source_path}: {self.frame_index} frames")
+        return self.complete
+
+class JobManifest:
+    """
+    Tracks batch jobs over many files across restarts.
+    
+    The manifest is a JSON file mapping each source to its output, checkpoint and
+    status ('pending', 'running', 'done' or 'failed'). run() skips finished
+    sources and resumes interrupted ones from their checkpoints.
+    """
+    
+    def __init__(self, path: str, output_dir: Optional[str] = None):
+        self.path = path
+        self.output_dir = output_dir or os.path.dirname(os.path.abspath(path))
+        self.jobs: Dict[str, Dict] = {}
+        if os.path.exists(path):
+            with open(path) as manifest_file:
+                self.jobs = json.load(manifest_file)['jobs']
+    
+    def save(self):
+        write_json_atomic(self.path, {'jobs': self.jobs})
+    
+    def add(self, sources: Sequence[str]) -> List[str]:
+        """Add sources not yet in the manifest; returns the ones added."""
+        added = []
+        for source in sources:
+            if source in self.jobs:
+                continue
+            name = os.path.basename(os.path.normpath(source))
+            output = os.path.join(self.output_dir, f"{len(self.jobs):04d}-{name}.csv")
+            self.jobs[source] = {'output': output, 'status': 'pending', 'frames': 0, 'error': None}
+            added.append(source)
+        os.makedirs(self.output_dir, exist_ok=True)
+        self.save()
+        return added
+    
+    def pending(self) -> List[str]:
+        """Sources that are not done yet, in the order they were added."""
+        return [source for source, job in self.jobs.items() if job['status'] != 'done']
+    
+    def run(self, detector_factory: Callable, checkpoint_interval: int = 300,
+            max_frames: Optional[int] = None) -> Dict[str, int]:
+        """
+        Run every unfinished job; a job that fails is recorded and the next one starts.
+        
+        `max_frames` limits the frames scored per job in this call. Returns counts per status.
+        """
+        for source in self.pending():
+            job = self.jobs[source]
+            batch_job = BatchScoringJob(source, job['output'], detector_factory,
+                                        checkpoint_interval=checkpoint_interval)
+            job['status'] = 'running'
+            self.save()
+            try:
+                done = batch_job.run(max_frames)
+            except Exception as e:
+                logger.error(f"Batch job for {source} failed: {e}")
+                job.update(status='failed', error=str(e), frames=batch_job.frame_index)
+            else:
+                job.update(status='done' if done else 'running', error=None, frames=batch_job.frame_index)
+            self.save()
+        
+        counts: Dict[str, int] = {}
+        for job in self.jobs.values():
+            counts[job['status']] = counts.get(job['status'], 0) + 1
+        return counts
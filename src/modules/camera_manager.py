@@ -1,22 +1,40 @@
 import cv2
 import logging
-from typing import Tuple
+from typing import Optional, Sequence, Tuple
 
 logger = logging.getLogger(__name__)
 
+def decode_fourcc(value: float) -> str:
+    """Turn a CAP_PROP_FOURCC value into its four-character code."""
+    code = int(value)
+    return "".join(chr((code >> 8 * i) & 0xFF) for i in range(4))
+
 class CameraManager:
     """Manages camera initialization and properties."""
     
-    def __init__(self, camera_index: int = 0, width: int = 640, height: int = 480, fps: int = 30):
+    def __init__(self, camera_index: int = 0, width: int = 640, height: int = 480, fps: int = 30,
+                 fourcc: Optional[str] = None):
         self.cap = cv2.VideoCapture(camera_index)
         if not self.cap.isOpened():
             logger.error("Cannot access webcam")
             raise RuntimeError("Cannot access webcam")
         
+        # The pixel format has to be negotiated before the size, which it limits
+        self.fourcc = None
+        if fourcc is not None:
+            self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*fourcc))
+            self.fourcc = decode_fourcc(self.cap.get(cv2.CAP_PROP_FOURCC))
+            if self.fourcc != fourcc:
+                logger.warning(f"Camera rejected {fourcc} format, using {self.fourcc!r}")
+        
         # Set camera properties
         self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
         self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
         self.cap.set(cv2.CAP_PROP_FPS, fps)
+        self.fps = fps
+        
+        # Cores for capture threads (ThreadedFrameReader, decode workers); empty: not pinned
+        self.cpu_cores: Tuple[int, ...] = ()
         
         self.frame_width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
         self.frame_height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
@@ -27,6 +45,31 @@ class CameraManager:
         """Read a frame from the camera."""
         return self.cap.read()
     
+    def set_resolution(self, width: int, height: int) -> Tuple[int, int]:
+        """Change the capture resolution and return the dimensions the camera accepted."""
+        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        
+        self.frame_width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self.frame_height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        
+        logger.info(f"Camera resolution changed: {self.frame_width}x{self.frame_height}")
+        return self.frame_width, self.frame_height
+    
+    def set_fps(self, fps: float) -> float:
+        """Change the capture frame rate and return the rate the camera reports."""
+        self.cap.set(cv2.CAP_PROP_FPS, fps)
+        
+        # Drivers that ignore the request report their actual rate (or 0 if unknown)
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or fps
+        
+        logger.info(f"Camera frame rate changed: {self.fps:g} FPS")
+        return self.fps
+    
+    def set_cpu_affinity(self, cores: Sequence[int]):
+        """Pin capture threads to `cores`; takes effect for threads started afterwards."""
+        self.cpu_cores = tuple(cores)
+    
     def get_dimensions(self) -> Tuple[int, int]:
         """Get camera frame dimensions."""
         return self.frame_width, self.frame_height
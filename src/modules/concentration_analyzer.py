@@ -1,15 +1,23 @@
+import math
 from typing import Tuple
 
 class ConcentrationAnalyzer:
     """Main analyzer that combines all components to determine concentration."""
     
-    def __init__(self, gaze_ratio_threshold: float = 0.55, iris_alignment_threshold: float = 0.14):
+    def __init__(self, gaze_ratio_threshold: float = 0.55, iris_alignment_threshold: float = 0.14,
+                 vertical_gaze_threshold: float = 0.7):
         self.gaze_ratio_threshold = gaze_ratio_threshold
         self.iris_alignment_threshold = iris_alignment_threshold
     
+        # Mean vertical gaze ratio above which the user is looking down (e.g. at a phone)
+        self.vertical_gaze_threshold = vertical_gaze_threshold
+    
     def analyze_gaze_direction(self, left_gaze_ratio: float, right_gaze_ratio: float, 
-                             head_direction: str) -> Tuple[bool, str, float]:
+                             head_direction: str, vertical_gaze_ratio: float = math.nan) -> Tuple[bool, str, float]:
         """Analyze gaze direction based on ratios and head pose."""
+        if vertical_gaze_ratio > self.vertical_gaze_threshold:
+            return False, "Looking Down", max(0, 1 - (vertical_gaze_ratio - self.vertical_gaze_threshold) * 2)
+        
         if head_direction == "left":
             if left_gaze_ratio > self.gaze_ratio_threshold:
                 return False, "Looking Left", max(0, 1 - (left_gaze_ratio - 0.5) * 2)
@@ -0,0 +1,274 @@
+import time
+import heapq
+import logging
+import threading
+from collections import deque
+from typing import Callable, Dict, List, NamedTuple, Optional, Set, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+class ScheduledFrame(NamedTuple):
+    """A submitted frame with its capture time and absolute deadline (time.perf_counter)."""
+    stream_id: int
+    sequence: int
+    frame: np.ndarray
+    capture_time: float
+    deadline: float
+
+class ScheduledResult(NamedTuple):
+    """process_frame's return value for a scheduled frame, and whether it met its deadline."""
+    stream_id: int
+    sequence: int
+    capture_time: float
+    finished: float
+    on_time: bool
+    result: tuple
+
+class StreamStats(NamedTuple):
+    """Per-stream scheduling counters; on_time_ratio covers the last `window` frames."""
+    priority: int
+    submitted: int
+    completed: int
+    on_time: int
+    late: int
+    expired: int
+    superseded: int
+    on_time_ratio: float
+    service_time: float
+
+class _Stream:
+    def __init__(self, detector, deadline: float, priority: int, max_pending: int, window: int):
+        self.detector = detector
+        self.deadline = deadline
+        self.priority = priority
+        self.max_pending = max_pending
+        self.sequence = 0
+        self.pending = 0
+        self.busy = False
+        # Exponential moving average of process_frame time, used to predict misses
+        self.service_time = 0.0
+        self.expired_in_row = 0
+        self.probing = False
+        self.outcomes = deque(maxlen=window)
+        self.counts = dict.fromkeys(('submitted', 'completed', 'on_time', 'late', 'expired', 'superseded'), 0)
+
+class DeadlineScheduler:
+    """
+    Shares inference between streams, earliest deadline first, shedding frames that would be late.
+    
+    Each stream has its own detector (smoothing and tracking state are per
+    stream), a relative deadline and a priority class (0 is most important).
+    Frames are tagged with their capture time and deadline on submit(). Workers
+    always take the most important class that has work, and within a class the
+    earliest deadline. A frame is dropped instead of processed when the stream's
+    average service time says it would finish past its deadline, so overload
+    costs the least important streams whole frames rather than making every
+    stream's results stale. A stream keeps at most `max_pending` queued frames;
+    newer frames supersede the oldest. After `probe_after` frames in a row were
+    dropped this way, the next one is processed anyway to re-measure the service
+    time, so one slow frame (e.g. a cold start) cannot starve a stream for good.
+    """
+    
+    def __init__(self, workers: int = 1, window: int = 300, smoothing: float = 0.2,
+                 clock: Callable[[], float] = time.perf_counter,
+                 callback: Optional[Callable[[ScheduledResult], None]] = None, probe_after: int = 10):
+        self.workers = workers
+        self.window = window
+        self.smoothing = smoothing
+        self.probe_after = probe_after
+        self.clock = clock
+        self.callback = callback
+        self.latest: Dict[int, ScheduledResult] = {}
+        
+        self._streams: Dict[int, _Stream] = {}
+        # Entries are (priority, deadline, order, frame)
+        self._queue: List[Tuple[int, float, int, ScheduledFrame]] = []
+        # (stream_id, sequence) of superseded frames still in the heap
+        self._dropped: Set[Tuple[int, int]] = set()
+        self._order = 0
+        self._condition = threading.Condition()
+        self._running = False
+        self._threads: List[threading.Thread] = []
+    
+    def add_stream(self, stream_id: int, detector, deadline: float = 0.1, priority: int = 0,
+                   max_pending: int = 2):
+        """Register a stream; `deadline` is seconds from capture to result."""
+        if deadline <= 0:
+            raise ValueError(f"deadline must be positive, got {deadline}")
+        if priority < 0:
+            raise ValueError(f"priority must be >= 0, got {priority}")
+        with self._condition:
+            if stream_id in self._streams:
+                raise ValueError(f"Stream {stream_id} is already registered")
+            self._streams[stream_id] = _Stream(detector, deadline, priority, max(1, max_pending), self.window)
+    
+    def remove_stream(self, stream_id: int):
+        """Unregister a stream; its queued frames are discarded."""
+        with self._condition:
+            self._streams.pop(stream_id, None)
+            self._queue = [entry for entry in self._queue if entry[3].stream_id != stream_id]
+            heapq.heapify(self._queue)
+            self._dropped = {key for key in self._dropped if key[0] != stream_id}
+    
+    def set_priority(self, stream_id: int, priority: int):
+        """Move a stream to another priority class; applies to frames submitted afterwards."""
+        with self._condition:
+            self._streams[stream_id].priority = priority
+    
+    def submit(self, stream_id: int, frame: np.ndarray, capture_time: Optional[float] = None) -> int:
+        """Queue a frame captured at `capture_time` (default now); returns its sequence number."""
+        capture_time = self.clock() if capture_time is None else capture_time
+        with self._condition:
+            stream = self._streams[stream_id]
+            stream.sequence += 1
+            stream.counts['submitted'] += 1
+            scheduled = ScheduledFrame(stream_id, stream.sequence, frame, capture_time,
+                                       capture_time + stream.deadline)
+            
+            if stream.pending >= stream.max_pending:
+                self._supersede_oldest(stream_id, stream)
+            stream.pending += 1
+            self._order += 1
+            heapq.heappush(self._queue, (stream.priority, scheduled.deadline, self._order, scheduled))
+            self._condition.notify()
+            return scheduled.sequence
+    
+    def _supersede_oldest(self, stream_id: int, stream: _Stream):
+        oldest = min((entry for entry in self._queue
+                      if entry[3].stream_id == stream_id and entry[3][:2] not in self._dropped),
+                     key=lambda entry: entry[3].sequence)
+        self._dropped.add(oldest[3][:2])
+        stream.pending -= 1
+        self._record(stream, 'superseded', False)
+    
+    def _record(self, stream: _Stream, outcome: str, on_time: bool):
+        stream.counts[outcome] += 1
+        stream.outcomes.append(on_time)
+    
+    def _next_frame(self) -> Optional[ScheduledFrame]:
+        """Pop the most urgent runnable frame, shedding frames that cannot make their deadline."""
+        now = self.clock()
+        skipped = []
+        chosen = None
+        while self._queue:
+            entry = heapq.heappop(self._queue)
+            scheduled = entry[3]
+            if scheduled[:2] in self._dropped:
+                self._dropped.discard(scheduled[:2])
+                continue
+            stream = self._streams.get(scheduled.stream_id)
+            if stream is None:
+                continue
+            if stream.busy:
+                # Another worker is running this stream's detector, which is not thread-safe
+                skipped.append(entry)
+                continue
+            
+            stream.pending -= 1
+            if now + stream.service_time > scheduled.deadline:
+                if stream.expired_in_row < self.probe_after:
+                    stream.expired_in_row += 1
+                    self._record(stream, 'expired', False)
+                    continue
+                # The estimate is only updated by processed frames, so measure it again
+                stream.probing = True
+            stream.expired_in_row = 0
+            stream.busy = True
+            chosen = scheduled
+            break
+        
+        for entry in skipped:
+            heapq.heappush(self._queue, entry)
+        return chosen
+    
+    def step(self) -> Optional[ScheduledResult]:
+        """Process the most urgent frame on the calling thread; None if nothing was runnable."""
+        with self._condition:
+            scheduled = self._next_frame()
+            if scheduled is None:
+                return None
+            stream = self._streams[scheduled.stream_id]
+        
+        started = self.clock()
+        try:
+            result = stream.detector.process_frame(scheduled.frame, capture_time=scheduled.capture_time)
+        finally:
+            finished = self.clock()
+            with self._condition:
+                stream.busy = False
+                elapsed = finished - started
+                stream.service_time = (elapsed if stream.counts['completed'] == 0 or stream.probing else
+                                       stream.service_time + self.smoothing * (elapsed - stream.service_time))
+                stream.probing = False
+                self._condition.notify()
+        
+        on_time = finished <= scheduled.deadline
+        scheduled_result = ScheduledResult(scheduled.stream_id, scheduled.sequence, scheduled.capture_time,
+                                           finished, on_time, result)
+        with self._condition:
+            stream.counts['completed'] += 1
+            self._record(stream, 'on_time' if on_time else 'late', on_time)
+            self.latest[scheduled.stream_id] = scheduled_result
+        
+        if self.callback is not None:
+            try:
+                self.callback(scheduled_result)
+            except Exception as e:
+                logger.error(f"Scheduled result callback failed: {e}")
+        return scheduled_result
+    
+    def start(self) -> "DeadlineScheduler":
+        """Start the worker threads."""
+        if self._running:
+            return self
+        self._running = True
+        self._threads = [threading.Thread(target=self._work, name=f"DeadlineWorker-{index}", daemon=True)
+                         for index in range(self.workers)]
+        for thread in self._threads:
+            thread.start()
+        return self
+    
+    def _has_runnable(self) -> bool:
+        return any(entry[3][:2] not in self._dropped and entry[3].stream_id in self._streams
+                   and not self._streams[entry[3].stream_id].busy for entry in self._queue)
+    
+    def _work(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: not self._running or self._has_runnable(), timeout=0.5)
+                if not self._running:
+                    return
+            try:
+                self.step()
+            except Exception as e:
+                logger.error(f"Scheduled frame processing failed: {e}")
+    
+    def get_latest(self, stream_id: int) -> Optional[ScheduledResult]:
+        with self._condition:
+            return self.latest.get(stream_id)
+    
+    def get_stats(self) -> Dict[int, StreamStats]:
+        """Counters and recent on-time ratio per stream."""
+        with self._condition:
+            return {
+                stream_id: StreamStats(
+                    priority=stream.priority,
+                    on_time_ratio=sum(stream.outcomes) / len(stream.outcomes) if stream.outcomes else 1.0,
+                    service_time=stream.service_time,
+                    **stream.counts
+                )
+                for stream_id, stream in self._streams.items()
+            }
+    
+    def stop(self):
+        """Stop the workers; frames still queued are discarded."""
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        for thread in self._threads:
+            thread.join(timeout=2.0)
+        self._threads = []
+        on_time = {stream_id: f"{stats.on_time_ratio:.0%} on time" for stream_id, stats in self.get_stats().items()}
+        logger.info(f"Deadline scheduler stopped: {on_time}")
@@ -0,0 +1,183 @@
+import os
+import json
+import logging
+import threading
+from typing import Dict, List, Mapping, NamedTuple, Optional
+
+from src.modules.landmark_backends import LANDMARK_BACKENDS
+
+logger = logging.getLogger(__name__)
+
+# Prefix of environment variables that override config values, e.g. GAZECRAZE_EAR_THRESHOLD=0.22
+ENV_PREFIX = "GAZECRAZE_"
+
+class DetectorConfig(NamedTuple):
+    """Tunable ConcentrationDetector settings; defaults match the constructor."""
+    detection_confidence: float = 0.7
+    tracking_confidence: float = 0.7
+    refine_landmarks: bool = True
+    face_tilt_threshold: float = 15
+    head_pose_threshold: float = 0.028
+    roll_threshold: float = 10.0
+    yaw_threshold: float = 20.0
+    gaze_ratio_threshold: float = 0.55
+    iris_alignment_threshold: float = 0.14
+    vertical_gaze_threshold: float = 0.7
+    ear_threshold: float = 0.25
+    history_size: int = 30
+    vote_window: int = 5
+    inference_scale: float = 1.0
+    inference_stride: int = 1
+    landmark_backend: str = "mediapipe"
+    landmark_source: str = ""          # recorded landmarks for the replay backend
+    
+    def validate(self) -> "DetectorConfig":
+        """Raise ValueError listing every invalid setting; returns the config for chaining."""
+        errors = []
+        for name in ('detection_confidence', 'tracking_confidence'):
+            if not 0.0 <= getattr(self, name) <= 1.0:
+                errors.append(f"{name} must be within [0, 1]")
+        for name in ('face_tilt_threshold', 'head_pose_threshold', 'roll_threshold', 'yaw_threshold',
+                     'gaze_ratio_threshold', 'iris_alignment_threshold', 'vertical_gaze_threshold',
+                     'ear_threshold'):
+            if not getattr(self, name) > 0:
+                errors.append(f"{name} must be positive")
+        if self.vote_window < 1:
+            errors.append("vote_window must be at least 1")
+        if self.history_size < self.vote_window:
+            errors.append("history_size must be at least vote_window")
+        if not 0.0 < self.inference_scale <= 1.0:
+            errors.append("inference_scale must be within (0, 1]")
+        if self.inference_stride < 1:
+            errors.append("inference_stride must be at least 1")
+        if self.landmark_backend not in LANDMARK_BACKENDS:
+            errors.append(f"landmark_backend must be one of {', '.join(LANDMARK_BACKENDS)}")
+        elif self.landmark_backend == 'replay' and not self.landmark_source:
+            errors.append("landmark_source is required by the replay backend")
+        if errors:
+            raise ValueError("Invalid detector config: " + "; ".join(errors))
+        return self
+    
+    def rule_params(self) -> Dict[str, float]:
+        """Thresholds in the form RuleEngine expects, as ConcentrationDetector.get_rule_params."""
+        return {
+            'ear_threshold': self.ear_threshold,
+            'face_tilt_threshold': self.face_tilt_threshold,
+            'head_pose_threshold': self.head_pose_threshold,
+            'gaze_ratio_threshold': self.gaze_ratio_threshold,
+            'iris_alignment_threshold': self.iris_alignment_threshold,
+            'roll_threshold': self.roll_threshold,
+            'yaw_threshold': self.yaw_threshold,
+            'vertical_gaze_threshold': self.vertical_gaze_threshold
+        }
+    
+    def changed_fields(self, other: "DetectorConfig") -> List[str]:
+        """Names of the settings that differ from `other`."""
+        return [name for name in self._fields if getattr(self, name) != getattr(other, name)]
+
+# Settings that require rebuilding the Face Mesh graph
+MESH_FIELDS = ('detection_confidence', 'tracking_confidence', 'refine_landmarks')
+
+# Settings that replace the landmark backend
+BACKEND_FIELDS = ('landmark_backend', 'landmark_source')
+
+def _coerce(name: str, value):
+    """Convert a file or environment value to the field's type."""
+    field_type = DetectorConfig.__annotations__[name]
+    if field_type is str:
+        return str(value)
+    if field_type is bool:
+        if isinstance(value, str):
+            lowered = value.strip().lower()
+            if lowered in ('1', 'true', 'yes', 'on'):
+                return True
+            if lowered in ('0', 'false', 'no', 'off'):
+                return False
+            raise ValueError(f"{name} must be a boolean, got {value!r}")
+        return bool(value)
+    if field_type is int:
+        number = float(value)
+        if not number.is_integer():
+            raise ValueError(f"{name} must be an integer, got {value!r}")
+        return int(number)
+    return float(value)
+
+def load_config(path: Optional[str] = None, env: Optional[Mapping[str, str]] = None,
+                base: Optional[DetectorConfig] = None) -> DetectorConfig:
+    """
+    Build a validated config from defaults (or `base`), a JSON file and the environment.
+    
+    Later sources win: file values override the base, GAZECRAZE_* variables override the file.
+    """
+    values = (base or DetectorConfig())._asdict()
+    
+    if path is not None:
+        with open(path) as config_file:
+            data = json.load(config_file)
+        if not isinstance(data, dict):
+            raise ValueError(f"Config file {path} must contain a JSON object")
+        unknown = set(data) - set(DetectorConfig._fields)
+        if unknown:
+            raise ValueError(f"Unknown config keys in {path}: {', '.join(sorted(unknown))}")
+        values.update({name: _coerce(name, value) for name, value in data.items()})
+    
+    env = os.environ if env is None else env
+    for name in DetectorConfig._fields:
+        raw = env.get(ENV_PREFIX + name.upper())
+        if raw is not None:
+            values[name] = _coerce(name, raw)
+    
+    return DetectorConfig(**values).validate()
+
+class ConfigWatcher:
+    """
+    Polls a config file and hands valid new configs to the detector.
+    
+    The detector applies them between frames (see ConcentrationDetector.request_config);
+    an invalid file is logged and ignored, leaving the running config in place.
+    """
+    
+    def __init__(self, path: str, detector, interval: float = 2.0):
+        self.path = path
+        self.detector = detector
+        self.interval = interval
+        self._mtime = self._read_mtime()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def _read_mtime(self) -> Optional[int]:
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+    
+    def start(self) -> "ConfigWatcher":
+        self._thread = threading.Thread(target=self._run, name="ConfigWatcher", daemon=True)
+        self._thread.start()
+        return self
+    
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            self.check()
+    
+    def check(self) -> bool:
+        """Reload if the file changed; returns True when a new config was handed over."""
+        mtime = self._read_mtime()
+        if mtime is None or mtime == self._mtime:
+            return False
+        self._mtime = mtime
+        
+        try:
+            config = load_config(self.path)
+        except (OSError, ValueError) as e:
+            logger.error(f"Ignoring config change in {self.path}: {e}")
+            return False
+        self.detector.request_config(config)
+        logger.info(f"Config change detected in {self.path}")
+        return True
+    
+    def stop(self):
+        if self._thread is not None:
+            self._stop_event.set()
+            self._thread.join()
+            self._thread = None
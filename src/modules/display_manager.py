@@ -1,23 +1,37 @@
 import time
-import cv2
+
+from src.modules.overlay_renderer import OverlayRenderer
+
+WHITE = (255, 255, 255)
+INSTRUCTIONS = "Press 'q' to quit, 'r' to reset, 'p' to profile"
 
 class DisplayManager:
     """Manages display and UI elements."""
     
-    def __init__(self):
+    def __init__(self, text_refresh_interval: float = 0.25):
         self.fps_counter = 0
         self.fps_start_time = time.time()
         self.current_fps = 0.0
     
+        # Text is drawn from cached sprites; numeric readouts change at most every text_refresh_interval seconds
+        self.renderer = OverlayRenderer()
+        self.text_refresh_interval = text_refresh_interval
+        self._confidence_text = None
+        self._confidence_refreshed = 0.0
+        self._fps_text = None
+        self._fps_refreshed = 0.0
+    
     def draw_status(self, frame, concentration_status: str, status_color: tuple, confidence: float):
         """Draw concentration status on frame."""
-        cv2.putText(frame, concentration_status, (30, 50), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.8, status_color, 2)
+        self.renderer.draw_text(frame, concentration_status, (30, 50), 0.8, tuple(status_color), 2)
         
         # Draw confidence
         if confidence > 0:
-            cv2.putText(frame, f"Confidence: {confidence:.2f}", (30, 80), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
+            now = time.monotonic()
+            if self._confidence_text is None or now - self._confidence_refreshed >= self.text_refresh_interval:
+                self._confidence_text = f"Confidence: {confidence:.2f}"
+                self._confidence_refreshed = now
+            self.renderer.draw_text(frame, self._confidence_text, (30, 80), 0.6, WHITE, 1)
     
     def update_fps(self, frame_height: int):
         """Update and return current FPS."""
@@ -34,9 +48,11 @@ class DisplayManager:
     def draw_info(self, frame, frame_height: int):
         """Draw FPS and instructions on frame."""
         fps = self.update_fps(frame_height)
-        cv2.putText(frame, f"FPS: {fps:.1f}", (30, frame_height - 30), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
+        now = time.monotonic()
+        if self._fps_text is None or now - self._fps_refreshed >= self.text_refresh_interval:
+            self._fps_text = f"FPS: {fps:.1f}"
+            self._fps_refreshed = now
+        self.renderer.draw_text(frame, self._fps_text, (30, frame_height - 30), 0.6, WHITE, 1)
         
         # Instructions
-        cv2.putText(frame, "Press 'q' to quit, 'r' to reset", (30, frame_height - 60), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
\ No newline at end of file
+        self.renderer.draw_text(frame, INSTRUCTIONS, (30, frame_height - 60), 0.5, WHITE, 1)
@@ -0,0 +1,178 @@
+import time
+import queue
+import logging
+from typing import Callable, List, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+class TransitionEvent(NamedTuple):
+    """A finished state episode, emitted when the detector settles into `next_state`."""
+    state: str
+    concentrated: bool
+    reason: str
+    start_time: float
+    end_time: float
+    duration: float
+    mean_confidence: float
+    next_state: Optional[str]   # None when the stream was flushed
+
+class _Episode:
+    """Running statistics of one state episode."""
+    
+    __slots__ = ('key', 'concentrated', 'reason', 'start_time', 'confidence_sum', 'frames')
+    
+    def __init__(self, key: str, concentrated: bool, reason: str, start_time: float):
+        self.key = key
+        self.concentrated = concentrated
+        self.reason = reason
+        self.start_time = start_time
+        self.confidence_sum = 0.0
+        self.frames = 0
+    
+    def add(self, confidence: float):
+        self.confidence_sum += confidence
+        self.frames += 1
+    
+    def absorb(self, other: "_Episode"):
+        self.confidence_sum += other.confidence_sum
+        self.frames += other.frames
+
+def state_label(concentrated: bool, reason: str, include_reason: bool = True) -> str:
+    """State name as shown in the status line, e.g. 'Not Concentrated (Eyes on left)'."""
+    label = "Concentrated" if concentrated else "Not Concentrated"
+    if include_reason and reason:
+        return f"{label} ({reason})"
+    return label
+
+class TransitionEventStream:
+    """
+    Turns per-frame results into debounced state-transition events.
+    
+    A new state must persist for `min_duration` seconds before the transition is
+    accepted; the episode then counts from when the new state first appeared.
+    After an event, no other transition is accepted for `cooldown` seconds.
+    Events go to subscribed callbacks and, if queue_size > 0, to `events`.
+    """
+    
+    def __init__(self, min_duration: float = 1.0, cooldown: float = 0.0, include_reason: bool = True,
+                 queue_size: int = 0):
+        self.min_duration = min_duration
+        self.cooldown = cooldown
+        self.include_reason = include_reason
+        self.events: Optional[queue.Queue] = queue.Queue(maxsize=queue_size) if queue_size > 0 else None
+        self.dropped_events = 0
+        
+        self._callbacks: List[Callable[[TransitionEvent], None]] = []
+        self._current: Optional[_Episode] = None
+        self._pending: Optional[_Episode] = None
+        self._last_event_time = float('-inf')
+    
+    def subscribe(self, callback: Callable[[TransitionEvent], None]):
+        """Call `callback(event)` for every transition event."""
+        self._callbacks.append(callback)
+    
+    @property
+    def state(self) -> Optional[str]:
+        """The current debounced state."""
+        return self._current.key if self._current is not None else None
+    
+    def update(self, concentrated: bool, reason: str, confidence: float,
+               timestamp: Optional[float] = None) -> Optional[TransitionEvent]:
+        """Feed one frame's result; returns the event emitted by this frame, if any."""
+        if timestamp is None:
+            timestamp = time.time()
+        key = state_label(concentrated, reason, self.include_reason)
+        
+        if self._current is None:
+            self._current = _Episode(key, concentrated, reason, timestamp)
+            self._current.add(confidence)
+            return None
+        
+        if key == self._current.key:
+            # Brief excursion ended; its frames belong to the ongoing episode
+            if self._pending is not None:
+                self._current.absorb(self._pending)
+                self._pending = None
+            self._current.add(confidence)
+            return None
+        
+        if self._pending is None or self._pending.key != key:
+            if self._pending is not None:
+                self._current.absorb(self._pending)
+            self._pending = _Episode(key, concentrated, reason, timestamp)
+        self._pending.add(confidence)
+        
+        if (timestamp - self._pending.start_time >= self.min_duration
+                and timestamp - self._last_event_time >= self.cooldown):
+            return self._transition(timestamp)
+        return None
+    
+    def _transition(self, timestamp: float) -> TransitionEvent:
+        event = self._finish(self._current, self._pending.start_time, self._pending.key)
+        self._current, self._pending = self._pending, None
+        self._last_event_time = timestamp
+        self._emit(event)
+        return event
+    
+    @staticmethod
+    def _finish(episode: _Episode, end_time: float, next_state: Optional[str]) -> TransitionEvent:
+        mean_confidence = episode.confidence_sum / episode.frames if episode.frames else 0.0
+        return TransitionEvent(episode.key, episode.concentrated, episode.reason, episode.start_time,
+                               end_time, end_time - episode.start_time, mean_confidence, next_state)
+    
+    def _emit(self, event: TransitionEvent):
+        for callback in self._callbacks:
+            try:
+                callback(event)
+            except Exception as e:
+                logger.error("Transition event callback failed: %s", e)
+        
+        if self.events is not None:
+            try:
+                self.events.put_nowait(event)
+            except queue.Full:
+                self.dropped_events += 1
+    
+    def flush(self, timestamp: Optional[float] = None) -> Optional[TransitionEvent]:
+        """Emit the ongoing episode as finished (e.g. at shutdown) and reset."""
+        if self._current is None:
+            return None
+        if timestamp is None:
+            timestamp = time.time()
+        if self._pending is not None:
+            self._current.absorb(self._pending)
+        event = self._finish(self._current, timestamp, None)
+        self.reset()
+        self._emit(event)
+        return event
+    
+    def get_state(self) -> dict:
+        """JSON-serializable episode state; subscribers and queued events are not included."""
+        def episode_state(episode: Optional[_Episode]):
+            return None if episode is None else [getattr(episode, name) for name in _Episode.__slots__]
+        
+        return {
+            'current': episode_state(self._current),
+            'pending': episode_state(self._pending),
+            'last_event_time': None if self._last_event_time == float('-inf') else self._last_event_time
+        }
+    
+    def set_state(self, state: dict, time_offset: float = 0.0):
+        """Restore state from get_state(), adding `time_offset` to the saved timestamps."""
+        def episode(values) -> Optional[_Episode]:
+            if values is None:
+                return None
+            restored = _Episode(*values[:3], values[3] + time_offset)
+            restored.confidence_sum, restored.frames = values[4:]
+            return restored
+        
+        self._current = episode(state['current'])
+        self._pending = episode(state['pending'])
+        last_event_time = state['last_event_time']
+        self._last_event_time = float('-inf') if last_event_time is None else last_event_time + time_offset
+    
+    def reset(self):
+        """Forget the current state without emitting an event."""
+        self._current = None
+        self._pending = None
+        self._last_event_time = float('-inf')
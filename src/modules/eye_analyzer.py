@@ -1,6 +1,10 @@
 import logging
 from typing import Tuple
 
+from src.modules.landmark_features import (LEFT_EYE_TOP, LEFT_EYE_BOTTOM, RIGHT_EYE_TOP, RIGHT_EYE_BOTTOM,
+                                           LEFT_EYE_INNER, LEFT_EYE_OUTER, RIGHT_EYE_INNER, RIGHT_EYE_OUTER,
+                                           LEFT_IRIS, RIGHT_IRIS)
+
 logger = logging.getLogger(__name__)
 
 class EyeAnalyzer:
@@ -8,17 +12,17 @@ class EyeAnalyzer:
     
     def __init__(self, ear_threshold: float = 0.25):
         # Eye state tracking for blink detection
-        self.left_eye_top = 159
-        self.left_eye_bottom = 145
-        self.right_eye_top = 386
-        self.right_eye_bottom = 374
+        self.left_eye_top = LEFT_EYE_TOP
+        self.left_eye_bottom = LEFT_EYE_BOTTOM
+        self.right_eye_top = RIGHT_EYE_TOP
+        self.right_eye_bottom = RIGHT_EYE_BOTTOM
         self.ear_threshold = ear_threshold
         
         # Eye corner landmarks
-        self.left_eye_inner = 133
-        self.left_eye_outer = 33
-        self.right_eye_inner = 362
-        self.right_eye_outer = 263
+        self.left_eye_inner = LEFT_EYE_INNER
+        self.left_eye_outer = LEFT_EYE_OUTER
+        self.right_eye_inner = RIGHT_EYE_INNER
+        self.right_eye_outer = RIGHT_EYE_OUTER
     
     def calculate_ear(self, eye_top: int, eye_bottom: int, eye_left: int, eye_right: int, 
                      face_landmarks, frame_width: int, frame_height: int) -> float:
@@ -40,7 +44,7 @@ class EyeAnalyzer:
             
             return vertical_distance / horizontal_distance
         except (IndexError, ZeroDivisionError) as e:
-            logger.warning(f"Error calculating EAR: {e}")
+            logger.warning("Error calculating EAR: %s", e)
             return 0.3  # Default value
     
     def detect_blinks(self, face_landmarks, frame_width: int, frame_height: int) -> bool:
@@ -52,13 +56,17 @@ class EyeAnalyzer:
                                      self.right_eye_inner, self.right_eye_outer, 
                                      face_landmarks, frame_width, frame_height)
         
+        return self.eyes_closed(left_ear, right_ear)
+    
+    def eyes_closed(self, left_ear: float, right_ear: float) -> bool:
+        """Decide whether both eyes are closed from precomputed EARs."""
         return left_ear < self.ear_threshold and right_ear < self.ear_threshold
     
     def calculate_gaze_ratios(self, face_landmarks, frame_width: int, frame_height: int) -> Tuple[float, float]:
         """Calculate gaze ratios for both eyes."""
         # Get iris positions
-        left_iris_x = face_landmarks.landmark[468].x * frame_width  # left_iris_index
-        right_iris_x = face_landmarks.landmark[473].x * frame_width  # right_iris_index
+        left_iris_x = face_landmarks.landmark[LEFT_IRIS].x * frame_width
+        right_iris_x = face_landmarks.landmark[RIGHT_IRIS].x * frame_width
         
         left_eye_inner_x = face_landmarks.landmark[self.left_eye_inner].x * frame_width
         left_eye_outer_x = face_landmarks.landmark[self.left_eye_outer].x * frame_width
@@ -75,4 +83,20 @@ class EyeAnalyzer:
         left_gaze_ratio = (left_iris_x - left_eye_inner_x) / left_eye_width
         right_gaze_ratio = (right_iris_x - right_eye_inner_x) / right_eye_width
         
-        return left_gaze_ratio, right_gaze_ratio
\ No newline at end of file
+        return left_gaze_ratio, right_gaze_ratio
+    
+    def calculate_vertical_gaze_ratios(self, face_landmarks, frame_width: int,
+                                       frame_height: int) -> Tuple[float, float]:
+        """Calculate vertical gaze ratios for both eyes: 0 at the upper lid, 1 at the lower lid."""
+        ratios = []
+        for iris, top, bottom in ((LEFT_IRIS, self.left_eye_top, self.left_eye_bottom),
+                                  (RIGHT_IRIS, self.right_eye_top, self.right_eye_bottom)):
+            iris_y = face_landmarks.landmark[iris].y * frame_height
+            top_y = face_landmarks.landmark[top].y * frame_height
+            bottom_y = face_landmarks.landmark[bottom].y * frame_height
+            
+            if bottom_y == top_y:
+                raise ValueError("Invalid Eye Measurements")
+            ratios.append((iris_y - top_y) / (bottom_y - top_y))
+        
+        return ratios[0], ratios[1]
\ No newline at end of file
@@ -0,0 +1,267 @@
+import numpy as np
+from collections import deque
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+from src.modules.session_state import pack_array, unpack_array
+
+# Default PERCLOS / blink-rate windows: 1, 5 and 15 minutes
+DEFAULT_WINDOWS = (60.0, 300.0, 900.0)
+
+class BlinkEvent(NamedTuple):
+    """One eye closure, from the onset to the offset of the closed state."""
+    start_time: float
+    end_time: float
+    duration: float
+    min_ear: float
+    long_closure: bool   # longer than a blink (e.g. microsleep); not counted in the blink rate
+
+class EyeState(NamedTuple):
+    """Eye state of a face after the latest sample."""
+    closed: bool
+    ear: float
+    perclos: Dict[float, float]      # window seconds -> fraction of observed time with eyes closed
+    blink_rate: Dict[float, float]   # window seconds -> blinks per minute
+    blink_count: int
+    last_blink: Optional[BlinkEvent]
+
+class _SlidingSums:
+    """
+    Time-windowed sums of (observed time, closed time) over several windows.
+    
+    Samples live in one ring shared by all windows; each window keeps its own tail
+    and running sums, so every update is amortized O(1) per window.
+    """
+    
+    def __init__(self, windows: Sequence[float], capacity: int = 4096):
+        self.windows = sorted(windows)
+        self._times = [0.0] * capacity
+        self._weights = [0.0] * capacity
+        self._closed = [0.0] * capacity
+        self._head = 0
+        self._tails = [0] * len(self.windows)
+        self.observed = [0.0] * len(self.windows)
+        self.closed = [0.0] * len(self.windows)
+    
+    def _grow(self):
+        capacity = len(self._times)
+        start = self._tails[-1]
+        order = [(start + i) % capacity for i in range(self._head - start)]
+        for name in ('_times', '_weights', '_closed'):
+            values = getattr(self, name)
+            grown = [0.0] * (capacity * 2)
+            for offset, index in enumerate(order):
+                grown[(start + offset) % (capacity * 2)] = values[index]
+            setattr(self, name, grown)
+    
+    def push(self, timestamp: float, weight: float, closed: bool):
+        if self._head - self._tails[-1] >= len(self._times):
+            self._grow()
+        capacity = len(self._times)
+        slot = self._head % capacity
+        closed_weight = weight if closed else 0.0
+        self._times[slot] = timestamp
+        self._weights[slot] = weight
+        self._closed[slot] = closed_weight
+        self._head += 1
+        
+        for k, window in enumerate(self.windows):
+            self.observed[k] += weight
+            self.closed[k] += closed_weight
+            tail = self._tails[k]
+            while self._times[tail % capacity] <= timestamp - window:
+                self.observed[k] -= self._weights[tail % capacity]
+                self.closed[k] -= self._closed[tail % capacity]
+                tail += 1
+            self._tails[k] = tail
+    
+    def export_state(self) -> dict:
+        """Live samples and running sums."""
+        capacity = len(self._times)
+        live = [index % capacity for index in range(self._tails[-1], self._head)]
+        return {
+            'times': pack_array(np.array([self._times[i] for i in live])),
+            'weights': pack_array(np.array([self._weights[i] for i in live])),
+            'closed': pack_array(np.packbits([self._closed[i] > 0 for i in live])),
+            'window_samples': [self._head - tail for tail in self._tails],
+            'observed': list(self.observed),
+            'closed_sums': list(self.closed)
+        }
+    
+    def import_state(self, state: dict, time_offset: float = 0.0):
+        times = (unpack_array(state['times']) + time_offset).tolist()
+        weights = unpack_array(state['weights']).tolist()
+        closed = np.unpackbits(unpack_array(state['closed']), count=len(times)).astype(bool).tolist()
+        capacity = max(len(self._times), 2 * len(times))
+        self._times = times + [0.0] * (capacity - len(times))
+        self._weights = weights + [0.0] * (capacity - len(times))
+        self._closed = [weight if is_closed else 0.0 for weight, is_closed in zip(weights, closed)]
+        self._closed += [0.0] * (capacity - len(times))
+        self._head = len(times)
+        self._tails = [self._head - samples for samples in state['window_samples']]
+        self.observed = list(state['observed'])
+        self.closed = list(state['closed_sums'])
+    
+    def fractions(self) -> Dict[float, float]:
+        return {window: (max(0.0, self.closed[k]) / self.observed[k] if self.observed[k] > 1e-9 else 0.0)
+                for k, window in enumerate(self.windows)}
+
+class EyeStateTracker:
+    """
+    Streaming eye state of one face: blink events with hysteresis, PERCLOS and blink rate.
+    
+    Eyes count as closed once the mean EAR drops below `close_threshold` and as open
+    again only when it rises above `open_threshold`, so noise around a single
+    threshold does not split one blink into several.
+    """
+    
+    def __init__(self, close_threshold: float = 0.25, open_threshold: float = 0.28,
+                 windows: Sequence[float] = DEFAULT_WINDOWS, max_blink_duration: float = 0.5,
+                 min_blink_duration: float = 0.03, max_gap: float = 0.5, history_size: int = 300):
+        self.close_threshold = close_threshold
+        self.open_threshold = max(open_threshold, close_threshold)
+        self.max_blink_duration = max_blink_duration
+        self.min_blink_duration = min_blink_duration
+        self.max_gap = max_gap
+        
+        # Recent EAR values for inspection
+        self.ear_history = deque(maxlen=history_size)
+        
+        self._sums = _SlidingSums(windows)
+        self._blink_times: List[deque] = [deque() for _ in self._sums.windows]
+        self.blink_count = 0
+        self.last_blink: Optional[BlinkEvent] = None
+        self.closed = False
+        self._closure_start = 0.0
+        self._closure_min_ear = 0.0
+        self._last_timestamp: Optional[float] = None
+        self._first_timestamp: Optional[float] = None
+    
+    def update(self, left_ear: float, right_ear: float, timestamp: float) -> Optional[BlinkEvent]:
+        """Add one frame's EARs; returns the closure that ended with this frame, if any."""
+        ear = (left_ear + right_ear) / 2
+        self.ear_history.append(ear)
+        if self._first_timestamp is None:
+            self._first_timestamp = timestamp
+        
+        # Each sample stands for the time since the previous one, capped across face drop-outs
+        weight = 0.0 if self._last_timestamp is None else min(max(timestamp - self._last_timestamp, 0.0),
+                                                              self.max_gap)
+        self._last_timestamp = timestamp
+        
+        event = None
+        if not self.closed and ear < self.close_threshold:
+            self.closed = True
+            self._closure_start = timestamp
+            self._closure_min_ear = ear
+        elif self.closed:
+            self._closure_min_ear = min(self._closure_min_ear, ear)
+            if ear > self.open_threshold:
+                self.closed = False
+                event = self._end_closure(timestamp)
+        
+        self._sums.push(timestamp, weight, self.closed)
+        for times, window in zip(self._blink_times, self._sums.windows):
+            while times and times[0] <= timestamp - window:
+                times.popleft()
+        return event
+    
+    def _end_closure(self, timestamp: float) -> Optional[BlinkEvent]:
+        duration = timestamp - self._closure_start
+        if duration < self.min_blink_duration:
+            return None
+        event = BlinkEvent(self._closure_start, timestamp, duration, self._closure_min_ear,
+                           duration > self.max_blink_duration)
+        self.last_blink = event
+        if not event.long_closure:
+            self.blink_count += 1
+            for times in self._blink_times:
+                times.append(timestamp)
+        return event
+    
+    def state(self) -> EyeState:
+        """Current eye state and window statistics."""
+        elapsed = 0.0 if self._last_timestamp is None else self._last_timestamp - self._first_timestamp
+        rates = {}
+        for times, window in zip(self._blink_times, self._sums.windows):
+            span = min(window, elapsed)
+            rates[window] = len(times) * 60.0 / span if span > 0 else 0.0
+        ear = self.ear_history[-1] if self.ear_history else float('nan')
+        return EyeState(self.closed, ear, self._sums.fractions(), rates, self.blink_count, self.last_blink)
+
+    def export_state(self) -> dict:
+        """JSON-serializable tracker state."""
+        return {
+            'ear_history': pack_array(np.array(self.ear_history, dtype=np.float64)),
+            'sums': self._sums.export_state(),
+            # Every window's blink times are a suffix of the longest window's
+            'blink_times': list(self._blink_times[-1]),
+            'blink_window_counts': [len(times) for times in self._blink_times],
+            'blink_count': self.blink_count,
+            'last_blink': None if self.last_blink is None else list(self.last_blink),
+            'closed': self.closed,
+            'closure_start': self._closure_start,
+            'closure_min_ear': self._closure_min_ear,
+            'last_timestamp': self._last_timestamp,
+            'first_timestamp': self._first_timestamp
+        }
+    
+    def import_state(self, state: dict, time_offset: float = 0.0):
+        """Restore state from export_state(), shifting timestamps by `time_offset`."""
+        def shift(timestamp):
+            return None if timestamp is None else timestamp + time_offset
+        
+        self.ear_history.clear()
+        self.ear_history.extend(unpack_array(state['ear_history']).tolist())
+        self._sums.import_state(state['sums'], time_offset)
+        blink_times = [timestamp + time_offset for timestamp in state['blink_times']]
+        self._blink_times = [deque(blink_times[len(blink_times) - count:]) for count in state['blink_window_counts']]
+        self.blink_count = state['blink_count']
+        last_blink = state['last_blink']
+        if last_blink is not None:
+            last_blink = BlinkEvent(*last_blink)
+            last_blink = last_blink._replace(start_time=last_blink.start_time + time_offset,
+                                             end_time=last_blink.end_time + time_offset)
+        self.last_blink = last_blink
+        self.closed = state['closed']
+        self._closure_start = state['closure_start'] + time_offset
+        self._closure_min_ear = state['closure_min_ear']
+        self._last_timestamp = shift(state['last_timestamp'])
+        self._first_timestamp = shift(state['first_timestamp'])
+
+class EyeStateEngine:
+    """Per-face EyeStateTrackers keyed by face index."""
+    
+    def __init__(self, **tracker_kwargs):
+        self.tracker_kwargs = tracker_kwargs
+        self.trackers: Dict[int, EyeStateTracker] = {}
+    
+    def update(self, face_id: int, left_ear: float, right_ear: float, timestamp: float) -> EyeState:
+        """Add a frame for one face and return its eye state."""
+        tracker = self.trackers.get(face_id)
+        if tracker is None:
+            tracker = self.trackers[face_id] = EyeStateTracker(**self.tracker_kwargs)
+        tracker.update(left_ear, right_ear, timestamp)
+        return tracker.state()
+    
+    def get_state(self, face_id: int = 0) -> Optional[EyeState]:
+        tracker = self.trackers.get(face_id)
+        return tracker.state() if tracker is not None else None
+    
+    def export_state(self) -> dict:
+        """
+        JSON-serializable state of every tracker, for moving a session elsewhere.
+        
+        Named apart from get_state(), which reports a face's current EyeState.
+        """
+        return {str(face_id): tracker.export_state() for face_id, tracker in self.trackers.items()}
+    
+    def import_state(self, state: dict, time_offset: float = 0.0):
+        """Replace all trackers with those saved by export_state()."""
+        self.trackers.clear()
+        for face_id, tracker_state in state.items():
+            tracker = self.trackers[int(face_id)] = EyeStateTracker(**self.tracker_kwargs)
+            tracker.import_state(tracker_state, time_offset)
+    
+    def reset(self):
+        """Drop all per-face state."""
+        self.trackers.clear()
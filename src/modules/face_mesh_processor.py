@@ -6,7 +6,11 @@ logger = logging.getLogger(__name__)
 class FaceMeshProcessor:
     """Handles MediaPipe Face Mesh initialization and processing."""
     
-    def __init__(self, detection_confidence: float = 0.7, tracking_confidence: float = 0.7):
+    def __init__(self, detection_confidence: float = 0.7, tracking_confidence: float = 0.7,
+                 refine_landmarks: bool = True):
+        self.detection_confidence = detection_confidence
+        self.tracking_confidence = tracking_confidence
+        self.refine_landmarks = refine_landmarks
         self.face_mesh = self._initialize_face_mesh(detection_confidence, tracking_confidence)
         logger.info("FaceMeshProcessor initialized successfully")
     
@@ -16,7 +20,7 @@ class FaceMeshProcessor:
             mp_face_mesh = mp.solutions.face_mesh
             face_mesh = mp_face_mesh.FaceMesh(
                 max_num_faces=1,
-                refine_landmarks=True,
+                refine_landmarks=self.refine_landmarks,
                 static_image_mode=False,
                 min_detection_confidence=detection_confidence,
                 min_tracking_confidence=tracking_confidence
@@ -26,6 +30,32 @@ class FaceMeshProcessor:
             logger.error(f"Failed to initialize Face Mesh: {e}")
             raise
     
+    def set_refine_landmarks(self, refine_landmarks: bool):
+        """Rebuild the Face Mesh graph with or without iris landmark refinement."""
+        self.reconfigure(self.detection_confidence, self.tracking_confidence, refine_landmarks)
+    
+    def reconfigure(self, detection_confidence: float, tracking_confidence: float,
+                    refine_landmarks: bool) -> bool:
+        """Rebuild the Face Mesh graph if any setting changed; returns True when rebuilt."""
+        if (detection_confidence == self.detection_confidence
+                and tracking_confidence == self.tracking_confidence
+                and refine_landmarks == self.refine_landmarks):
+            return False
+        
+        self.cleanup()
+        self.detection_confidence = detection_confidence
+        self.tracking_confidence = tracking_confidence
+        self.refine_landmarks = refine_landmarks
+        self.face_mesh = self._initialize_face_mesh(detection_confidence, tracking_confidence)
+        logger.info(f"Face Mesh rebuilt (detection={detection_confidence}, tracking={tracking_confidence}, "
+                    f"refine_landmarks={refine_landmarks})")
+        return True
+    
+    def restart(self):
+        """Rebuild the graph so its worker threads inherit the calling thread's CPU affinity."""
+        self.cleanup()
+        self.face_mesh = self._initialize_face_mesh(self.detection_confidence, self.tracking_confidence)
+    
     def process_frame(self, frame_rgb):
         """Process frame and return face landmarks."""
         return self.face_mesh.process(frame_rgb)
@@ -0,0 +1,301 @@
+import os
+import queue
+import logging
+import threading
+from typing import Iterator, Optional, Sequence, Tuple, Union
+
+import cv2
+import numpy as np
+
+from src.modules.camera_manager import CameraManager
+from src.modules.mjpeg_capture import MjpegCameraManager
+
+logger = logging.getLogger(__name__)
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.tif', '.tiff', '.webp')
+
+class FrameSource:
+    """Seekable source of BGR frames with the same read interface as CameraManager."""
+    
+    frame_count: Optional[int] = None
+    
+    def read_frame(self) -> Tuple[bool, Optional[np.ndarray]]:
+        """Read the next frame."""
+        raise NotImplementedError
+    
+    def seek(self, index: int):
+        """Position the source so the next read returns frame `index`."""
+        raise NotImplementedError
+    
+    def tell(self) -> int:
+        """Index of the frame the next read will return."""
+        raise NotImplementedError
+    
+    def get_dimensions(self) -> Tuple[int, int]:
+        """Get frame dimensions."""
+        raise NotImplementedError
+    
+    def read_range(self, start: int, stop: Optional[int] = None) -> Iterator[Tuple[int, np.ndarray]]:
+        """Yield (index, frame) pairs for frames in [start, stop)."""
+        self.seek(start)
+        index = start
+        while stop is None or index < stop:
+            ret, frame = self.read_frame()
+            if not ret:
+                return
+            yield index, frame
+            index += 1
+    
+    def release(self):
+        """Release source resources."""
+
+class VideoFileSource(FrameSource):
+    """Frames decoded from a video file."""
+    
+    # Seeks this far forward or less are done by grabbing instead of a container seek
+    SHORT_SEEK_FRAMES = 30
+    
+    def __init__(self, path: str, hw_acceleration: bool = False):
+        self.path = path
+        self.hw_acceleration = hw_acceleration
+        self.cap = self._open()
+        
+        self.frame_width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self.frame_height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS)
+        self.frame_count = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT)) or None
+        self.position = 0
+        
+        logger.info(f"Video source opened: {path} ({self.frame_width}x{self.frame_height}, "
+                    f"{self.frame_count} frames)")
+    
+    def _open(self):
+        """Open the file, letting OpenCV pick any available hardware decoder if requested."""
+        params = []
+        if self.hw_acceleration:
+            params = [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY]
+        cap = cv2.VideoCapture(self.path, cv2.CAP_ANY, params)
+        if not cap.isOpened():
+            logger.error(f"Cannot open video file: {self.path}")
+            raise RuntimeError(f"Cannot open video file: {self.path}")
+        return cap
+    
+    def read_frame(self):
+        ret, frame = self.cap.read()
+        if ret:
+            self.position += 1
+        return ret, frame
+    
+    def seek(self, index: int):
+        if index == self.position:
+            return
+        
+        if self.position < index <= self.position + self.SHORT_SEEK_FRAMES:
+            self._grab_forward(index)
+            return
+        
+        # Container seeks can land on the wrong frame for some codecs; verify and
+        # fall back to decoding forward from the start when they do
+        self.cap.set(cv2.CAP_PROP_POS_FRAMES, index)
+        if int(self.cap.get(cv2.CAP_PROP_POS_FRAMES)) == index:
+            self.position = index
+            return
+        
+        logger.warning(f"Inexact seek to frame {index}, decoding forward from the start")
+        self.cap.release()
+        self.cap = self._open()
+        self.position = 0
+        self._grab_forward(index)
+    
+    def _grab_forward(self, index: int):
+        """Advance to `index` with grab(), which skips the colour conversion of read()."""
+        while self.position < index:
+            if not self.cap.grab():
+                break
+            self.position += 1
+    
+    def tell(self) -> int:
+        return self.position
+    
+    def get_dimensions(self) -> Tuple[int, int]:
+        return self.frame_width, self.frame_height
+    
+    def release(self):
+        self.cap.release()
+
+class ImageSequenceSource(FrameSource):
+    """Frames loaded from the image files of a directory, in sorted filename order."""
+    
+    def __init__(self, directory: str):
+        self.paths = sorted(os.path.join(directory, name) for name in os.listdir(directory)
+                            if name.lower().endswith(IMAGE_EXTENSIONS))
+        if not self.paths:
+            raise RuntimeError(f"No images found in {directory}")
+        
+        first = cv2.imread(self.paths[0])
+        if first is None:
+            raise RuntimeError(f"Cannot read image: {self.paths[0]}")
+        self.frame_height, self.frame_width = first.shape[:2]
+        self.frame_count = len(self.paths)
+        self.position = 0
+    
+    def read_frame(self):
+        if self.position >= self.frame_count:
+            return False, None
+        frame = cv2.imread(self.paths[self.position])
+        if frame is None:
+            # Not end of stream: a batch job would record a half-read directory as done
+            raise RuntimeError(f"Cannot read image: {self.paths[self.position]}")
+        self.position += 1
+        return True, frame
+    
+    def seek(self, index: int):
+        self.position = max(0, index)
+    
+    def tell(self) -> int:
+        return self.position
+    
+    def get_dimensions(self) -> Tuple[int, int]:
+        return self.frame_width, self.frame_height
+
+class ArraySource(FrameSource):
+    """Frames served from an in-memory array of shape (N, H, W, 3) or a sequence of frames."""
+    
+    def __init__(self, frames: Union[np.ndarray, Sequence[np.ndarray]]):
+        if len(frames) == 0:
+            raise ValueError("ArraySource needs at least one frame")
+        self.frames = frames
+        self.frame_height, self.frame_width = frames[0].shape[:2]
+        self.frame_count = len(frames)
+        self.position = 0
+    
+    def read_frame(self):
+        if self.position >= self.frame_count:
+            return False, None
+        frame = self.frames[self.position]
+        self.position += 1
+        return True, frame
+    
+    def seek(self, index: int):
+        self.position = max(0, index)
+    
+    def tell(self) -> int:
+        return self.position
+    
+    def get_dimensions(self) -> Tuple[int, int]:
+        return self.frame_width, self.frame_height
+
+class _DecodeError:
+    """An exception raised by a prefetched source, queued in place of a frame."""
+    
+    def __init__(self, error: Exception):
+        self.error = error
+
+class PrefetchingSource(FrameSource):
+    """Decodes frames of another source ahead of time on a background thread."""
+    
+    _END = object()
+    
+    def __init__(self, source: FrameSource, prefetch_depth: int = 8):
+        self.source = source
+        self.prefetch_depth = prefetch_depth
+        self.fps = getattr(source, 'fps', None)
+        self.frame_count = source.frame_count
+        self.position = source.tell()
+        
+        self._queue = None
+        self._stop_event = None
+        self._thread = None
+        self._start()
+    
+    def _start(self):
+        """Start a decode-ahead thread from the inner source's current position."""
+        self._queue = queue.Queue(maxsize=self.prefetch_depth)
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._decode_loop, args=(self._queue, self._stop_event),
+                                        name="FramePrefetch", daemon=True)
+        self._thread.start()
+    
+    def _decode_loop(self, frame_queue: queue.Queue, stop_event: threading.Event):
+        """Fill the queue with decoded frames until the source ends, fails or a stop is requested."""
+        end = self._END
+        try:
+            while not stop_event.is_set():
+                ret, frame = self.source.read_frame()
+                if not ret:
+                    break
+                self._put(frame_queue, stop_event, frame)
+        except Exception as e:
+            # Handed to the reader, which would otherwise wait for a frame forever
+            end = _DecodeError(e)
+        finally:
+            self._put(frame_queue, stop_event, end)
+    
+    @staticmethod
+    def _put(frame_queue: queue.Queue, stop_event: threading.Event, item):
+        while not stop_event.is_set():
+            try:
+                frame_queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+    
+    def _stop(self):
+        """Stop the decode-ahead thread and discard prefetched frames."""
+        self._stop_event.set()
+        self._thread.join()
+    
+    def read_frame(self):
+        item = self._queue.get()
+        if item is self._END or isinstance(item, _DecodeError):
+            # Keep returning end-of-stream (or raising) on further reads
+            self._queue.put(item)
+            if item is not self._END:
+                raise item.error
+            return False, None
+        self.position += 1
+        return True, item
+    
+    def seek(self, index: int):
+        if index == self.position:
+            return
+        self._stop()
+        self.source.seek(index)
+        self.position = self.source.tell()
+        self._start()
+    
+    def tell(self) -> int:
+        return self.position
+    
+    def get_dimensions(self) -> Tuple[int, int]:
+        return self.source.get_dimensions()
+    
+    def release(self):
+        self._stop()
+        self.source.release()
+
+def open_source(source, prefetch_depth: int = 0, hw_acceleration: bool = False, mjpeg: bool = False,
+                decode_scale: int = 1):
+    """
+    Open a frame source from a camera index, video file, image directory or array.
+    
+    File-backed sources are wrapped in a PrefetchingSource when prefetch_depth > 0.
+    Cameras are opened in MJPG mode with pooled JPEG decoding when mjpeg is set.
+    """
+    if isinstance(source, int) or (isinstance(source, str) and source.isdigit()):
+        if mjpeg:
+            return MjpegCameraManager(int(source), decode_scale=decode_scale)
+        return CameraManager(int(source))
+    
+    if isinstance(source, FrameSource):
+        frame_source = source
+    elif isinstance(source, (np.ndarray, list, tuple)):
+        frame_source = ArraySource(source)
+    elif os.path.isdir(source):
+        frame_source = ImageSequenceSource(source)
+    else:
+        frame_source = VideoFileSource(source, hw_acceleration)
+    
+    if prefetch_depth > 0:
+        return PrefetchingSource(frame_source, prefetch_depth)
+    return frame_source
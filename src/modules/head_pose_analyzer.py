@@ -1,19 +1,26 @@
 from typing import Tuple
 
+from src.modules.landmark_features import LEFT_EYE_OUTER, RIGHT_EYE_OUTER, LEFT_IRIS, RIGHT_IRIS
+
 class HeadPoseAnalyzer:
     """Handles head pose and face tilt analysis."""
     
-    def __init__(self, face_tilt_threshold: float = 15, head_pose_threshold: float = 0.028):
+    def __init__(self, face_tilt_threshold: float = 15, head_pose_threshold: float = 0.028,
+                 roll_threshold: float = 10.0, yaw_threshold: float = 20.0):
         self.face_tilt_threshold = face_tilt_threshold
         self.head_pose_threshold = head_pose_threshold
         
+        # Degree thresholds used with HeadPoseEstimator angles
+        self.roll_threshold = roll_threshold
+        self.yaw_threshold = yaw_threshold
+        
         # Landmarks for face tilt detection
-        self.left_eye_outer = 33
-        self.right_eye_outer = 263
+        self.left_eye_outer = LEFT_EYE_OUTER
+        self.right_eye_outer = RIGHT_EYE_OUTER
         
         # Iris indices for head pose
-        self.left_iris_index = 468
-        self.right_iris_index = 473
+        self.left_iris_index = LEFT_IRIS
+        self.right_iris_index = RIGHT_IRIS
     
     def check_face_tilt(self, face_landmarks, frame_width: int, frame_height: int) -> Tuple[bool, float]:
         """Check if face is tilted beyond threshold."""
@@ -21,6 +28,10 @@ class HeadPoseAnalyzer:
         right_eye_y = face_landmarks.landmark[self.right_eye_outer].y * frame_height
         eye_y_difference = abs(left_eye_y - right_eye_y)
         
+        return self.classify_tilt(eye_y_difference)
+    
+    def classify_tilt(self, eye_y_difference: float) -> Tuple[bool, float]:
+        """Classify tilt from the vertical distance (pixels) between the outer eye corners."""
         is_tilted = eye_y_difference > self.face_tilt_threshold
         confidence = max(0, 1 - (eye_y_difference / self.face_tilt_threshold)) if is_tilted else 1.0
         
@@ -30,10 +41,15 @@ class HeadPoseAnalyzer:
         """Analyze head pose based on iris Z positions."""
         left_iris_z = face_landmarks.landmark[self.left_iris_index].z
         right_iris_z = face_landmarks.landmark[self.right_iris_index].z
-        z_diff = abs(left_iris_z - right_iris_z)
+        
+        return self.classify_head_pose(left_iris_z - right_iris_z)
+    
+    def classify_head_pose(self, iris_z_diff: float) -> Tuple[bool, str, float]:
+        """Classify head turn from the signed left-minus-right iris Z difference."""
+        z_diff = abs(iris_z_diff)
         
         if z_diff > self.head_pose_threshold:
-            if left_iris_z > right_iris_z:
+            if iris_z_diff > 0:
                 return True, "left", z_diff
             else:
                 return True, "right", z_diff
@@ -0,0 +1,118 @@
+import math
+import logging
+from typing import Dict, NamedTuple, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from src.modules.landmark_features import POSE_ROWS
+
+logger = logging.getLogger(__name__)
+
+# Generic face model (mm) in camera-style axes: x right, y down, z away from the camera.
+# Rows follow POSE_ROWS: nose tip, chin, left/right outer eye corner, left/right mouth corner.
+MODEL_POINTS = np.array([
+    [0.0, 0.0, 0.0],
+    [0.0, 330.0, 65.0],
+    [-225.0, -170.0, 135.0],
+    [225.0, -170.0, 135.0],
+    [-150.0, 150.0, 125.0],
+    [150.0, 150.0, 125.0],
+])
+
+_NO_DISTORTION = np.zeros((4, 1))
+
+class HeadPose(NamedTuple):
+    """Head rotation in degrees. Positive yaw turns the image-left side away from the camera."""
+    yaw: float
+    pitch: float
+    roll: float
+
+class HeadPoseEstimator:
+    """Estimates yaw/pitch/roll with solvePnP, warm-started from the previous frame."""
+    
+    def __init__(self, max_step_degrees: float = 45.0):
+        # Intrinsics cached per frame resolution
+        self._camera_matrices: Dict[Tuple[int, int], np.ndarray] = {}
+        
+        # Previous (resolution, rvec, tvec) per face, used as the extrinsic guess
+        self._previous: Dict[int, Tuple[Tuple[int, int], np.ndarray, np.ndarray]] = {}
+        self.max_step_degrees = max_step_degrees
+    
+    def camera_matrix(self, frame_width: int, frame_height: int) -> np.ndarray:
+        """Approximate pinhole intrinsics (focal length = frame width) for a resolution."""
+        key = (frame_width, frame_height)
+        matrix = self._camera_matrices.get(key)
+        if matrix is None:
+            matrix = np.array([
+                [frame_width, 0.0, frame_width / 2],
+                [0.0, frame_width, frame_height / 2],
+                [0.0, 0.0, 1.0],
+            ])
+            self._camera_matrices[key] = matrix
+        return matrix
+    
+    def estimate(self, points: np.ndarray, frame_width: int, frame_height: int,
+                 face_id: Optional[int] = 0) -> Optional[HeadPose]:
+        """
+        Estimate head pose from landmarks gathered with LANDMARK_INDICES.
+        
+        Pass face_id=None for an independent solve that neither uses nor updates tracking state.
+        """
+        image_points = points[POSE_ROWS, :2] * (frame_width, frame_height)
+        if np.isnan(image_points).any():
+            return None
+        
+        resolution = (frame_width, frame_height)
+        camera_matrix = self.camera_matrix(frame_width, frame_height)
+        previous = self._previous.get(face_id) if face_id is not None else None
+        
+        if previous is not None and previous[0] == resolution:
+            rvec, tvec = previous[1].copy(), previous[2].copy()
+            ok, rvec, tvec = cv2.solvePnP(MODEL_POINTS, image_points, camera_matrix, _NO_DISTORTION,
+                                          rvec, tvec, useExtrinsicGuess=True, flags=cv2.SOLVEPNP_ITERATIVE)
+            # A large jump means the guess led the solver astray; solve from scratch
+            if ok and np.degrees(np.linalg.norm(rvec - previous[1])) > self.max_step_degrees:
+                ok = False
+        else:
+            ok = False
+        
+        if not ok:
+            ok, rvec, tvec = cv2.solvePnP(MODEL_POINTS, image_points, camera_matrix, _NO_DISTORTION,
+                                          flags=cv2.SOLVEPNP_ITERATIVE)
+            if not ok:
+                self._previous.pop(face_id, None)
+                return None
+        
+        if face_id is not None:
+            self._previous[face_id] = (resolution, rvec, tvec)
+        return self._to_angles(rvec)
+    
+    @staticmethod
+    def _to_angles(rvec: np.ndarray) -> HeadPose:
+        """Convert a Rodrigues vector into yaw/pitch/roll degrees."""
+        rotation, _ = cv2.Rodrigues(rvec)
+        pitch = math.atan2(rotation[2, 1], rotation[2, 2])
+        yaw = math.atan2(-rotation[2, 0], math.hypot(rotation[2, 1], rotation[2, 2]))
+        roll = math.atan2(rotation[1, 0], rotation[0, 0])
+        return HeadPose(math.degrees(yaw), math.degrees(pitch), math.degrees(roll))
+    
+    def get_state(self) -> dict:
+        """JSON-serializable warm-start state of every face."""
+        return {str(face_id): {'resolution': list(resolution), 'rvec': rvec.ravel().tolist(),
+                               'tvec': tvec.ravel().tolist()}
+                for face_id, (resolution, rvec, tvec) in self._previous.items()}
+    
+    def set_state(self, state: dict):
+        """Restore state from get_state()."""
+        self._previous = {int(face_id): (tuple(face_state['resolution']),
+                                         np.array(face_state['rvec'], dtype=np.float64).reshape(3, 1),
+                                         np.array(face_state['tvec'], dtype=np.float64).reshape(3, 1))
+                          for face_id, face_state in state.items()}
+    
+    def reset(self, face_id: Optional[int] = None):
+        """Drop the warm-start state for one face, or for all faces."""
+        if face_id is None:
+            self._previous.clear()
+        else:
+            self._previous.pop(face_id, None)
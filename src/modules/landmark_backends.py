@@ -0,0 +1,277 @@
+import logging
+import zipfile
+import numpy as np
+from typing import List, Optional, Sequence, Tuple
+
+from src.modules.landmark_features import LANDMARK_INDICES, gather_landmarks
+from src.modules.synthetic_landmarks import SyntheticFaceGenerator
+
+logger = logging.getLogger(__name__)
+
+# Names accepted by DetectorConfig.landmark_backend
+LANDMARK_BACKENDS = ('mediapipe', 'replay', 'synthetic')
+
+class LandmarkBackend:
+    """
+    Interface of landmark detectors used by ConcentrationDetector.
+    
+    detect() takes an RGB frame and returns one (K, 3) array of normalized
+    landmarks per face, in LANDMARK_INDICES order. Backends that ignore pixels
+    set `uses_pixels = False` so the detector skips resizing and color conversion.
+    """
+    
+    uses_pixels = True
+    
+    def detect(self, frame_rgb: Optional[np.ndarray]) -> List[np.ndarray]:
+        raise NotImplementedError
+    
+    def skip_frame(self):
+        """Called instead of detect() for a frame the detector reuses earlier landmarks on."""
+        pass
+    
+    def reconfigure(self, detection_confidence: float, tracking_confidence: float,
+                    refine_landmarks: bool) -> bool:
+        """Apply Face Mesh settings; returns True if the backend was rebuilt."""
+        return False
+    
+    def set_refine_landmarks(self, refine_landmarks: bool):
+        pass
+    
+    def restart(self):
+        """Recreate worker threads so they inherit the calling thread's CPU affinity."""
+        pass
+    
+    def get_state(self) -> dict:
+        """JSON-serializable position in the landmark stream, for backends that have one."""
+        return {}
+    
+    def set_state(self, state: dict):
+        pass
+    
+    def cleanup(self):
+        pass
+
+class MediaPipeBackend(LandmarkBackend):
+    """MediaPipe Face Mesh through a FaceMeshProcessor."""
+    
+    def __init__(self, processor):
+        self.processor = processor
+    
+    def detect(self, frame_rgb: np.ndarray) -> List[np.ndarray]:
+        results = self.processor.process_frame(frame_rgb)
+        return [gather_landmarks(face_landmarks) for face_landmarks in results.multi_face_landmarks or []]
+    
+    def reconfigure(self, detection_confidence: float, tracking_confidence: float,
+                    refine_landmarks: bool) -> bool:
+        return self.processor.reconfigure(detection_confidence, tracking_confidence, refine_landmarks)
+    
+    def set_refine_landmarks(self, refine_landmarks: bool):
+        self.processor.set_refine_landmarks(refine_landmarks)
+    
+    def restart(self):
+        self.processor.restart()
+    
+    def cleanup(self):
+        self.processor.cleanup()
+
+def _pack_frames(frames: Sequence[Sequence[np.ndarray]]) -> Tuple[np.ndarray, np.ndarray]:
+    """Stack frames into one NaN-padded (N, F, K, 3) array and per-frame face counts."""
+    max_faces = max((len(faces) for faces in frames), default=0)
+    landmarks = np.full((len(frames), max_faces, len(LANDMARK_INDICES), 3), np.nan)
+    for index, faces in enumerate(frames):
+        if len(faces):
+            landmarks[index, :len(faces)] = faces
+    return landmarks, np.array([len(faces) for faces in frames], dtype=np.int64)
+
+def save_landmarks(path: str, frames: Sequence[Sequence[np.ndarray]],
+                   frame_indices: Optional[Sequence[int]] = None):
+    """
+    Write per-frame landmarks (a list of faces per frame) as a compressed .npz file.
+    
+    Frames with fewer faces than the most crowded one are padded with NaN.
+    `frame_indices` gives each entry's source frame when not every frame was inferred.
+    """
+    landmarks, face_counts = _pack_frames(frames)
+    arrays = {'landmarks': landmarks, 'face_counts': face_counts}
+    if frame_indices is not None:
+        arrays['frame_indices'] = np.asarray(frame_indices, dtype=np.int64)
+    np.savez_compressed(path, **arrays)
+
+def append_landmarks(path: str, chunk: int, frames: Sequence[Sequence[np.ndarray]],
+                     frame_indices: Sequence[int]):
+    """
+    Add frames and their source frame indices to a chunked .npz file as chunk number `chunk`.
+    
+    Chunk 0 creates the file. Each chunk is padded on its own. The archive is
+    closed after every chunk, so a crash loses only the frames not yet appended.
+    """
+    landmarks, face_counts = _pack_frames(frames)
+    arrays = (('landmarks', landmarks), ('face_counts', face_counts),
+              ('frame_indices', np.asarray(frame_indices, dtype=np.int64)))
+    with zipfile.ZipFile(path, 'a' if chunk else 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, array in arrays:
+            with archive.open(f'{name}_{chunk:05d}.npy', 'w', force_zip64=True) as member:
+                np.lib.format.write_array(member, array)
+
+def _read_landmarks(path: str) -> Tuple[List[List[np.ndarray]], Optional[np.ndarray]]:
+    """Frames and, if recorded, their source frame indices."""
+    frames, indices = [], []
+    with np.load(path) as data:
+        if 'landmarks' in data.files:
+            chunks = ['']
+        else:
+            chunks = sorted(name[len('landmarks'):] for name in data.files if name.startswith('landmarks_'))
+        for suffix in chunks:
+            landmarks, face_counts = data['landmarks' + suffix], data['face_counts' + suffix]
+            frames.extend(list(landmarks[index, :count]) for index, count in enumerate(face_counts.tolist()))
+            if 'frame_indices' + suffix in data.files:
+                indices.append(data['frame_indices' + suffix])
+    return frames, np.concatenate(indices) if indices else None
+
+def load_landmarks(path: str) -> List[List[np.ndarray]]:
+    """Read per-frame landmarks written by save_landmarks() or append_landmarks()."""
+    return _read_landmarks(path)[0]
+
+class ReplayBackend(LandmarkBackend):
+    """
+    Replays landmarks recorded with RecordingBackend, in step with the source frames.
+    
+    `position` counts source frames, including those skipped by the inference
+    stride or motion gating, so the replay stays aligned with the source however
+    often this run infers. A frame the recording run did not infer gets the
+    landmarks of the last one it did. Past the end of the recording it reports no
+    faces, or starts over with `loop`.
+    """
+    
+    uses_pixels = False
+    
+    def __init__(self, path: str, loop: bool = False):
+        self.path = path
+        self.loop = loop
+        self.frames, frame_indices = _read_landmarks(path)
+        # Recordings without indices have one entry per source frame
+        self.frame_indices = np.arange(len(self.frames)) if frame_indices is None else frame_indices
+        self.frame_count = int(self.frame_indices[-1]) + 1 if len(self.frames) else 0
+        self.position = 0
+        logger.info(f"Replaying {self.frame_count} frames of landmarks from {path}")
+    
+    def detect(self, frame_rgb: Optional[np.ndarray]) -> List[np.ndarray]:
+        if self.position >= self.frame_count:
+            if not self.loop or not self.frames:
+                self.position += 1
+                return []
+            self.position %= self.frame_count
+        entry = int(np.searchsorted(self.frame_indices, self.position, side='right')) - 1
+        self.position += 1
+        return self.frames[entry] if entry >= 0 else []
+    
+    def skip_frame(self):
+        self.position += 1
+    
+    def rewind(self):
+        """Start over from the first frame."""
+        self.position = 0
+
+    def get_state(self) -> dict:
+        return {'position': self.position}
+    
+    def set_state(self, state: dict):
+        self.position = state.get('position', 0)
+
+class SyntheticBackend(LandmarkBackend):
+    """
+    Zero-cost stub: cycles through pre-rendered synthetic landmarks.
+    
+    The sequence mixes head turns, blinks and occlusions (frames without a face)
+    so every downstream stage is exercised, at no per-frame cost.
+    """
+    
+    uses_pixels = False
+    
+    def __init__(self, frames: int = 900, seed: Optional[int] = 0, occlusion_rate: float = 6.0):
+        generator = SyntheticFaceGenerator(seed=seed)
+        track = generator.with_blinks(generator.head_turn(frames))
+        points = generator.render(track, indices=LANDMARK_INDICES)
+        missing = generator.occlusions(frames, rate_per_minute=occlusion_rate)
+        self.frames = [[] if lost else [face] for face, lost in zip(points, missing.tolist())]
+        self.position = 0
+    
+    def detect(self, frame_rgb: Optional[np.ndarray]) -> List[np.ndarray]:
+        faces = self.frames[self.position]
+        self.position = (self.position + 1) % len(self.frames)
+        return faces
+    
+    def get_state(self) -> dict:
+        return {'position': self.position}
+    
+    def set_state(self, state: dict):
+        self.position = state.get('position', 0) % len(self.frames)
+
+class RecordingBackend(LandmarkBackend):
+    """
+    Passes another backend's landmarks through and saves them for ReplayBackend.
+    
+    Each landmark set is saved with the index of its source frame, counting the
+    frames skipped between inferences. Frames are appended to the file every
+    `chunk_frames` inferences (about a minute at 30 FPS by default) and on
+    cleanup, so memory use does not grow with the length of the session.
+    """
+    
+    def __init__(self, backend: LandmarkBackend, path: str, chunk_frames: int = 1800):
+        if chunk_frames < 1:
+            raise ValueError(f"chunk_frames must be at least 1, got {chunk_frames}")
+        self.backend = backend
+        self.path = path
+        self.chunk_frames = chunk_frames
+        self.uses_pixels = backend.uses_pixels
+        self.frames: List[List[np.ndarray]] = []
+        self.frame_indices: List[int] = []
+        self.frame_index = 0
+        self.frames_saved = 0
+        self.chunks = 0
+    
+    def detect(self, frame_rgb: Optional[np.ndarray]) -> List[np.ndarray]:
+        faces = self.backend.detect(frame_rgb)
+        self.frames.append([np.array(points) for points in faces])
+        self.frame_indices.append(self.frame_index)
+        self.frame_index += 1
+        if len(self.frames) >= self.chunk_frames:
+            self.flush()
+        return faces
+    
+    def skip_frame(self):
+        self.backend.skip_frame()
+        self.frame_index += 1
+    
+    def flush(self):
+        """Append the frames recorded since the last flush to the file."""
+        if not self.frames and self.chunks:
+            return
+        append_landmarks(self.path, self.chunks, self.frames, self.frame_indices)
+        self.chunks += 1
+        self.frames_saved += len(self.frames)
+        self.frames = []
+        self.frame_indices = []
+    
+    def reconfigure(self, detection_confidence: float, tracking_confidence: float,
+                    refine_landmarks: bool) -> bool:
+        return self.backend.reconfigure(detection_confidence, tracking_confidence, refine_landmarks)
+    
+    def set_refine_landmarks(self, refine_landmarks: bool):
+        self.backend.set_refine_landmarks(refine_landmarks)
+    
+    def restart(self):
+        self.backend.restart()
+    
+    def get_state(self) -> dict:
+        return dict(self.backend.get_state(), recording_index=self.frame_index)
+    
+    def set_state(self, state: dict):
+        state = dict(state)
+        self.frame_index = state.pop('recording_index', self.frame_index)
+        self.backend.set_state(state)
+    
+    def cleanup(self):
+        self.flush()
+        logger.info(f"Saved {self.frames_saved} frames of landmarks to {self.path}")
+        self.backend.cleanup()
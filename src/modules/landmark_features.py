@@ -0,0 +1,164 @@
+import math
+from typing import NamedTuple
+
+import numpy as np
+
+# MediaPipe Face Mesh landmark indices used by the analyzers
+LEFT_EYE_OUTER = 33
+RIGHT_EYE_OUTER = 263
+LEFT_EYE_INNER = 133
+RIGHT_EYE_INNER = 362
+LEFT_EYE_TOP = 159
+LEFT_EYE_BOTTOM = 145
+RIGHT_EYE_TOP = 386
+RIGHT_EYE_BOTTOM = 374
+LEFT_IRIS = 468
+RIGHT_IRIS = 473
+
+# Additional landmarks for 3D head pose estimation
+NOSE_TIP = 1
+CHIN = 152
+LEFT_MOUTH_CORNER = 61
+RIGHT_MOUTH_CORNER = 291
+
+# Union of all landmarks the features need, gathered once per face.
+# Iris points come last since they only exist with refine_landmarks.
+LANDMARK_INDICES = np.array([
+    LEFT_EYE_OUTER, RIGHT_EYE_OUTER, LEFT_EYE_INNER, RIGHT_EYE_INNER,
+    LEFT_EYE_TOP, LEFT_EYE_BOTTOM, RIGHT_EYE_TOP, RIGHT_EYE_BOTTOM,
+    NOSE_TIP, CHIN, LEFT_MOUTH_CORNER, RIGHT_MOUTH_CORNER,
+    LEFT_IRIS, RIGHT_IRIS,
+])
+_ROW = {index: row for row, index in enumerate(LANDMARK_INDICES.tolist())}
+
+# Rows of the gathered array, paired (left eye, right eye)
+_OUTER = np.array([_ROW[LEFT_EYE_OUTER], _ROW[RIGHT_EYE_OUTER]])
+_INNER = np.array([_ROW[LEFT_EYE_INNER], _ROW[RIGHT_EYE_INNER]])
+_TOP = np.array([_ROW[LEFT_EYE_TOP], _ROW[RIGHT_EYE_TOP]])
+_BOTTOM = np.array([_ROW[LEFT_EYE_BOTTOM], _ROW[RIGHT_EYE_BOTTOM]])
+_IRIS = np.array([_ROW[LEFT_IRIS], _ROW[RIGHT_IRIS]])
+_EAR_ROWS = np.concatenate([_TOP, _BOTTOM, _INNER, _OUTER])
+_GAZE_ROWS = np.concatenate([_IRIS, _INNER, _OUTER])
+
+# Rows used for head pose, in the order of HeadPoseEstimator's 3D model points
+POSE_ROWS = np.array([_ROW[i] for i in (NOSE_TIP, CHIN, LEFT_EYE_OUTER, RIGHT_EYE_OUTER,
+                                         LEFT_MOUTH_CORNER, RIGHT_MOUTH_CORNER)])
+
+# Columns of the feature vector
+F_LEFT_EAR = 0
+F_RIGHT_EAR = 1
+F_TILT = 2
+F_LEFT_GAZE = 3
+F_RIGHT_GAZE = 4
+F_IRIS_Z_DIFF = 5
+F_GAZE_MISSING = 6
+F_YAW = 7
+F_PITCH = 8
+F_ROLL = 9
+F_LEFT_GAZE_Y = 10
+F_RIGHT_GAZE_Y = 11
+NUM_FEATURES = 12
+
+# EAR reported when eye landmarks are unavailable, as EyeAnalyzer.calculate_ear does
+DEFAULT_EAR = 0.3
+
+class FaceFeatures(NamedTuple):
+    """Per-face features computed in a single pass over the gathered landmarks."""
+    left_ear: float
+    right_ear: float
+    tilt: float                # vertical distance between the outer eye corners, in pixels
+    left_gaze_ratio: float     # NaN when the eye width is zero
+    right_gaze_ratio: float
+    iris_z_diff: float         # left iris z minus right iris z
+    gaze_missing: float        # 1.0 when iris or eye corner landmarks are missing
+    yaw: float = math.nan      # head pose in degrees, filled in by HeadPoseEstimator
+    pitch: float = math.nan
+    roll: float = math.nan
+    left_gaze_y: float = math.nan   # iris height between the eyelids: 0 upper lid, 1 lower lid
+    right_gaze_y: float = math.nan
+    
+    @classmethod
+    def from_vector(cls, vector: np.ndarray) -> "FaceFeatures":
+        return cls(*vector.tolist())
+
+def gather_landmarks(face_landmarks) -> np.ndarray:
+    """
+    Gather the landmarks in LANDMARK_INDICES into a (K, 3) array of normalized x, y, z.
+    
+    Accepts a MediaPipe landmark list or a (478, 3) array. Missing landmarks
+    (for example iris points without refine_landmarks) become NaN rows.
+    """
+    if isinstance(face_landmarks, np.ndarray):
+        if face_landmarks.shape[0] <= LANDMARK_INDICES.max():
+            padded = np.full((LANDMARK_INDICES.max() + 1, 3), np.nan)
+            padded[:face_landmarks.shape[0]] = face_landmarks
+            face_landmarks = padded
+        return face_landmarks[LANDMARK_INDICES]
+    
+    landmark = face_landmarks.landmark
+    try:
+        return np.array([(landmark[i].x, landmark[i].y, landmark[i].z) for i in LANDMARK_INDICES.tolist()])
+    except (IndexError, KeyError):
+        points = np.full((len(LANDMARK_INDICES), 3), np.nan)
+        for row, i in enumerate(LANDMARK_INDICES.tolist()):
+            try:
+                points[row] = (landmark[i].x, landmark[i].y, landmark[i].z)
+            except (IndexError, KeyError):
+                pass
+        return points
+
+def extract_features(points: np.ndarray, frame_width: int, frame_height: int) -> np.ndarray:
+    """
+    Compute the feature vector from gathered landmarks.
+    
+    `points` has shape (..., K, 3) so whole batches of faces are handled at once;
+    the result has shape (..., NUM_FEATURES). Arithmetic follows the order used by
+    EyeAnalyzer and HeadPoseAnalyzer so results match them exactly.
+    """
+    x = points[..., 0] * frame_width
+    y = points[..., 1] * frame_height
+    z = points[..., 2]
+    features = np.empty(points.shape[:-2] + (NUM_FEATURES,))
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Eye aspect ratios for both eyes
+        vertical = np.abs(y[..., _TOP] - y[..., _BOTTOM])
+        horizontal = np.abs(x[..., _OUTER] - x[..., _INNER])
+        ear = np.where(horizontal == 0, 0.0, vertical / horizontal)
+        ear_missing = np.isnan(points[..., _EAR_ROWS, :2]).reshape(points.shape[:-2] + (4, 2, 2))
+        ear_missing = ear_missing.any(axis=(-3, -1))
+        features[..., F_LEFT_EAR:F_RIGHT_EAR + 1] = np.where(ear_missing, DEFAULT_EAR, ear)
+        
+        # Face tilt from the outer eye corners
+        features[..., F_TILT] = np.abs(y[..., _OUTER[0]] - y[..., _OUTER[1]])
+        
+        # Horizontal gaze ratios; a zero eye width yields NaN
+        width = x[..., _OUTER] - x[..., _INNER]
+        ratio = (x[..., _IRIS] - x[..., _INNER]) / width
+        features[..., F_LEFT_GAZE:F_RIGHT_GAZE + 1] = np.where(width == 0, np.nan, ratio)
+    
+        # Vertical gaze ratios from the eyelids; looking down moves the iris toward the lower lid
+        opening = y[..., _BOTTOM] - y[..., _TOP]
+        ratio_y = (y[..., _IRIS] - y[..., _TOP]) / opening
+        features[..., F_LEFT_GAZE_Y:F_RIGHT_GAZE_Y + 1] = np.where(opening == 0, np.nan, ratio_y)
+    
+    features[..., F_IRIS_Z_DIFF] = z[..., _IRIS[0]] - z[..., _IRIS[1]]
+    features[..., F_GAZE_MISSING] = np.isnan(x[..., _GAZE_ROWS]).any(axis=-1)
+    features[..., F_YAW:F_ROLL + 1] = np.nan
+    return features
+
+def gaze_vector(features: np.ndarray) -> np.ndarray:
+    """
+    2D gaze point of both eyes from (..., NUM_FEATURES) features, shaped (..., 2).
+    
+    x is 0.5 when the irises are aligned and grows toward "Eyes on left" (the left
+    eye's ratio rises while the right eye's falls); y is the mean vertical ratio.
+    NaN where a ratio is unavailable.
+    """
+    x = 0.5 + (features[..., F_LEFT_GAZE] - features[..., F_RIGHT_GAZE]) / 2
+    y = (features[..., F_LEFT_GAZE_Y] + features[..., F_RIGHT_GAZE_Y]) / 2
+    return np.stack([x, y], axis=-1)
+
+def compute_face_features(face_landmarks, frame_width: int, frame_height: int) -> FaceFeatures:
+    """Gather landmarks and compute all features for a single face."""
+    return FaceFeatures.from_vector(extract_features(gather_landmarks(face_landmarks), frame_width, frame_height))
@@ -0,0 +1,145 @@
+import math
+import logging
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from src.modules.landmark_features import (LANDMARK_INDICES, LEFT_EYE_TOP, LEFT_EYE_BOTTOM,
+                                           RIGHT_EYE_TOP, RIGHT_EYE_BOTTOM, LEFT_IRIS, RIGHT_IRIS)
+
+logger = logging.getLogger(__name__)
+
+# Per-signal (min_cutoff Hz, beta) overrides. Eyelids and irises move fast during
+# blinks and saccades, so they get a higher speed coefficient to keep lag low.
+DEFAULT_SIGNAL_PARAMS = {
+    LEFT_EYE_TOP: (1.5, 20.0),
+    LEFT_EYE_BOTTOM: (1.5, 20.0),
+    RIGHT_EYE_TOP: (1.5, 20.0),
+    RIGHT_EYE_BOTTOM: (1.5, 20.0),
+    LEFT_IRIS: (1.5, 15.0),
+    RIGHT_IRIS: (1.5, 15.0),
+}
+
+def _smoothing_factor(dt: float, cutoff):
+    """Exponential smoothing factor for a first-order low-pass filter."""
+    tau = 1.0 / (2 * math.pi * cutoff)
+    return 1.0 / (1.0 + tau / dt)
+
+class OneEuroFilter:
+    """
+    One-Euro filter applied element-wise to a (K, 3) landmark array.
+    
+    Each landmark row can have its own min_cutoff and beta, so slow signals are
+    smoothed hard while fast ones (blinks, saccades) pass with little lag.
+    Cost per frame is a handful of vector operations over the K rows.
+    """
+    
+    def __init__(self, min_cutoff=1.0, beta=5.0, d_cutoff: float = 1.0):
+        # Shape (K, 1) or scalar, broadcast over x, y, z
+        self.min_cutoff = np.asarray(min_cutoff, dtype=np.float64)
+        self.beta = np.asarray(beta, dtype=np.float64)
+        if self.min_cutoff.ndim == 1:
+            self.min_cutoff = self.min_cutoff[:, None]
+        if self.beta.ndim == 1:
+            self.beta = self.beta[:, None]
+        self.d_cutoff = d_cutoff
+        self.reset()
+    
+    def reset(self):
+        """Forget the filter state."""
+        self.value: Optional[np.ndarray] = None
+        self.derivative: Optional[np.ndarray] = None
+        self.timestamp: Optional[float] = None
+    
+    def __call__(self, points: np.ndarray, timestamp: float) -> np.ndarray:
+        """Filter a new measurement taken at `timestamp` (seconds)."""
+        if self.value is None or timestamp <= self.timestamp:
+            self.value = points.copy()
+            self.derivative = np.zeros_like(points)
+            self.timestamp = timestamp
+            return self.value
+        
+        dt = timestamp - self.timestamp
+        derivative = (points - self.value) / dt
+        alpha_d = _smoothing_factor(dt, self.d_cutoff)
+        derivative = alpha_d * derivative + (1 - alpha_d) * self.derivative
+        
+        cutoff = self.min_cutoff + self.beta * np.abs(derivative)
+        alpha = _smoothing_factor(dt, cutoff)
+        value = alpha * points + (1 - alpha) * self.value
+        
+        # Landmarks that were missing before (or are missing now) restart from the raw input
+        restart = np.isnan(self.value)
+        self.value = np.where(restart, points, value)
+        self.derivative = np.where(restart | np.isnan(derivative), 0.0, derivative)
+        self.timestamp = timestamp
+        return self.value
+    
+    def predict(self, timestamp: float) -> Optional[np.ndarray]:
+        """Extrapolate the landmarks to `timestamp` with the filtered velocity."""
+        if self.value is None:
+            return None
+        return self.value + self.derivative * (timestamp - self.timestamp)
+
+class LandmarkFilterBank:
+    """One-Euro filters for the analyzer landmark subset, one filter per face."""
+    
+    def __init__(self, min_cutoff: float = 1.0, beta: float = 5.0, d_cutoff: float = 1.0,
+                 signal_params: Optional[Dict[int, Tuple[float, float]]] = None,
+                 max_gap: float = 0.5):
+        """
+        Args:
+            min_cutoff, beta: defaults for every landmark
+            signal_params: {landmark index: (min_cutoff, beta)} overrides
+            max_gap: seconds without a measurement after which a face's filter restarts
+        """
+        params = DEFAULT_SIGNAL_PARAMS if signal_params is None else signal_params
+        self.min_cutoff = np.array([params.get(i, (min_cutoff, beta))[0] for i in LANDMARK_INDICES.tolist()])
+        self.beta = np.array([params.get(i, (min_cutoff, beta))[1] for i in LANDMARK_INDICES.tolist()])
+        self.d_cutoff = d_cutoff
+        self.max_gap = max_gap
+        self.filters: Dict[int, OneEuroFilter] = {}
+    
+    def _get_filter(self, face_id: int) -> OneEuroFilter:
+        if face_id not in self.filters:
+            self.filters[face_id] = OneEuroFilter(self.min_cutoff, self.beta, self.d_cutoff)
+        return self.filters[face_id]
+    
+    def filter(self, face_id: int, points: np.ndarray, timestamp: float) -> np.ndarray:
+        """Filter gathered (K, 3) landmarks of a face."""
+        face_filter = self._get_filter(face_id)
+        if face_filter.timestamp is not None and timestamp - face_filter.timestamp > self.max_gap:
+            face_filter.reset()
+        return face_filter(points, timestamp)
+    
+    def predict(self, face_id: int, timestamp: float) -> Optional[np.ndarray]:
+        """Predict a face's landmarks for a frame where inference was skipped."""
+        face_filter = self.filters.get(face_id)
+        if face_filter is None or face_filter.timestamp is None:
+            return None
+        if timestamp - face_filter.timestamp > self.max_gap:
+            return None
+        return face_filter.predict(timestamp)
+    
+    def face_ids(self):
+        """Faces that currently have filter state."""
+        return [face_id for face_id, face_filter in self.filters.items() if face_filter.value is not None]
+    
+    def get_state(self) -> dict:
+        """JSON-serializable filter state of every face."""
+        return {str(face_id): {'value': face_filter.value.tolist(), 'derivative': face_filter.derivative.tolist(),
+                               'timestamp': face_filter.timestamp}
+                for face_id, face_filter in self.filters.items() if face_filter.value is not None}
+    
+    def set_state(self, state: dict, time_offset: float = 0.0):
+        """Restore state from get_state(), shifting timestamps by `time_offset`."""
+        self.filters.clear()
+        for face_id, face_state in state.items():
+            face_filter = self._get_filter(int(face_id))
+            face_filter.value = np.array(face_state['value'], dtype=np.float64)
+            face_filter.derivative = np.array(face_state['derivative'], dtype=np.float64)
+            face_filter.timestamp = face_state['timestamp'] + time_offset
+    
+    def reset(self):
+        """Drop all per-face state."""
+        self.filters.clear()
@@ -0,0 +1,427 @@
+import cv2
+import time
+import socket
+import struct
+import logging
+import selectors
+import threading
+import numpy as np
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Set
+
+from src.modules.detector_config import DetectorConfig
+from src.modules.landmark_features import LANDMARK_INDICES, extract_features, gather_landmarks
+from src.modules.result_smoother import BatchResultSmoother
+from src.modules.rule_engine import DEFAULT_RULES, NO_MATCH, RuleEngine
+
+logger = logging.getLogger(__name__)
+
+# Packet layout: header, then face_count * K * 3 big-endian uint16 landmark coordinates
+PACKET_MAGIC = b'GZ'
+PACKET_VERSION = 1
+_HEADER = struct.Struct('!2sBBIIdHH')   # magic, version, faces, stream id, sequence, timestamp, width, height
+_FACE_SHAPE = (len(LANDMARK_INDICES), 3)
+_FACE_BYTES = _FACE_SHAPE[0] * _FACE_SHAPE[1] * 2
+
+# Quantization range of normalized x, y, z: steps of ~3e-5, well below a pixel.
+# The top code marks a missing landmark (e.g. irises without refine_landmarks).
+_QUANT_LOW = np.array([-0.5, -0.5, -1.0])
+_QUANT_HIGH = np.array([1.5, 1.5, 1.0])
+_QUANT_MAX = 0xFFFE
+_MISSING = 0xFFFF
+
+class LandmarkPacket(NamedTuple):
+    """Landmarks of one frame of one stream."""
+    stream_id: int
+    sequence: int
+    timestamp: float
+    frame_width: int
+    frame_height: int
+    faces: np.ndarray   # (F, K, 3) landmarks gathered with LANDMARK_INDICES
+
+class StreamResult(NamedTuple):
+    """Central decision for one packet."""
+    stream_id: int
+    sequence: int
+    timestamp: float
+    concentrated: bool   # smoothed, as ConcentrationDetector reports it
+    reason: str
+    confidence: float
+
+def quantize(points: np.ndarray) -> np.ndarray:
+    """Map normalized landmarks to uint16 codes; NaN becomes the missing code."""
+    scaled = (np.clip(points, _QUANT_LOW, _QUANT_HIGH) - _QUANT_LOW) / (_QUANT_HIGH - _QUANT_LOW)
+    codes = np.rint(np.nan_to_num(scaled) * _QUANT_MAX).astype(np.uint16)
+    codes[np.isnan(points)] = _MISSING
+    return codes
+
+def dequantize(codes: np.ndarray) -> np.ndarray:
+    """Inverse of quantize."""
+    points = codes / _QUANT_MAX * (_QUANT_HIGH - _QUANT_LOW) + _QUANT_LOW
+    points[codes == _MISSING] = np.nan
+    return points
+
+def encode_packet(packet: LandmarkPacket) -> bytes:
+    """Serialize a packet: a 24-byte header plus 84 bytes per face."""
+    faces = np.asarray(packet.faces, dtype=np.float64).reshape((-1,) + _FACE_SHAPE)
+    header = _HEADER.pack(PACKET_MAGIC, PACKET_VERSION, len(faces), packet.stream_id, packet.sequence,
+                          packet.timestamp, packet.frame_width, packet.frame_height)
+    return header + quantize(faces).astype('>u2').tobytes()
+
+def packet_size(data) -> Optional[int]:
+    """Size of the packet starting at data[0], or None if the header is incomplete."""
+    if len(data) < _HEADER.size:
+        return None
+    magic, version, face_count = _HEADER.unpack_from(data)[:3]
+    if magic != PACKET_MAGIC or version != PACKET_VERSION:
+        raise ValueError(f"Not a landmark packet (magic={magic!r}, version={version})")
+    return _HEADER.size + face_count * _FACE_BYTES
+
+def decode_packet(data) -> LandmarkPacket:
+    """Deserialize one complete packet."""
+    size = packet_size(data)
+    if size is None or len(data) < size:
+        raise ValueError("Truncated landmark packet")
+    _, _, face_count, stream_id, sequence, timestamp, width, height = _HEADER.unpack_from(data)
+    codes = np.frombuffer(data, dtype='>u2', count=face_count * _FACE_BYTES // 2, offset=_HEADER.size)
+    faces = dequantize(codes.astype(np.uint16).reshape((face_count,) + _FACE_SHAPE))
+    return LandmarkPacket(stream_id, sequence, timestamp, width, height, faces)
+
+def split_packets(buffer: bytearray) -> List[LandmarkPacket]:
+    """Decode and remove every complete packet at the start of a receive buffer."""
+    packets = []
+    offset = 0
+    while True:
+        size = packet_size(memoryview(buffer)[offset:])
+        if size is None or len(buffer) - offset < size:
+            break
+        packets.append(decode_packet(bytes(buffer[offset:offset + size])))
+        offset += size
+    del buffer[:offset]
+    return packets
+
+class EdgeSender:
+    """
+    Edge side of the split mode: runs only Face Mesh and sends landmark packets.
+    
+    A frame's landmarks take a few hundred bytes instead of the frame itself. If the
+    central service is unreachable, packets are dropped and the connection is
+    retried every `reconnect_interval` seconds, so capture never stalls.
+    """
+    
+    def __init__(self, host: str, port: int, stream_id: int, face_processor=None,
+                 reconnect_interval: float = 5.0, send_timeout: float = 1.0):
+        if face_processor is None:
+            # Imported here so the central service does not need MediaPipe
+            from src.modules.face_mesh_processor import FaceMeshProcessor
+            face_processor = FaceMeshProcessor()
+        self.face_processor = face_processor
+        self.address = (host, port)
+        self.stream_id = stream_id
+        self.reconnect_interval = reconnect_interval
+        self.send_timeout = send_timeout
+        
+        self.sequence = 0
+        self.sent_packets = 0
+        self.dropped_packets = 0
+        self.bytes_sent = 0
+        self._sock: Optional[socket.socket] = None
+        self._next_connect = 0.0
+    
+    def connect(self) -> bool:
+        """Connect to the central service unless connected or waiting to retry."""
+        if self._sock is not None:
+            return True
+        if time.monotonic() < self._next_connect:
+            return False
+        try:
+            self._sock = socket.create_connection(self.address, timeout=self.send_timeout)
+            self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            logger.info(f"Stream {self.stream_id} connected to {self.address[0]}:{self.address[1]}")
+            return True
+        except OSError as e:
+            logger.warning(f"Cannot reach central service at {self.address[0]}:{self.address[1]}: {e}")
+            self._next_connect = time.monotonic() + self.reconnect_interval
+            return False
+    
+    def send(self, faces: Sequence[np.ndarray], frame_width: int, frame_height: int,
+             timestamp: Optional[float] = None) -> bool:
+        """Send one frame's gathered landmarks; returns False if the packet was dropped."""
+        self.sequence += 1
+        packet = encode_packet(LandmarkPacket(self.stream_id, self.sequence,
+                                              time.time() if timestamp is None else timestamp,
+                                              frame_width, frame_height,
+                                              np.asarray(faces, dtype=np.float64).reshape((-1,) + _FACE_SHAPE)))
+        if not self.connect():
+            self.dropped_packets += 1
+            return False
+        try:
+            self._sock.sendall(packet)
+        except OSError as e:
+            logger.warning(f"Stream {self.stream_id} lost the central service: {e}")
+            self._disconnect()
+            self.dropped_packets += 1
+            return False
+        self.sent_packets += 1
+        self.bytes_sent += len(packet)
+        return True
+    
+    def process_frame(self, frame, timestamp: Optional[float] = None) -> int:
+        """Run Face Mesh on a BGR frame and send its landmarks; returns the face count."""
+        # Mirrored like ConcentrationDetector.process_frame, so both modes score alike
+        frame = cv2.flip(frame, 1)
+        results = self.face_processor.process_frame(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        faces = [gather_landmarks(face_landmarks) for face_landmarks in results.multi_face_landmarks or []]
+        self.send(faces, frame.shape[1], frame.shape[0], timestamp)
+        return len(faces)
+    
+    def _disconnect(self):
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+        self._next_connect = time.monotonic() + self.reconnect_interval
+    
+    def close(self):
+        """Close the connection and Face Mesh."""
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+        self.face_processor.cleanup()
+
+class CentralScorer:
+    """
+    Scores landmark packets from many streams in vectorized batches.
+    
+    Features and rules are evaluated for a whole batch at once with the fused
+    feature kernel and RuleEngine.evaluate_batch (the batched EyeAnalyzer,
+    HeadPoseAnalyzer and ConcentrationAnalyzer chain); smoothing uses one
+    BatchResultSmoother slot per stream. The first face of each packet is scored.
+    """
+    
+    def __init__(self, config: DetectorConfig = DetectorConfig(), rules=DEFAULT_RULES):
+        self.config = config.validate()
+        self.params = config.rule_params()
+        self.rule_engine = RuleEngine(rules)
+        self.smoother = BatchResultSmoother(config.vote_window)
+        self._slots: Dict[int, int] = {}
+        self._free_slots: List[int] = []
+    
+    def _slot(self, stream_id: int) -> int:
+        slot = self._slots.get(stream_id)
+        if slot is None:
+            slot = self._free_slots.pop() if self._free_slots else len(self._slots)
+            self.smoother.ensure_capacity(slot + 1)
+            self._slots[stream_id] = slot
+        return slot
+    
+    def score(self, packets: Sequence[LandmarkPacket]) -> List[StreamResult]:
+        """Score a batch; results are in packet order."""
+        results: List[Optional[StreamResult]] = [None] * len(packets)
+        
+        # Smoothing is sequential per stream, so repeated streams go into later rounds
+        rounds: List[List[int]] = []
+        seen: Dict[int, int] = {}
+        for index, packet in enumerate(packets):
+            occurrence = seen.get(packet.stream_id, 0)
+            seen[packet.stream_id] = occurrence + 1
+            if occurrence == len(rounds):
+                rounds.append([])
+            rounds[occurrence].append(index)
+        
+        for indices in rounds:
+            self._score_round(packets, indices, results)
+        return results
+    
+    def _score_round(self, packets: Sequence[LandmarkPacket], indices: List[int],
+                     results: List[Optional[StreamResult]]):
+        with_face = []
+        for index in indices:
+            packet = packets[index]
+            if len(packet.faces):
+                with_face.append(index)
+            else:
+                results[index] = StreamResult(packet.stream_id, packet.sequence, packet.timestamp,
+                                              False, "No Face Detected", 0.0)
+        if not with_face:
+            return
+        
+        batch = [packets[index] for index in with_face]
+        points = np.stack([packet.faces[0] for packet in batch])
+        widths = np.array([[packet.frame_width] for packet in batch], dtype=np.float64)
+        heights = np.array([[packet.frame_height] for packet in batch], dtype=np.float64)
+        
+        features = extract_features(points, widths, heights)
+        concentrated, rule_index, confidence = self.rule_engine.evaluate_batch(features, self.params)
+        slots = np.array([self._slot(packet.stream_id) for packet in batch])
+        smoothed = self.smoother.smooth(slots, concentrated)
+        
+        reasons = self.rule_engine.reasons
+        for i, (index, packet) in enumerate(zip(with_face, batch)):
+            reason = reasons[rule_index[i]] if rule_index[i] >= 0 else NO_MATCH[1]
+            results[index] = StreamResult(packet.stream_id, packet.sequence, packet.timestamp,
+                                          bool(smoothed[i]), reason, float(confidence[i]))
+    
+    def forget(self, stream_id: int):
+        """Drop a stream's smoothing state, e.g. when its edge disconnects."""
+        slot = self._slots.pop(stream_id, None)
+        if slot is not None:
+            self.smoother.clear(np.array([slot]))
+            self._free_slots.append(slot)
+
+class _Connection:
+    """Receive buffer of one edge connection and the stream IDs it has sent."""
+    
+    def __init__(self):
+        self.buffer = bytearray()
+        self.streams: Set[int] = set()
+
+class CentralServer:
+    """
+    Receives packets from edge senders and scores them every `batch_interval` seconds.
+    
+    One thread multiplexes all connections with selectors, so thousands of streams
+    do not need thousands of threads. Each batch's results go to `callback(results)`,
+    and the newest result per stream is kept in `latest`.
+    
+    A stream ID belongs to the first live connection that sends it. A connection
+    sending a stream ID owned by another one is closed, so two edges configured
+    with the same ID cannot mix their frames in one smoothing slot. When a
+    connection closes, its streams' smoothing state is dropped.
+    """
+    
+    def __init__(self, scorer: CentralScorer, host: str = "0.0.0.0", port: int = 0,
+                 batch_interval: float = 0.02, callback: Optional[Callable[[List[StreamResult]], None]] = None):
+        self.scorer = scorer
+        self.batch_interval = batch_interval
+        self.callback = callback
+        self.latest: Dict[int, StreamResult] = {}
+        self.packets_received = 0
+        self.batches = 0
+        self.rejected_connections = 0
+        
+        self._owners: Dict[int, _Connection] = {}
+        # Streams of closed connections, forgotten once their last packets are scored
+        self._closed_streams: List[int] = []
+        self._listener = socket.create_server((host, port))
+        self._listener.setblocking(False)
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._listener, selectors.EVENT_READ)
+        self._lock = threading.Lock()
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def address(self):
+        """(host, port) the server listens on."""
+        return self._listener.getsockname()[:2]
+    
+    def start(self) -> "CentralServer":
+        self._running = True
+        self._thread = threading.Thread(target=self._serve, name="CentralServer", daemon=True)
+        self._thread.start()
+        logger.info(f"Central landmark service listening on port {self.address[1]}")
+        return self
+    
+    def _serve(self):
+        pending: List[LandmarkPacket] = []
+        next_batch = time.monotonic() + self.batch_interval
+        
+        while self._running:
+            for key, _ in self._selector.select(timeout=max(0.0, next_batch - time.monotonic())):
+                if key.data is None:
+                    self._accept()
+                else:
+                    pending.extend(self._receive(key))
+            
+            if time.monotonic() >= next_batch:
+                if pending:
+                    self._score(pending)
+                    pending = []
+                self._forget_closed()
+                next_batch = time.monotonic() + self.batch_interval
+        
+        if pending:
+            self._score(pending)
+        self._forget_closed()
+    
+    def _forget_closed(self):
+        for stream_id in self._closed_streams:
+            if stream_id not in self._owners:
+                self.scorer.forget(stream_id)
+        self._closed_streams = []
+    
+    def _accept(self):
+        try:
+            connection, _ = self._listener.accept()
+        except BlockingIOError:
+            return
+        connection.setblocking(False)
+        self._selector.register(connection, selectors.EVENT_READ, data=_Connection())
+    
+    def _receive(self, key) -> List[LandmarkPacket]:
+        connection, state = key.fileobj, key.data
+        try:
+            data = connection.recv(65536)
+        except (BlockingIOError, InterruptedError):
+            return []
+        except OSError:
+            data = b''
+        if not data:
+            self._close(connection, state)
+            return []
+        
+        state.buffer.extend(data)
+        try:
+            packets = split_packets(state.buffer)
+        except ValueError as e:
+            logger.warning("Closing connection sending invalid data: %s", e)
+            self.rejected_connections += 1
+            self._close(connection, state)
+            return []
+        
+        for packet in packets:
+            if packet.stream_id in state.streams:
+                continue
+            owner = self._owners.setdefault(packet.stream_id, state)
+            if owner is not state:
+                logger.warning("Closing connection sending stream %d, which another edge already sends",
+                               packet.stream_id)
+                self.rejected_connections += 1
+                self._close(connection, state)
+                return []
+            state.streams.add(packet.stream_id)
+        self.packets_received += len(packets)
+        return packets
+    
+    def _close(self, connection, state: _Connection):
+        self._selector.unregister(connection)
+        connection.close()
+        for stream_id in state.streams:
+            del self._owners[stream_id]
+        self._closed_streams.extend(state.streams)
+    
+    def _score(self, packets: List[LandmarkPacket]):
+        results = self.scorer.score(packets)
+        with self._lock:
+            for result in results:
+                self.latest[result.stream_id] = result
+        self.batches += 1
+        if self.callback is not None:
+            try:
+                self.callback(results)
+            except Exception as e:
+                logger.error("Result callback failed: %s", e)
+    
+    def get_latest(self, stream_id: int) -> Optional[StreamResult]:
+        with self._lock:
+            return self.latest.get(stream_id)
+    
+    def stop(self):
+        """Score what has arrived, then close every connection."""
+        self._running = False
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        for key in list(self._selector.get_map().values()):
+            key.fileobj.close()
+        self._selector.close()
+        logger.info(f"Central landmark service stopped: {self.packets_received} packets, {self.batches} batches")
@@ -0,0 +1,94 @@
+import cv2
+import logging
+import numpy as np
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
+from src.modules.camera_manager import CameraManager
+from src.modules.runtime_tuning import pin_thread
+
+logger = logging.getLogger(__name__)
+
+# libjpeg can decode at 1/2, 1/4 or 1/8 size by skipping DCT coefficients
+REDUCED_DECODE_FLAGS = {
+    1: cv2.IMREAD_COLOR,
+    2: cv2.IMREAD_REDUCED_COLOR_2,
+    4: cv2.IMREAD_REDUCED_COLOR_4,
+    8: cv2.IMREAD_REDUCED_COLOR_8,
+}
+
+class MjpegCameraManager(CameraManager):
+    """
+    Camera negotiated to MJPG whose JPEG frames are decoded on a thread pool.
+    
+    Raw YUYV limits most USB cameras to 640x480 at low frame rates; MJPG allows
+    higher resolutions and rates. With RGB conversion disabled, read() returns the
+    compressed bytes, and up to `decode_workers` frames are decoded in parallel
+    while the next one is captured. Frames are returned in capture order, at
+    1/`decode_scale` of the capture size. If the camera refuses MJPG, frames
+    decoded by the driver are passed through.
+    """
+    
+    def __init__(self, camera_index: int = 0, width: int = 1280, height: int = 720, fps: int = 30,
+                 decode_workers: int = 2, decode_scale: int = 1):
+        if decode_scale not in REDUCED_DECODE_FLAGS:
+            raise ValueError(f"decode_scale must be one of {sorted(REDUCED_DECODE_FLAGS)}")
+        super().__init__(camera_index, width, height, fps, fourcc="MJPG")
+        
+        self.decode_scale = decode_scale
+        self.decode_workers = max(1, decode_workers)
+        self._decode_flags = REDUCED_DECODE_FLAGS[decode_scale]
+        
+        # Without RGB conversion the backend hands out the JPEG bytes instead of decoding them
+        self.compressed = self.fourcc == "MJPG" and bool(self.cap.set(cv2.CAP_PROP_CONVERT_RGB, 0))
+        if not self.compressed:
+            logger.warning("MJPG passthrough unavailable, frames are decoded by the driver")
+        
+        # Workers start on first use, so they pick up cores set with set_cpu_affinity() before then
+        self._executor = ThreadPoolExecutor(self.decode_workers, thread_name_prefix="JpegDecode",
+                                            initializer=lambda: pin_thread(self.cpu_cores))
+        self._in_flight = deque()
+        self.decode_failures = 0
+    
+    def _decode(self, data: np.ndarray) -> Optional[np.ndarray]:
+        # A single row (or flat) uint8 buffer is a compressed frame
+        if data.ndim == 1 or data.shape[0] == 1:
+            frame = cv2.imdecode(data.reshape(-1), self._decode_flags)
+            if frame is None:
+                self.decode_failures += 1
+            return frame
+        if self.decode_scale != 1:
+            return cv2.resize(data, self._scaled(data.shape[1], data.shape[0]), interpolation=cv2.INTER_AREA)
+        return data
+    
+    def _scaled(self, width: int, height: int) -> Tuple[int, int]:
+        # Reduced JPEG decoding rounds up
+        return -(-width // self.decode_scale), -(-height // self.decode_scale)
+    
+    def read_frame(self) -> Tuple[bool, Optional[np.ndarray]]:
+        """Read the next frame in capture order, keeping the decode pool busy."""
+        while True:
+            while len(self._in_flight) < self.decode_workers:
+                ret, data = self.cap.read()
+                if not ret:
+                    break
+                self._in_flight.append(self._executor.submit(self._decode, data))
+            
+            if not self._in_flight:
+                return False, None
+            
+            # A corrupt JPEG only costs that frame
+            frame = self._in_flight.popleft().result()
+            if frame is not None:
+                return True, frame
+    
+    def get_dimensions(self) -> Tuple[int, int]:
+        """Get the dimensions of decoded frames."""
+        return self._scaled(self.frame_width, self.frame_height)
+    
+    def release(self):
+        """Wait for pending decodes and release the camera."""
+        self._executor.shutdown(wait=True)
+        self._in_flight.clear()
+        super().release()
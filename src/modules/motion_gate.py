@@ -0,0 +1,124 @@
+import cv2
+import logging
+import numpy as np
+from typing import Callable, Dict, List, Optional
+
+from src.modules.session_state import pack_array, unpack_array
+
+logger = logging.getLogger(__name__)
+
+class MotionGate:
+    """
+    Decides per frame whether Face Mesh needs to run.
+    
+    Each frame is shrunk to a small grayscale thumbnail and compared with the
+    thumbnail of the last inference. Without motion, the previous landmarks stay
+    valid, so inference is skipped until `still_interval` seconds have passed.
+    After `idle_after` seconds without a face the gate turns idle: inference then
+    runs only on motion or every `idle_interval` seconds, and subscribers are told
+    so they can lower the capture rate until a face is back.
+    """
+    
+    def __init__(self, width: int = 80, pixel_threshold: int = 12, motion_fraction: float = 0.002,
+                 still_interval: float = 0.5, idle_after: float = 10.0, idle_interval: float = 2.0):
+        self.width = width
+        self.pixel_threshold = pixel_threshold
+        self.motion_fraction = motion_fraction
+        self.still_interval = still_interval
+        self.idle_after = idle_after
+        self.idle_interval = idle_interval
+        
+        self.idle = False
+        self.inferred_frames = 0
+        self.skipped_frames = 0
+        self._callbacks: List[Callable[[bool], None]] = []
+        self._reference: Optional[np.ndarray] = None
+        self._last_inference = float('-inf')
+        self._last_face_time: Optional[float] = None
+    
+    def subscribe(self, callback: Callable[[bool], None]):
+        """Call `callback(idle)` whenever the gate enters or leaves the idle state."""
+        self._callbacks.append(callback)
+    
+    def _thumbnail(self, frame: np.ndarray) -> np.ndarray:
+        height, width = frame.shape[:2]
+        small = cv2.resize(frame, (self.width, max(1, round(height * self.width / width))),
+                           interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(small, cv2.COLOR_BGR2GRAY) if small.ndim == 3 else small
+    
+    def motion_score(self, thumbnail: np.ndarray) -> float:
+        """Fraction of thumbnail pixels that changed since the last inference."""
+        if self._reference is None or self._reference.shape != thumbnail.shape:
+            return 1.0
+        changed = cv2.absdiff(thumbnail, self._reference) > self.pixel_threshold
+        return np.count_nonzero(changed) / changed.size
+    
+    def should_infer(self, frame: np.ndarray, timestamp: float) -> bool:
+        """Return True if Face Mesh should run on this frame."""
+        thumbnail = self._thumbnail(frame)
+        interval = self.idle_interval if self.idle else self.still_interval
+        
+        if (self.motion_score(thumbnail) >= self.motion_fraction
+                or timestamp - self._last_inference >= interval):
+            self._reference = thumbnail
+            self._last_inference = timestamp
+            self.inferred_frames += 1
+            return True
+        
+        self.skipped_frames += 1
+        return False
+    
+    def report_faces(self, face_count: int, timestamp: float):
+        """Record an inference result; drives the idle state."""
+        if self._last_face_time is None:
+            self._last_face_time = timestamp
+        
+        if face_count > 0:
+            self._last_face_time = timestamp
+            self._set_idle(False)
+        elif timestamp - self._last_face_time >= self.idle_after:
+            self._set_idle(True)
+    
+    def _set_idle(self, idle: bool):
+        if idle == self.idle:
+            return
+        self.idle = idle
+        logger.info("No face detected, entering idle mode" if idle else "Face detected, leaving idle mode")
+        for callback in self._callbacks:
+            try:
+                callback(idle)
+            except Exception as e:
+                logger.error("Idle state callback failed: %s", e)
+    
+    def get_stats(self) -> Dict[str, float]:
+        """Inference and skip counters."""
+        total = self.inferred_frames + self.skipped_frames
+        return {
+            'inferred_frames': self.inferred_frames,
+            'skipped_frames': self.skipped_frames,
+            'skip_ratio': self.skipped_frames / total if total else 0.0,
+            'idle': self.idle
+        }
+    
+    def get_state(self) -> dict:
+        """JSON-serializable gating state, including the reference thumbnail."""
+        return {
+            'reference': None if self._reference is None else pack_array(self._reference),
+            'last_inference': None if self._last_inference == float('-inf') else self._last_inference,
+            'last_face_time': self._last_face_time,
+            'idle': self.idle
+        }
+    
+    def set_state(self, state: dict, time_offset: float = 0.0):
+        """Restore state from get_state(), shifting timestamps by `time_offset`."""
+        self._reference = None if state['reference'] is None else unpack_array(state['reference'])
+        last_inference = state['last_inference']
+        self._last_inference = float('-inf') if last_inference is None else last_inference + time_offset
+        last_face_time = state['last_face_time']
+        self._last_face_time = None if last_face_time is None else last_face_time + time_offset
+        self._set_idle(state['idle'])
+    
+    def reset(self):
+        """Forget the reference frame so the next frame is inferred."""
+        self._reference = None
+        self._last_inference = float('-inf')
@@ -0,0 +1,74 @@
+from collections import OrderedDict
+from typing import NamedTuple, Tuple
+
+import cv2
+import numpy as np
+
+class TextSprite(NamedTuple):
+    """Pre-rasterized text: a boolean coverage mask and its offset from the text origin."""
+    mask: np.ndarray
+    offset_x: int
+    offset_y: int
+    color: Tuple[int, int, int]
+
+class OverlayRenderer:
+    """
+    Draws text overlays from cached sprites.
+    
+    Each distinct (text, font, scale, color, thickness) is rasterized once with
+    cv2.putText into a mask; later draws only copy the colour into the covered
+    pixels of the frame, which gives the same pixels as drawing the text directly.
+    """
+    
+    def __init__(self, max_sprites: int = 128):
+        self.max_sprites = max_sprites
+        self._sprites: "OrderedDict[tuple, TextSprite]" = OrderedDict()
+    
+    def get_sprite(self, text: str, font_scale: float, color: Tuple[int, int, int], thickness: int = 1,
+                   font: int = cv2.FONT_HERSHEY_SIMPLEX) -> TextSprite:
+        """Return the cached sprite for this text, rasterizing it on a cache miss."""
+        key = (text, font, font_scale, color, thickness)
+        sprite = self._sprites.get(key)
+        if sprite is not None:
+            self._sprites.move_to_end(key)
+            return sprite
+        
+        (width, height), baseline = cv2.getTextSize(text, font, font_scale, thickness)
+        pad = thickness + 1
+        mask = np.zeros((height + baseline + 2 * pad, width + 2 * pad), dtype=np.uint8)
+        cv2.putText(mask, text, (pad, pad + height), font, font_scale, 255, thickness)
+        
+        sprite = TextSprite(mask > 0, -pad, -(pad + height), color)
+        self._sprites[key] = sprite
+        if len(self._sprites) > self.max_sprites:
+            self._sprites.popitem(last=False)
+        return sprite
+    
+    def draw_text(self, frame: np.ndarray, text: str, origin: Tuple[int, int], font_scale: float,
+                  color: Tuple[int, int, int], thickness: int = 1,
+                  font: int = cv2.FONT_HERSHEY_SIMPLEX):
+        """Draw text with its baseline starting at `origin`, like cv2.putText."""
+        self.blit(frame, self.get_sprite(text, font_scale, color, thickness, font), origin)
+    
+    @staticmethod
+    def blit(frame: np.ndarray, sprite: TextSprite, origin: Tuple[int, int]):
+        """Copy a sprite's colour into the frame, clipped to the frame bounds."""
+        x0 = origin[0] + sprite.offset_x
+        y0 = origin[1] + sprite.offset_y
+        mask = sprite.mask
+        
+        left, top = max(0, -x0), max(0, -y0)
+        right = min(mask.shape[1], frame.shape[1] - x0)
+        bottom = min(mask.shape[0], frame.shape[0] - y0)
+        if left >= right or top >= bottom:
+            return
+        
+        region = frame[y0 + top:y0 + bottom, x0 + left:x0 + right]
+        region[mask[top:bottom, left:right]] = sprite.color
+    
+    def clear(self):
+        """Drop all cached sprites."""
+        self._sprites.clear()
+    
+    def __len__(self):
+        return len(self._sprites)
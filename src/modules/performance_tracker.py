@@ -1,12 +1,23 @@
 import time
-from typing import Dict
+from collections import deque
+from typing import Dict, Optional
+
+import numpy as np
+
+from src.modules.resource_monitor import ResourceMonitor
 
 class PerformanceTracker:
     """Tracks performance metrics."""
     
-    def __init__(self):
+    def __init__(self, latency_window: int = 120):
         self.frame_count = 0
         self.start_time = time.time()
+        
+        # Rolling window of per-frame processing latencies (seconds)
+        self.latencies = deque(maxlen=latency_window)
+        
+        # Opt-in long-run memory/fd/thread monitoring
+        self.resource_monitor: Optional[ResourceMonitor] = None
     
     @property
     def total_frames(self):
@@ -17,6 +28,45 @@ class PerformanceTracker:
         """Increment frame counter."""
         self.frame_count += 1
     
+    def record_latency(self, latency: float):
+        """Record the processing latency of a single frame in seconds."""
+        self.latencies.append(latency)
+    
+    def reset_latency(self):
+        """Forget recorded latencies, e.g. after the pipeline configuration changed."""
+        self.latencies.clear()
+    
+    def get_latency_stats(self) -> Dict[str, float]:
+        """Get mean, p95 and max latency (seconds) over the rolling window."""
+        if not self.latencies:
+            return {'mean': 0.0, 'p95': 0.0, 'max': 0.0, 'samples': 0}
+        
+        values = np.fromiter(self.latencies, dtype=np.float64, count=len(self.latencies))
+        return {
+            'mean': float(values.mean()),
+            'p95': float(np.percentile(values, 95)),
+            'max': float(values.max()),
+            'samples': len(values)
+        }
+    
+    def enable_resource_monitoring(self, interval: float = 60.0, **kwargs) -> ResourceMonitor:
+        """Start sampling process resources every `interval` seconds."""
+        if self.resource_monitor is None:
+            self.resource_monitor = ResourceMonitor(interval=interval, **kwargs).start()
+        return self.resource_monitor
+    
+    def disable_resource_monitoring(self):
+        """Stop resource sampling."""
+        if self.resource_monitor is not None:
+            self.resource_monitor.stop()
+            self.resource_monitor = None
+    
+    def get_resource_report(self) -> str:
+        """Resource monitor report, or a note that monitoring is off."""
+        if self.resource_monitor is None:
+            return "Resource monitoring is disabled"
+        return self.resource_monitor.report()
+    
     def get_stats(self) -> Dict[str, float]:
         """Get performance statistics."""
         elapsed_time = time.time() - self.start_time
@@ -25,4 +75,4 @@ class PerformanceTracker:
             'fps': fps,
             'total_frames': self.frame_count,
             'runtime': elapsed_time
-        }
\ No newline at end of file
+        }
@@ -0,0 +1,137 @@
+import time
+import queue
+import logging
+import threading
+import logging.handlers
+from typing import Dict, List, Optional, Tuple
+
+class RateLimitFilter(logging.Filter):
+    """
+    Lets at most `burst` records per message key through every `interval` seconds.
+    
+    The key is the logger, level and call site, so repeats of one message share
+    a key whatever their arguments. Suppressed records are only counted; the next
+    record let through for the key reports how many were dropped. Hot-path calls
+    should pass lazy %-style arguments (logger.warning("Read failed: %s", e)) so
+    suppressed records are never formatted.
+    """
+    
+    def __init__(self, interval: float = 10.0, burst: int = 5):
+        super().__init__()
+        self.interval = interval
+        self.burst = burst
+        self.suppressed_total = 0
+        # key -> [window start, records passed in window, suppressed since last report]
+        self._windows: Dict[Tuple, List] = {}
+        self._lock = threading.Lock()
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        key = (record.name, record.levelno, record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None:
+                self._windows[key] = [now, 1, 0]
+                return True
+            if now - window[0] >= self.interval:
+                window[0], window[1] = now, 0
+            if window[1] >= self.burst:
+                window[2] += 1
+                self.suppressed_total += 1
+                return False
+            window[1] += 1
+            suppressed, window[2] = window[2], 0
+        
+        if suppressed:
+            record.msg = f"{record.getMessage()} ({suppressed} similar messages suppressed)"
+            record.args = None
+        return True
+    
+    def pending(self) -> Dict[Tuple, int]:
+        """Suppressed counts not yet reported, by key."""
+        with self._lock:
+            return {key: window[2] for key, window in self._windows.items() if window[2]}
+
+class _LazyQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves formatting to the listener thread and drops records when full."""
+    
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The stock prepare() formats the message on the calling thread
+        return record
+    
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+class _QueueListener(logging.handlers.QueueListener):
+    def enqueue_sentinel(self):
+        # Blocks if the queue is full, so stop() always ends the thread
+        self.queue.put(self._sentinel)
+
+class PipelineLogging:
+    """
+    Moves log output off the frame loop.
+    
+    While started, the root logger's handlers run on a listener thread fed by a
+    bounded queue. The calling thread only applies the rate limit and enqueues the
+    unformatted record, so an error storm costs a dict lookup per call. When the
+    queue is full, records are dropped and counted rather than blocking.
+    """
+    
+    def __init__(self, interval: float = 10.0, burst: int = 5, queue_size: int = 10000):
+        self.rate_limit = RateLimitFilter(interval, burst)
+        self.queue_handler = _LazyQueueHandler(queue.Queue(queue_size))
+        self.queue_handler.addFilter(self.rate_limit)
+        self._listener: Optional[_QueueListener] = None
+        self._logger: Optional[logging.Logger] = None
+        self._handlers: List[logging.Handler] = []
+    
+    @property
+    def running(self) -> bool:
+        return self._listener is not None
+    
+    def start(self, logger: Optional[logging.Logger] = None) -> "PipelineLogging":
+        """Route `logger` (the root logger by default) through the queue."""
+        if self.running:
+            return self
+        self._logger = logger or logging.getLogger()
+        self._handlers = list(self._logger.handlers)
+        for handler in self._handlers:
+            self._logger.removeHandler(handler)
+        self._logger.addHandler(self.queue_handler)
+        
+        self._listener = _QueueListener(self.queue_handler.queue, *self._handlers, respect_handler_level=True)
+        self._listener.start()
+        return self
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Suppressed, dropped and queued record counts."""
+        return {
+            'suppressed': self.rate_limit.suppressed_total,
+            'dropped': self.queue_handler.dropped,
+            'queued': self.queue_handler.queue.qsize()
+        }
+    
+    def stop(self):
+        """Write out queued records, report unreported suppressions and restore the handlers."""
+        if not self.running:
+            return
+        self._listener.stop()
+        self._listener = None
+        self._logger.removeHandler(self.queue_handler)
+        for handler in self._handlers:
+            self._logger.addHandler(handler)
+        
+        pending = self.rate_limit.pending()
+        if pending:
+            total = sum(pending.values())
+            self._logger.warning(f"{total} log messages suppressed since their last report "
+                                 f"({len(pending)} distinct messages)")
+        if self.queue_handler.dropped:
+            self._logger.warning(f"{self.queue_handler.dropped} log messages dropped: log queue full")
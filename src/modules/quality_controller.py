@@ -0,0 +1,122 @@
+import logging
+from typing import NamedTuple, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+class QualityLevel(NamedTuple):
+    """One rung of the quality ladder."""
+    width: int
+    height: int
+    inference_scale: float
+    inference_stride: int
+    refine_landmarks: bool
+
+
+# Ordered from best quality to cheapest. The last rung drops iris refinement,
+# which disables gaze ratios, so it is only used when explicitly allowed.
+DEFAULT_QUALITY_LEVELS = (
+    QualityLevel(640, 480, 1.0, 1, True),
+    QualityLevel(640, 480, 0.75, 1, True),
+    QualityLevel(640, 480, 0.5, 1, True),
+    QualityLevel(320, 240, 1.0, 2, True),
+    QualityLevel(320, 240, 1.0, 3, True),
+    QualityLevel(320, 240, 1.0, 3, False),
+)
+
+class QualityController:
+    """Adjusts capture and inference quality to hold a target FPS or latency SLO."""
+    
+    def __init__(self, detector, camera=None,
+                 target_fps: Optional[float] = 30,
+                 latency_slo: Optional[float] = None,
+                 levels: Sequence[QualityLevel] = DEFAULT_QUALITY_LEVELS,
+                 degrade_margin: float = 1.0,
+                 upgrade_margin: float = 0.6,
+                 degrade_after: int = 15,
+                 upgrade_after: int = 90,
+                 cooldown_frames: int = 30,
+                 allow_unrefined: bool = False):
+        if latency_slo is None and not target_fps:
+            raise ValueError("Either target_fps or latency_slo is required")
+        
+        self.detector = detector
+        self.camera = camera
+        
+        # A latency SLO is checked against the p95, an FPS target against the mean
+        self.budget = latency_slo if latency_slo is not None else 1.0 / target_fps
+        self.metric = 'p95' if latency_slo is not None else 'mean'
+        
+        self.levels = [level for level in levels if allow_unrefined or level.refine_landmarks]
+        if not self.levels:
+            raise ValueError("No usable quality levels")
+        
+        # Hysteresis: separate thresholds and persistence counts for each direction
+        self.degrade_margin = degrade_margin
+        self.upgrade_margin = upgrade_margin
+        self.degrade_after = degrade_after
+        self.upgrade_after = upgrade_after
+        self.cooldown_frames = cooldown_frames
+        
+        self.level_index = 0
+        self.over_budget_frames = 0
+        self.under_budget_frames = 0
+        self.cooldown = 0
+        
+        self._apply(self.levels[0], reason="initial")
+    
+    @property
+    def current_level(self) -> QualityLevel:
+        return self.levels[self.level_index]
+    
+    def update(self) -> QualityLevel:
+        """Inspect recent latency and step the quality level if needed. Call once per frame."""
+        tracker = self.detector.performance_tracker
+        stats = tracker.get_latency_stats()
+        
+        if self.cooldown > 0:
+            self.cooldown -= 1
+            return self.current_level
+        
+        if stats['samples'] < min(self.degrade_after, tracker.latencies.maxlen):
+            return self.current_level
+        
+        latency = stats[self.metric]
+        if latency > self.budget * self.degrade_margin:
+            self.over_budget_frames += 1
+            self.under_budget_frames = 0
+        elif latency < self.budget * self.upgrade_margin:
+            self.under_budget_frames += 1
+            self.over_budget_frames = 0
+        else:
+            self.over_budget_frames = 0
+            self.under_budget_frames = 0
+        
+        if self.over_budget_frames >= self.degrade_after and self.level_index < len(self.levels) - 1:
+            self._step(+1, f"{self.metric} latency {latency * 1000:.1f}ms over budget {self.budget * 1000:.1f}ms")
+        elif self.under_budget_frames >= self.upgrade_after and self.level_index > 0:
+            self._step(-1, f"{self.metric} latency {latency * 1000:.1f}ms under budget {self.budget * 1000:.1f}ms")
+        
+        return self.current_level
+    
+    def _step(self, direction: int, reason: str):
+        """Move one level down (+1) or up (-1) the ladder."""
+        self.level_index += direction
+        self.over_budget_frames = 0
+        self.under_budget_frames = 0
+        self.cooldown = self.cooldown_frames
+        
+        self._apply(self.current_level, reason)
+        
+        # Measurements taken at the previous level no longer apply
+        self.detector.performance_tracker.reset_latency()
+    
+    def _apply(self, level: QualityLevel, reason: str):
+        """Push a quality level into the camera and detector."""
+        logger.info(f"Quality level {self.level_index} ({reason}): "
+                    f"{level.width}x{level.height}, scale={level.inference_scale}, "
+                    f"stride={level.inference_stride}, refine={level.refine_landmarks}")
+        
+        if self.camera is not None and self.camera.get_dimensions() != (level.width, level.height):
+            self.camera.set_resolution(level.width, level.height)
+        
+        self.detector.set_quality(level.inference_scale, level.inference_stride, level.refine_landmarks)
@@ -0,0 +1,194 @@
+import os
+import sys
+import signal
+import logging
+import threading
+import time
+import tracemalloc
+from collections import deque
+from typing import List, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Metrics checked for monotonic growth
+GROWTH_METRICS = ('rss_bytes', 'open_fds', 'threads', 'traced_bytes')
+
+class ResourceSample(NamedTuple):
+    """Process resource usage at one point in time; -1 where a metric is unavailable."""
+    timestamp: float
+    rss_bytes: int
+    open_fds: int
+    threads: int
+    traced_bytes: int
+
+def _read_rss() -> int:
+    """Resident set size in bytes."""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        try:
+            import resource
+            # Peak rather than current RSS, but still shows growth; bytes on macOS, KiB elsewhere
+            max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            return max_rss if sys.platform == 'darwin' else max_rss * 1024
+        except ImportError:
+            return -1
+
+def _count_open_fds() -> int:
+    for fd_dir in ('/proc/self/fd', '/dev/fd'):
+        try:
+            return len(os.listdir(fd_dir))
+        except OSError:
+            continue
+    return -1
+
+def _count_threads() -> int:
+    """Native thread count (includes MediaPipe and OpenCV workers), else Python threads."""
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('Threads:'):
+                    return int(line.split()[1])
+    except (OSError, ValueError):
+        pass
+    return threading.active_count()
+
+class ResourceMonitor:
+    """
+    Samples process memory, file descriptors and threads on a background thread.
+    
+    Samples are kept in a fixed-size ring. A metric that has not decreased over the
+    last `growth_window` samples while rising by more than its tolerance is flagged
+    as growing. With tracemalloc enabled, the top allocation sites are kept too;
+    it traces every allocation and slows the frame loop noticeably, so it is opt-in.
+    """
+    
+    def __init__(self, interval: float = 60.0, history_size: int = 1440, growth_window: int = 10,
+                 use_tracemalloc: bool = False, top_allocators: int = 10,
+                 rss_tolerance_bytes: int = 1 << 20):
+        self.interval = interval
+        self.samples = deque(maxlen=history_size)
+        self.growth_window = growth_window
+        self.use_tracemalloc = use_tracemalloc
+        self.top_allocators = top_allocators
+        self.tolerance = {'rss_bytes': rss_tolerance_bytes, 'open_fds': 0, 'threads': 0,
+                          'traced_bytes': rss_tolerance_bytes}
+        
+        # Latest tracemalloc top allocation sites as (location, size bytes, count)
+        self.top_allocations: List[Tuple[str, int, int]] = []
+        self.flagged = set()
+        
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started_tracemalloc = False
+    
+    def start(self) -> "ResourceMonitor":
+        """Start sampling in the background."""
+        if self._thread is not None:
+            return self
+        if self.use_tracemalloc and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="ResourceMonitor", daemon=True)
+        self._thread.start()
+        logger.info(f"Resource monitoring started (every {self.interval:.0f}s)")
+        return self
+    
+    def _run(self):
+        while True:
+            self.sample()
+            if self._stop_event.wait(self.interval):
+                return
+    
+    def stop(self):
+        """Stop sampling; samples collected so far are kept."""
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+    
+    def sample(self) -> ResourceSample:
+        """Take one sample now and check for growth."""
+        traced = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else -1
+        sample = ResourceSample(time.time(), _read_rss(), _count_open_fds(), _count_threads(), traced)
+        
+        top = self._top_allocations() if traced >= 0 else []
+        with self._lock:
+            self.samples.append(sample)
+            if top:
+                self.top_allocations = top
+        
+        for metric in self.growing():
+            if metric not in self.flagged:
+                logger.warning(f"Resource growth: {metric} rose monotonically over the last "
+                               f"{self.growth_window} samples")
+                self.flagged.add(metric)
+        return sample
+    
+    def _top_allocations(self) -> List[Tuple[str, int, int]]:
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ])
+        return [(str(stat.traceback), stat.size, stat.count)
+                for stat in snapshot.statistics('lineno')[:self.top_allocators]]
+    
+    def growing(self) -> List[str]:
+        """Metrics that never decreased over the growth window and rose beyond their tolerance."""
+        with self._lock:
+            recent = list(self.samples)[-self.growth_window:]
+        if len(recent) < self.growth_window:
+            return []
+        
+        growing = []
+        for metric in GROWTH_METRICS:
+            values = [getattr(sample, metric) for sample in recent]
+            if values[0] < 0:
+                continue
+            if all(b >= a for a, b in zip(values, values[1:])) and values[-1] - values[0] > self.tolerance[metric]:
+                growing.append(metric)
+        return growing
+    
+    def report(self) -> str:
+        """Human-readable summary of the latest sample, growth over the ring and top allocators."""
+        with self._lock:
+            samples = list(self.samples)
+            top = list(self.top_allocations)
+        if not samples:
+            return "Resource monitor: no samples yet"
+        
+        first, last = samples[0], samples[-1]
+        hours = (last.timestamp - first.timestamp) / 3600
+        lines = [
+            f"Resource monitor: {len(samples)} samples over {hours:.2f}h",
+            f"  RSS: {last.rss_bytes / 2**20:.1f} MiB ({(last.rss_bytes - first.rss_bytes) / 2**20:+.1f} MiB)",
+            f"  Open fds: {last.open_fds} ({last.open_fds - first.open_fds:+d})",
+            f"  Threads: {last.threads} ({last.threads - first.threads:+d})",
+        ]
+        if last.traced_bytes >= 0:
+            lines.append(f"  Python heap (traced): {last.traced_bytes / 2**20:.1f} MiB")
+        growing = self.growing()
+        lines.append(f"  Growing: {', '.join(growing) if growing else 'none'}")
+        if top:
+            lines.append("  Top allocators:")
+            lines.extend(f"    {size / 1024:.1f} KiB in {count} blocks at {location}"
+                         for location, size, count in top)
+        return "\n".join(lines)
+    
+    def install_signal_handler(self, signum: Optional[int] = None) -> bool:
+        """Log a report whenever the process receives `signum` (SIGUSR1 by default)."""
+        if signum is None:
+            signum = getattr(signal, 'SIGUSR1', None)
+        if signum is None or threading.current_thread() is not threading.main_thread():
+            logger.warning("Resource report signal handler not available")
+            return False
+        signal.signal(signum, lambda *_: logger.info(self.report()))
+        return True
@@ -1,9 +1,14 @@
+import numpy as np
+
 class ResultSmoother:
     """Handles temporal smoothing of detection results."""
     
-    def __init__(self, history_size: int = 30):
+    def __init__(self, history_size: int = 30, vote_window: int = 5):
         self.concentration_history = []
         self.history_size = history_size
+        
+        # Majority vote over the most recent results
+        self.vote_window = vote_window
     
     @property
     def history(self):
@@ -19,12 +24,69 @@ class ResultSmoother:
             self.concentration_history.pop(0)
         
         # Calculate smoothed result
-        if len(self.concentration_history) >= 5:
-            recent_concentrated = sum(self.concentration_history[-5:])
-            return recent_concentrated >= 3  # Majority vote
+        if len(self.concentration_history) >= self.vote_window:
+            recent_concentrated = sum(self.concentration_history[-self.vote_window:])
+            return recent_concentrated > self.vote_window // 2  # Majority vote
         
         return current_result
     
+    def resize(self, history_size: int, vote_window: int):
+        """Change the history length and vote window, keeping the most recent results."""
+        self.history_size = history_size
+        self.vote_window = vote_window
+        del self.concentration_history[:-history_size]
+    
     def clear_history(self):
         """Clear the smoothing history."""
-        self.concentration_history.clear()
\ No newline at end of file
+        self.concentration_history.clear()
+    
+    def get_state(self) -> dict:
+        """JSON-serializable smoothing state."""
+        return {'history': list(self.concentration_history)}
+    
+    def set_state(self, state: dict):
+        """Restore state from get_state()."""
+        self.concentration_history = [bool(result) for result in state['history']][-self.history_size:]
+
+class BatchResultSmoother:
+    """
+    ResultSmoother's majority vote for many streams at once.
+    
+    Each stream owns a slot holding a ring of its last `vote_window` results, so
+    one call smooths a whole batch of streams with array operations.
+    """
+    
+    def __init__(self, vote_window: int = 5, capacity: int = 64):
+        self.vote_window = vote_window
+        self.votes = np.zeros((capacity, vote_window), dtype=bool)
+        self.counts = np.zeros(capacity, dtype=np.int64)
+        self.positions = np.zeros(capacity, dtype=np.int64)
+    
+    @property
+    def capacity(self) -> int:
+        return len(self.counts)
+    
+    def ensure_capacity(self, slots: int):
+        """Grow the slot arrays (doubling) to hold at least `slots` streams."""
+        if slots <= self.capacity:
+            return
+        capacity = max(slots, 2 * self.capacity)
+        extra = capacity - self.capacity
+        self.votes = np.concatenate([self.votes, np.zeros((extra, self.vote_window), dtype=bool)])
+        self.counts = np.concatenate([self.counts, np.zeros(extra, dtype=np.int64)])
+        self.positions = np.concatenate([self.positions, np.zeros(extra, dtype=np.int64)])
+    
+    def smooth(self, slots: np.ndarray, results: np.ndarray) -> np.ndarray:
+        """Add one result per slot (slots must be unique) and return the smoothed results."""
+        self.votes[slots, self.positions[slots]] = results
+        self.positions[slots] = (self.positions[slots] + 1) % self.vote_window
+        self.counts[slots] = np.minimum(self.counts[slots] + 1, self.vote_window)
+        
+        majority = self.votes[slots].sum(axis=1) > self.vote_window // 2
+        return np.where(self.counts[slots] >= self.vote_window, majority, results)
+    
+    def clear(self, slots: np.ndarray):
+        """Forget the history of the given slots."""
+        self.votes[slots] = False
+        self.counts[slots] = 0
+        self.positions[slots] = 0
\ No newline at end of file
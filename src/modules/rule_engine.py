@@ -0,0 +1,183 @@
+import math
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.modules.landmark_features import FaceFeatures
+
+class Rule(NamedTuple):
+    """
+    One ordered concentration rule.
+    
+    `predicate` and `confidence` are called as fn(features, params, ops) and must
+    only use operators and `ops` functions, so the same rule runs on scalars
+    (live frames) and on NumPy columns (batches). Combine conditions with & and |.
+    """
+    reason: str
+    concentrated: bool
+    predicate: Callable
+    confidence: Optional[Callable] = None
+
+class _ScalarOps:
+    maximum = staticmethod(max)
+    minimum = staticmethod(min)
+    isnan = staticmethod(math.isnan)
+
+class _VectorOps:
+    maximum = staticmethod(np.maximum)
+    minimum = staticmethod(np.minimum)
+    isnan = staticmethod(np.isnan)
+
+class _Columns:
+    """Attribute access to the columns of a (N, NUM_FEATURES) feature matrix."""
+    
+    def __init__(self, matrix: np.ndarray):
+        self._matrix = matrix
+    
+    def __getattr__(self, name):
+        column = FaceFeatures._fields.index(name)
+        if column >= self._matrix.shape[1]:
+            # Narrower matrices omit trailing features, which take their FaceFeatures default
+            return np.full(self._matrix.shape[0], FaceFeatures._field_defaults[name])
+        return self._matrix[:, column]
+
+def _turned_left(f, p, ops):
+    return (abs(f.iris_z_diff) > p['head_pose_threshold']) & (f.iris_z_diff > 0)
+
+def _turned_right(f, p, ops):
+    return (abs(f.iris_z_diff) > p['head_pose_threshold']) & (f.iris_z_diff <= 0)
+
+def _yawed_left(f, p, ops):
+    return f.yaw > p['yaw_threshold']
+
+def _yawed_right(f, p, ops):
+    return f.yaw < -p['yaw_threshold']
+
+def _mean_gaze_y(f):
+    return (f.left_gaze_y + f.right_gaze_y) / 2
+
+def _looking_down(f, p, ops):
+    # NaN ratios (no eyelid opening) compare False, so they fall through to the other rules
+    return _mean_gaze_y(f) > p['vertical_gaze_threshold']
+
+def _alignment_confidence(f, p, ops):
+    return ops.maximum(0, 1 - (abs(f.left_gaze_ratio - f.right_gaze_ratio) / p['iris_alignment_threshold']))
+
+def _gaze_rules(turned_left: Callable, turned_right: Callable) -> Tuple[Rule, ...]:
+    """Head-turn and gaze rules shared by both head pose variants."""
+    return (
+        Rule("Looking Down", False,
+             _looking_down,
+             lambda f, p, ops: ops.maximum(0, 1 - (_mean_gaze_y(f) - p['vertical_gaze_threshold']) * 2)),
+        Rule("Looking Left", False,
+             lambda f, p, ops: turned_left(f, p, ops) & (f.left_gaze_ratio > p['gaze_ratio_threshold']),
+             lambda f, p, ops: ops.maximum(0, 1 - (f.left_gaze_ratio - 0.5) * 2)),
+        Rule("Head: Left Turn", True,
+             turned_left,
+             lambda f, p, ops: ops.minimum(1, (p['gaze_ratio_threshold'] - f.left_gaze_ratio) * 2)),
+        Rule("Looking Right", False,
+             lambda f, p, ops: turned_right(f, p, ops) & (f.right_gaze_ratio > p['gaze_ratio_threshold']),
+             lambda f, p, ops: ops.maximum(0, 1 - (f.right_gaze_ratio - 0.5) * 2)),
+        Rule("Head: Right Turn", True,
+             turned_right,
+             lambda f, p, ops: ops.minimum(1, (p['gaze_ratio_threshold'] - f.right_gaze_ratio) * 2)),
+        Rule("Eyes on screen", True,
+             lambda f, p, ops: abs(f.left_gaze_ratio - f.right_gaze_ratio) < p['iris_alignment_threshold'],
+             _alignment_confidence),
+        Rule("Eyes on left", False,
+             lambda f, p, ops: f.left_gaze_ratio > f.right_gaze_ratio,
+             _alignment_confidence),
+        Rule("Eyes on right", False,
+             lambda f, p, ops: True,
+             _alignment_confidence),
+    )
+
+_EYES_CLOSED = Rule("Eyes Closed", False,
+                    lambda f, p, ops: (f.left_ear < p['ear_threshold']) & (f.right_ear < p['ear_threshold']))
+_GAZE_MISSING = Rule("Detection Error", False,
+                     lambda f, p, ops: f.gaze_missing > 0)
+_INVALID_EYES = Rule("Invalid Eye Measurements", False,
+                     lambda f, p, ops: ops.isnan(f.left_gaze_ratio) | ops.isnan(f.right_gaze_ratio))
+
+# Reproduces the EyeAnalyzer -> HeadPoseAnalyzer -> ConcentrationAnalyzer decision chain,
+# including the vertical "Looking Down" check
+DEFAULT_RULES = (
+    _EYES_CLOSED,
+    Rule("Detection Error", False,
+         lambda f, p, ops: ops.isnan(f.tilt)),
+    Rule("Face Tilted", False,
+         lambda f, p, ops: f.tilt > p['face_tilt_threshold'],
+         lambda f, p, ops: ops.maximum(0, 1 - (f.tilt / p['face_tilt_threshold']))),
+    _GAZE_MISSING,
+    _INVALID_EYES,
+) + _gaze_rules(_turned_left, _turned_right)
+
+# Same chain with scale-independent tilt (roll) and head turn (yaw) from HeadPoseEstimator
+HEAD_POSE_ANGLE_RULES = (
+    _EYES_CLOSED,
+    Rule("Detection Error", False,
+         lambda f, p, ops: ops.isnan(f.roll)),
+    Rule("Face Tilted", False,
+         lambda f, p, ops: abs(f.roll) > p['roll_threshold'],
+         lambda f, p, ops: ops.maximum(0, 1 - (abs(f.roll) / p['roll_threshold']))),
+    _GAZE_MISSING,
+    _INVALID_EYES,
+) + _gaze_rules(_yawed_left, _yawed_right)
+
+# Result when no rule matches
+NO_MATCH = (False, "Detection Error", 0.0)
+
+class RuleEngine:
+    """Evaluates ordered concentration rules; the first matching rule decides."""
+    
+    def __init__(self, rules: Sequence[Rule] = DEFAULT_RULES):
+        self.rules: List[Rule] = list(rules)
+    
+    @property
+    def reasons(self) -> List[str]:
+        """Reason string for each rule index returned by evaluate_batch."""
+        return [rule.reason for rule in self.rules]
+    
+    def add_rule(self, rule: Rule, before: Optional[str] = None):
+        """Add a rule at the end, or ahead of the first rule with the given reason."""
+        if before is None:
+            self.rules.append(rule)
+            return
+        index = next(i for i, existing in enumerate(self.rules) if existing.reason == before)
+        self.rules.insert(index, rule)
+    
+    def evaluate(self, features: FaceFeatures, params: Dict[str, float]) -> Tuple[bool, str, float]:
+        """Scalar path for a single face: (is_concentrated, reason, confidence)."""
+        for rule in self.rules:
+            if rule.predicate(features, params, _ScalarOps):
+                confidence = rule.confidence(features, params, _ScalarOps) if rule.confidence else 0.0
+                return rule.concentrated, rule.reason, confidence
+        return NO_MATCH
+    
+    def evaluate_batch(self, features: np.ndarray,
+                       params: Dict[str, float]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Vectorized path for a (N, NUM_FEATURES) feature matrix.
+        
+        Returns (concentrated, rule_index, confidence) arrays; rule_index is -1
+        where no rule matched and indexes `reasons` otherwise.
+        """
+        columns = _Columns(features)
+        count = features.shape[0]
+        
+        with np.errstate(invalid='ignore', divide='ignore'):
+            matches = np.stack([np.broadcast_to(rule.predicate(columns, params, _VectorOps), (count,))
+                                for rule in self.rules])
+            confidences = np.stack([
+                np.broadcast_to(rule.confidence(columns, params, _VectorOps) if rule.confidence else 0.0,
+                                (count,))
+                for rule in self.rules]).astype(np.float64)
+        
+        matched = matches.any(axis=0)
+        rule_index = np.where(matched, matches.argmax(axis=0), -1)
+        
+        rows = np.arange(count)
+        flags = np.array([rule.concentrated for rule in self.rules])
+        concentrated = np.where(matched, flags[rule_index], NO_MATCH[0])
+        confidence = np.where(matched, confidences[rule_index, rows], NO_MATCH[2])
+        return concentrated, rule_index, confidence
@@ -0,0 +1,209 @@
+import os
+import time
+import queue
+import logging
+import threading
+import functools
+import itertools
+import multiprocessing
+import numpy as np
+from typing import Callable, List, NamedTuple, Optional, Sequence, Tuple
+
+import cv2
+
+logger = logging.getLogger(__name__)
+
+class CoreLayout(NamedTuple):
+    """CPU share of one detector instance."""
+    cores: Tuple[int, ...]   # empty: not pinned
+    opencv_threads: int      # negative: OpenCV default
+
+class LayoutResult(NamedTuple):
+    """Benchmark outcome of running `instances` detectors side by side."""
+    instances: int
+    pinned: bool
+    opencv_threads: int
+    fps_per_instance: float
+    total_fps: float
+    p95_latency: float
+
+def available_cores() -> List[int]:
+    """Cores this process may run on."""
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+def plan_layouts(instances: int, cores: Optional[Sequence[int]] = None, reserve: int = 0,
+                 opencv_threads: Optional[int] = None) -> List[CoreLayout]:
+    """
+    Split the cores into disjoint, contiguous shares for `instances` detectors.
+    
+    `reserve` cores are left out (e.g. for capture or the OS). With more instances
+    than cores, instances share cores round-robin. OpenCV gets one thread per core
+    of the share unless `opencv_threads` is given.
+    """
+    if instances < 1:
+        raise ValueError("instances must be at least 1")
+    cores = list(cores if cores is not None else available_cores())[reserve:]
+    if not cores:
+        raise ValueError("No cores left after the reserve")
+    
+    layouts = []
+    for index in range(instances):
+        if instances <= len(cores):
+            # Spread the remainder over the first shares
+            start = index * len(cores) // instances
+            stop = (index + 1) * len(cores) // instances
+            share = tuple(cores[start:stop])
+        else:
+            share = (cores[index % len(cores)],)
+        layouts.append(CoreLayout(share, opencv_threads if opencv_threads is not None else len(share)))
+    return layouts
+
+def set_opencv_threads(threads: int) -> int:
+    """
+    Set OpenCV's internal thread pool size; returns the previous size.
+    
+    0 runs OpenCV sequentially and a negative value restores the default.
+    """
+    previous = cv2.getNumThreads()
+    cv2.setNumThreads(threads)
+    return previous
+
+def pin_thread(cores: Sequence[int]) -> bool:
+    """
+    Pin the calling thread to `cores`; returns False where affinity is unsupported.
+    
+    Threads started afterwards from this thread inherit the mask, which is how
+    MediaPipe's and OpenCV's worker threads end up on the same cores.
+    """
+    if not cores or not hasattr(os, 'sched_setaffinity'):
+        return False
+    try:
+        os.sched_setaffinity(threading.get_native_id(), cores)
+    except OSError as e:
+        logger.warning(f"Cannot pin {threading.current_thread().name} to cores {list(cores)}: {e}")
+        return False
+    return True
+
+def apply_layout(layout: CoreLayout) -> bool:
+    """Apply a layout to the calling thread and OpenCV; returns True if the thread was pinned."""
+    set_opencv_threads(layout.opencv_threads)
+    return pin_thread(layout.cores)
+
+def read_frames(source, count: int = 30) -> List[np.ndarray]:
+    """First `count` frames of a camera index, video file or image directory."""
+    from src.modules.frame_source import open_source
+    
+    frame_source = open_source(source)
+    frames = []
+    try:
+        while len(frames) < count:
+            ret, frame = frame_source.read_frame()
+            if not ret:
+                break
+            frames.append(frame)
+    finally:
+        frame_source.release()
+    if not frames:
+        raise RuntimeError(f"No frames read from {source}")
+    return frames
+
+def detector_workload(frames: Sequence[np.ndarray]) -> Callable[[], None]:
+    """
+    Benchmark step: one ConcentrationDetector frame, cycling through `frames`.
+    
+    The frames must show a face. Without one the detector skips everything after
+    face detection and the benchmark would measure the idle path, so a RuntimeError
+    is raised if no face is found while warming up on them.
+    """
+    from src.concentration_detector import ConcentrationDetector
+    
+    detector = ConcentrationDetector()
+    statuses = [detector.process_frame(frame)[1] for frame in frames]
+    if all(status == "No Face Detected" for status in statuses):
+        raise RuntimeError(f"No face detected in {len(frames)} benchmark frames")
+    
+    cycle = itertools.cycle(frames)
+    return lambda: detector.process_frame(next(cycle))
+
+def source_workload(source, count: int = 30) -> Callable[[], Callable[[], None]]:
+    """Workload factory running the detector on the first `count` frames of `source`."""
+    return functools.partial(detector_workload, read_frames(source, count))
+
+def _run_instance(layout: CoreLayout, duration: float, workload: Callable, start_barrier, results):
+    apply_layout(layout)
+    try:
+        step = workload()
+        step()  # warm-up, excluded from the measurement
+    except Exception as e:
+        # Release the other instances; the parent reports the error
+        start_barrier.abort()
+        results.put(e)
+        return
+    
+    try:
+        start_barrier.wait()
+    except threading.BrokenBarrierError:
+        results.put([])
+        return
+    latencies = []
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        step()
+        latencies.append(time.perf_counter() - started)
+    results.put(latencies)
+
+def benchmark_layout(layouts: Sequence[CoreLayout], workload: Callable[[], Callable[[], None]],
+                     duration: float = 5.0) -> LayoutResult:
+    """
+    Run one process per layout concurrently and measure throughput and tail latency.
+    
+    `workload` is called in each process and returns the step to time.
+    """
+    start_barrier = multiprocessing.Barrier(len(layouts))
+    results = multiprocessing.Queue()
+    processes = [multiprocessing.Process(target=_run_instance,
+                                         args=(layout, duration, workload, start_barrier, results))
+                 for layout in layouts]
+    for process in processes:
+        process.start()
+    try:
+        latencies = [results.get(timeout=duration + 120) for _ in processes]
+    except queue.Empty:
+        for process in processes:
+            process.terminate()
+        raise RuntimeError("Benchmark instance failed to report")
+    finally:
+        for process in processes:
+            process.join()
+    errors = [instance for instance in latencies if isinstance(instance, Exception)]
+    if errors:
+        raise RuntimeError(f"Benchmark instance failed: {errors[0]}")
+    
+    frames = sum(len(instance) for instance in latencies)
+    all_latencies = np.concatenate([np.asarray(instance) for instance in latencies if instance] or [[0.0]])
+    return LayoutResult(len(layouts), bool(layouts[0].cores), layouts[0].opencv_threads,
+                        frames / duration / len(layouts), frames / duration,
+                        float(np.percentile(all_latencies, 95)))
+
+def benchmark_layouts(instances: int, workload: Callable[[], Callable[[], None]],
+                      duration: float = 5.0) -> List[LayoutResult]:
+    """
+    Compare unpinned and pinned layouts for `instances` detectors on this machine.
+    
+    Results are sorted best first: lowest p95 latency, then highest total FPS.
+    """
+    cores = available_cores()
+    candidates = [[CoreLayout((), -1)] * instances]
+    for threads in sorted({1, max(1, len(cores) // instances)}):
+        candidates.append([CoreLayout((), threads)] * instances)
+        candidates.append(plan_layouts(instances, cores, opencv_threads=threads))
+    
+    results = []
+    for layouts in candidates:
+        result = benchmark_layout(layouts, workload, duration)
+        logger.info(f"Layout {result}")
+        results.append(result)
+    return sorted(results, key=lambda result: (result.p95_latency, -result.total_fps))
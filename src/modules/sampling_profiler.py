@@ -0,0 +1,107 @@
+import os
+import sys
+import time
+import logging
+import threading
+from collections import Counter
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+class SamplingProfiler:
+    """
+    Statistical profiler that samples Python stacks from a background thread.
+    
+    Nothing is instrumented: every `interval` seconds the sampler reads the current
+    frame of the profiled thread(s) with sys._current_frames(), so the profiled code
+    runs at full speed. Results are written in the collapsed-stack format read by
+    flamegraph.pl, speedscope and similar tools.
+    """
+    
+    def __init__(self, interval: float = 0.005, output_dir: str = "profiles"):
+        self.interval = interval
+        self.output_dir = output_dir
+        self.stacks = Counter()
+        self.samples = 0
+        self.output_path: Optional[str] = None
+        
+        self._thread_id: Optional[int] = None
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+    
+    def start(self, duration: Optional[float] = None, output_path: Optional[str] = None,
+              thread_id: Optional[int] = None) -> bool:
+        """
+        Start sampling for `duration` seconds (until stop() when None).
+        
+        Samples only `thread_id` when given, otherwise every thread but the sampler.
+        Returns False if a profile is already running.
+        """
+        if self.running:
+            logger.warning("Profiler already running")
+            return False
+        
+        self.stacks = Counter()
+        self.samples = 0
+        self._thread_id = thread_id
+        self.output_path = output_path or os.path.join(
+            self.output_dir, time.strftime("profile-%Y%m%d-%H%M%S.collapsed"))
+        
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, args=(duration,), name="SamplingProfiler",
+                                        daemon=True)
+        self._thread.start()
+        logger.info(f"Profiling started for {duration if duration else 'unlimited'}s")
+        return True
+    
+    def stop(self) -> Optional[str]:
+        """Stop sampling early; returns the output path once it has been written."""
+        if self._thread is None:
+            return None
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+        return self.output_path
+    
+    def _run(self, duration: Optional[float]):
+        deadline = time.monotonic() + duration if duration else None
+        own_id = threading.get_ident()
+        names = {}
+        
+        while not self._stop_event.wait(self.interval):
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            
+            frames = sys._current_frames()
+            if self._thread_id is not None:
+                frames = {self._thread_id: frames[self._thread_id]} if self._thread_id in frames else {}
+            if frames.keys() - names.keys():
+                names = {thread.ident: thread.name for thread in threading.enumerate()}
+            
+            for thread_id, frame in frames.items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, str(thread_id)))
+                self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+        
+        self.write(self.output_path)
+    
+    def write(self, path: str):
+        """Write the collected stacks as 'frame;frame;... count' lines."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w") as output:
+            for stack, count in self.stacks.most_common():
+                output.write(f"{stack} {count}\n")
+        logger.info(f"Profile written to {path} ({self.samples} samples)")
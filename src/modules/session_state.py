@@ -0,0 +1,49 @@
+import json
+import zlib
+import base64
+import struct
+import numpy as np
+
+# Snapshot header: magic and format version
+SNAPSHOT_MAGIC = b'GZS'
+SNAPSHOT_VERSION = 1
+_HEADER = struct.Struct('!3sB')
+
+def pack_array(array: np.ndarray) -> dict:
+    """
+    Compact, exact JSON form of a numeric array.
+    
+    Bytes are shuffled (all first bytes, then all second bytes, ...) before zlib,
+    so slowly varying values such as timestamps compress to a fraction of their size.
+    """
+    array = np.ascontiguousarray(array)
+    shuffled = array.view(np.uint8).reshape(-1, array.itemsize).T.tobytes() if array.size else b''
+    return {'dtype': array.dtype.str, 'shape': list(array.shape),
+            'data': base64.b64encode(zlib.compress(shuffled, 6)).decode('ascii')}
+
+def unpack_array(packed: dict) -> np.ndarray:
+    """Inverse of pack_array()."""
+    dtype = np.dtype(packed['dtype'])
+    raw = np.frombuffer(zlib.decompress(base64.b64decode(packed['data'])), dtype=np.uint8)
+    if raw.size == 0:
+        return np.zeros(packed['shape'], dtype=dtype)
+    return raw.reshape(dtype.itemsize, -1).T.copy().view(dtype).reshape(packed['shape'])
+
+def encode_state(state: dict) -> bytes:
+    """Serialize a JSON-compatible state dict into a compressed, versioned message."""
+    payload = json.dumps(state, separators=(',', ':')).encode('utf-8')
+    return _HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION) + zlib.compress(payload, 6)
+
+def decode_state(data: bytes) -> dict:
+    """Parse a message written by encode_state()."""
+    if len(data) < _HEADER.size:
+        raise ValueError("Snapshot too short")
+    magic, version = _HEADER.unpack_from(data)
+    if magic != SNAPSHOT_MAGIC:
+        raise ValueError("Not a detector snapshot")
+    if version != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot version {version}")
+    try:
+        return json.loads(zlib.decompress(data[_HEADER.size:]))
+    except (zlib.error, ValueError) as e:
+        raise ValueError(f"Corrupt snapshot: {e}") from e
@@ -0,0 +1,265 @@
+import math
+from typing import Iterator, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from src.modules.landmark_features import (LEFT_EYE_OUTER, RIGHT_EYE_OUTER, LEFT_EYE_INNER, RIGHT_EYE_INNER,
+                                           LEFT_EYE_TOP, LEFT_EYE_BOTTOM, RIGHT_EYE_TOP, RIGHT_EYE_BOTTOM,
+                                           LEFT_IRIS, RIGHT_IRIS, NOSE_TIP, CHIN,
+                                           LEFT_MOUTH_CORNER, RIGHT_MOUTH_CORNER)
+
+NUM_LANDMARKS = 478
+
+# Face model in the units and axes of HeadPoseEstimator.MODEL_POINTS (x right, y down,
+# z away from the camera), so solvePnP on rendered faces recovers the generated pose.
+EYE_CENTER_Y = -170.0
+EYE_Z = 135.0
+EYE_OUTER_X = 225.0
+EYE_INNER_X = 75.0
+IRIS_RADIUS = 12.0
+
+_KEY_POINTS = {
+    NOSE_TIP: (0.0, 0.0, 0.0),
+    CHIN: (0.0, 330.0, 65.0),
+    LEFT_EYE_OUTER: (-EYE_OUTER_X, EYE_CENTER_Y, EYE_Z),
+    LEFT_EYE_INNER: (-EYE_INNER_X, EYE_CENTER_Y, EYE_Z),
+    RIGHT_EYE_OUTER: (EYE_OUTER_X, EYE_CENTER_Y, EYE_Z),
+    RIGHT_EYE_INNER: (EYE_INNER_X, EYE_CENTER_Y, EYE_Z),
+    LEFT_MOUTH_CORNER: (-150.0, 150.0, 125.0),
+    RIGHT_MOUTH_CORNER: (150.0, 150.0, 125.0),
+}
+
+def _build_template() -> np.ndarray:
+    """All 478 points: fixed anatomical key points, the rest spread over the face surface."""
+    rng = np.random.default_rng(0)
+    u = rng.uniform(-1, 1, NUM_LANDMARKS)
+    v = rng.uniform(-1, 1, NUM_LANDMARKS)
+    template = np.column_stack([
+        u * 260.0,
+        v * 330.0 + 20.0,
+        # Ellipsoid surface: points further from the nose lie deeper
+        np.sqrt(np.clip(u ** 2 + (v * 0.8) ** 2, 0, 1)) * 180.0 + 20.0,
+    ])
+    for index, point in _KEY_POINTS.items():
+        template[index] = point
+    return template
+
+TEMPLATE = _build_template()
+
+# Eyelid, iris and iris ring rows move per frame; everything else is rigid
+_IRIS_RING = np.array([[0, 0], [1, 0], [0, -1], [-1, 0], [0, 1]], dtype=np.float64) * IRIS_RADIUS
+
+class FaceTrack(NamedTuple):
+    """
+    Per-frame parameters of one synthetic face; every field is an (N,) array.
+    
+    Angles are in degrees with HeadPoseEstimator's sign convention. `gaze` shifts both
+    gaze ratios (left eye +gaze, right eye -gaze), `gaze_y` moves the irises down as a
+    fraction of the eye opening, and center/scale place the face in normalized coordinates.
+    """
+    yaw: np.ndarray
+    pitch: np.ndarray
+    roll: np.ndarray
+    gaze: np.ndarray
+    gaze_y: np.ndarray
+    left_ear: np.ndarray
+    right_ear: np.ndarray
+    center_x: np.ndarray
+    center_y: np.ndarray
+    scale: np.ndarray
+    
+    @property
+    def frames(self) -> int:
+        return len(self.yaw)
+
+def concat_tracks(*tracks: FaceTrack) -> FaceTrack:
+    """Join tracks end to end."""
+    return FaceTrack(*(np.concatenate(fields) for fields in zip(*tracks)))
+
+class SyntheticLandmark:
+    """MediaPipe NormalizedLandmark stand-in."""
+    __slots__ = ('x', 'y', 'z')
+    
+    def __init__(self, x: float, y: float, z: float):
+        self.x = x
+        self.y = y
+        self.z = z
+
+class SyntheticFaceLandmarks:
+    """MediaPipe NormalizedLandmarkList stand-in with a `landmark` sequence."""
+    
+    def __init__(self, points: np.ndarray):
+        self.landmark = [SyntheticLandmark(x, y, z) for x, y, z in points.tolist()]
+
+class SyntheticResults:
+    """FaceMesh.process() result stand-in; multi_face_landmarks is None without faces."""
+    
+    def __init__(self, faces: List[SyntheticFaceLandmarks]):
+        self.multi_face_landmarks = faces or None
+
+class SyntheticFaceGenerator:
+    """
+    Generates landmark sequences for attentive viewing, gaze sweeps, downward glances,
+    blinks, head turns and tilts, with noise and occlusion drop-outs, without a camera or MediaPipe.
+    
+    Rendering is vectorized over frames; render only LANDMARK_INDICES (`indices=`)
+    when driving the fused feature kernel to skip the 478-point work.
+    """
+    
+    def __init__(self, seed: Optional[int] = 0, fps: float = 30.0, aspect: float = 4 / 3):
+        self.rng = np.random.default_rng(seed)
+        self.fps = fps
+        # Frame width / height; normalized y spans the shorter side
+        self.aspect = aspect
+    
+    def steady(self, frames: int, scale: float = 0.25 / (2 * EYE_OUTER_X), ear: float = 0.3,
+               center_x: float = 0.5, center_y: float = 0.5) -> FaceTrack:
+        """An attentive face with slow, small head sway and gaze jitter."""
+        def drift(amplitude):
+            walk = np.cumsum(self.rng.normal(0, 1, frames))
+            walk -= np.linspace(0, walk[-1], frames) if frames else 0
+            peak = np.abs(walk).max() if frames else 0
+            return walk * (amplitude / peak) if peak > 0 else walk
+        
+        return FaceTrack(
+            yaw=drift(3.0), pitch=drift(2.0), roll=drift(2.0),
+            gaze=drift(0.02), gaze_y=drift(0.05),
+            left_ear=ear + self.rng.normal(0, 0.005, frames),
+            right_ear=ear + self.rng.normal(0, 0.005, frames),
+            center_x=center_x + drift(0.01), center_y=center_y + drift(0.01),
+            scale=np.full(frames, scale),
+        )
+    
+    def _wave(self, frames: int, period: float) -> np.ndarray:
+        return np.sin(2 * math.pi * np.arange(frames) / (period * self.fps))
+    
+    def gaze_sweep(self, frames: int, amplitude: float = 0.25, period: float = 4.0, **kwargs) -> FaceTrack:
+        """Eyes sweeping left and right while the head stays still."""
+        track = self.steady(frames, **kwargs)
+        return track._replace(gaze=track.gaze + amplitude * self._wave(frames, period))
+    
+    def head_turn(self, frames: int, max_yaw: float = 40.0, period: float = 6.0, **kwargs) -> FaceTrack:
+        """Head turning left and right."""
+        track = self.steady(frames, **kwargs)
+        return track._replace(yaw=track.yaw + max_yaw * self._wave(frames, period))
+    
+    def tilt(self, frames: int, max_roll: float = 25.0, period: float = 6.0, **kwargs) -> FaceTrack:
+        """Head tilting towards each shoulder."""
+        track = self.steady(frames, **kwargs)
+        return track._replace(roll=track.roll + max_roll * self._wave(frames, period))
+    
+    def glance_down(self, frames: int, depth: float = 0.8, period: float = 4.0, **kwargs) -> FaceTrack:
+        """Eyes dropping toward the lower lid and back, as when checking a phone."""
+        track = self.steady(frames, **kwargs)
+        return track._replace(gaze_y=track.gaze_y + depth * np.maximum(self._wave(frames, period), 0))
+    
+    def with_blinks(self, track: FaceTrack, rate_per_minute: float = 17.0, duration: float = 0.2,
+                    closed_ear: float = 0.05) -> FaceTrack:
+        """Add blinks at random times; EAR follows a smooth close-open dip."""
+        frames = track.frames
+        blink_frames = max(2, int(round(duration * self.fps)))
+        starts = np.flatnonzero(self.rng.random(frames) < rate_per_minute / (60 * self.fps))
+        
+        dip = np.zeros(frames + blink_frames)
+        shape = np.sin(np.linspace(0, math.pi, blink_frames))
+        for start in starts.tolist():
+            dip[start:start + blink_frames] = np.maximum(dip[start:start + blink_frames], shape)
+        dip = dip[:frames]
+        
+        return track._replace(left_ear=track.left_ear + (closed_ear - track.left_ear) * dip,
+                              right_ear=track.right_ear + (closed_ear - track.right_ear) * dip)
+    
+    def occlusions(self, frames: int, rate_per_minute: float = 2.0, mean_duration: float = 0.5) -> np.ndarray:
+        """Boolean (N,) mask of frames where the face is lost (hand, turning away, ...)."""
+        mask = np.zeros(frames, dtype=bool)
+        starts = np.flatnonzero(self.rng.random(frames) < rate_per_minute / (60 * self.fps))
+        lengths = np.maximum(1, self.rng.exponential(mean_duration * self.fps, len(starts)).astype(int))
+        for start, length in zip(starts.tolist(), lengths.tolist()):
+            mask[start:start + length] = True
+        return mask
+    
+    def render(self, track: FaceTrack, indices: Optional[Sequence[int]] = None,
+               noise: float = 0.0, dtype=np.float64) -> np.ndarray:
+        """
+        Render normalized (x, y, z) landmarks of shape (N, K, 3).
+        
+        K is 478, or len(indices) when only some landmarks are needed. `noise` adds
+        Gaussian jitter (normalized units) like real landmark detection noise.
+        """
+        indices = np.arange(NUM_LANDMARKS) if indices is None else np.asarray(indices)
+        frames = track.frames
+        points = np.broadcast_to(TEMPLATE[indices], (frames, len(indices), 3)).astype(dtype)
+        
+        # Per-frame eyelids and irises
+        positions = {index: row for row, index in enumerate(indices.tolist())}
+        half_width = (EYE_OUTER_X - EYE_INNER_X) / 2
+        for side, (top, bottom, iris, ear, direction) in enumerate((
+                (LEFT_EYE_TOP, LEFT_EYE_BOTTOM, LEFT_IRIS, track.left_ear, -1),
+                (RIGHT_EYE_TOP, RIGHT_EYE_BOTTOM, RIGHT_IRIS, track.right_ear, 1))):
+            eye_x = direction * (EYE_INNER_X + half_width)
+            opening = np.maximum(ear, 0) * half_width
+            if top in positions:
+                points[:, positions[top]] = np.column_stack([np.full(frames, eye_x), EYE_CENTER_Y - opening,
+                                                            np.full(frames, EYE_Z - 5)])
+            if bottom in positions:
+                points[:, positions[bottom]] = np.column_stack([np.full(frames, eye_x), EYE_CENTER_Y + opening,
+                                                               np.full(frames, EYE_Z - 5)])
+            # Gaze ratio 0.5 + gaze for the left eye and 0.5 - gaze for the right one
+            iris_x = eye_x - 2 * half_width * track.gaze
+            iris_y = EYE_CENTER_Y + track.gaze_y * opening
+            for ring, (dx, dy) in enumerate(_IRIS_RING.tolist()):
+                row = positions.get(iris + ring)
+                if row is not None:
+                    points[:, row] = np.column_stack([iris_x + dx, iris_y + dy, np.full(frames, EYE_Z - 10)])
+        
+        # Rotate about the nose tip: R = Rz(roll) @ Ry(yaw) @ Rx(pitch)
+        yaw, pitch, roll = (np.radians(angle) for angle in (track.yaw, track.pitch, track.roll))
+        cy, sy, cp, sp, cr, sr = np.cos(yaw), np.sin(yaw), np.cos(pitch), np.sin(pitch), np.cos(roll), np.sin(roll)
+        rotation = np.empty((frames, 3, 3), dtype=dtype)
+        rotation[:, 0, 0] = cr * cy
+        rotation[:, 0, 1] = cr * sy * sp - sr * cp
+        rotation[:, 0, 2] = cr * sy * cp + sr * sp
+        rotation[:, 1, 0] = sr * cy
+        rotation[:, 1, 1] = sr * sy * sp + cr * cp
+        rotation[:, 1, 2] = sr * sy * cp - cr * sp
+        rotation[:, 2, 0] = -sy
+        rotation[:, 2, 1] = cy * sp
+        rotation[:, 2, 2] = cy * cp
+        points = points @ rotation.transpose(0, 2, 1)
+        
+        # Pinhole projection with focal length = frame width (as HeadPoseEstimator assumes);
+        # the camera distance makes the nose-tip depth plane appear at `scale`
+        scale = track.scale[:, None].astype(dtype)
+        perspective = scale / (1 + points[..., 2] * scale)
+        points[..., 0] = track.center_x[:, None] + points[..., 0] * perspective
+        points[..., 1] = track.center_y[:, None] + points[..., 1] * perspective * self.aspect
+        points[..., 2] *= scale
+        if noise > 0:
+            points += self.rng.normal(0, noise, points.shape).astype(dtype)
+        return points
+    
+    def render_faces(self, tracks: Sequence[FaceTrack], occluded: Optional[Sequence[np.ndarray]] = None,
+                     indices: Optional[Sequence[int]] = None, noise: float = 0.0) -> np.ndarray:
+        """
+        Render several faces into one (N, F, K, 3) array.
+        
+        Occluded faces become NaN, the same way missing landmarks are represented elsewhere.
+        """
+        faces = np.stack([self.render(track, indices, noise) for track in tracks], axis=1)
+        if occluded is not None:
+            for face, mask in enumerate(occluded):
+                faces[mask, face] = np.nan
+        return faces
+    
+    @staticmethod
+    def to_results(faces: np.ndarray) -> Iterator[SyntheticResults]:
+        """
+        Yield FaceMesh-style results from (N, K, 3) or (N, F, K, 3) full 478-point arrays.
+        
+        NaN faces are left out, so fully occluded frames have multi_face_landmarks None.
+        """
+        if faces.ndim == 3:
+            faces = faces[:, None]
+        for frame in faces:
+            yield SyntheticResults([SyntheticFaceLandmarks(points) for points in frame
+                                    if not np.isnan(points).any()])
@@ -0,0 +1,156 @@
+import logging
+import threading
+import time
+from typing import NamedTuple, Optional, Dict, Tuple
+
+import numpy as np
+
+from src.modules.runtime_tuning import pin_thread
+
+logger = logging.getLogger(__name__)
+
+class FramePacket(NamedTuple):
+    """A captured frame with its capture time (time.perf_counter) and sequence number."""
+    frame: np.ndarray
+    timestamp: float
+    sequence: int
+
+class ThreadedFrameReader:
+    """
+    Reads frames on a background thread and keeps only the newest one.
+    
+    With `pace`, frames are released at the source frame rate and stamped with
+    the time they would have been captured, so a video file stands in for a live
+    camera instead of being read as fast as it decodes.
+    """
+    
+    def __init__(self, camera, expected_fps: Optional[float] = None, pace: bool = False):
+        self.camera = camera
+        
+        # Used to estimate frames the driver dropped from gaps between captures
+        fps = expected_fps or getattr(camera, 'fps', None)
+        self.frame_interval = 1.0 / fps if fps else None
+        if pace and self.frame_interval is None:
+            raise ValueError("Pacing needs the source frame rate")
+        self.pace = pace
+        
+        self._condition = threading.Condition()
+        self._capture_lock = threading.Lock()
+        self._latest: Optional[FramePacket] = None
+        self._last_consumed = 0
+        self._thread = None
+        self._running = False
+        self.failed = False
+        
+        self.frames_captured = 0
+        self.dropped_by_driver = 0
+        self.dropped_by_consumer = 0
+    
+    def start(self):
+        """Start the background capture thread."""
+        if self._running:
+            return self
+        
+        self._running = True
+        self._thread = threading.Thread(target=self._capture_loop, name="FrameReader", daemon=True)
+        self._thread.start()
+        logger.info("Threaded frame reader started")
+        return self
+    
+    def _capture_loop(self):
+        """Continuously read frames, replacing the latest one."""
+        pin_thread(getattr(self.camera, 'cpu_cores', ()))
+        last_timestamp = None
+        
+        while self._running:
+            with self._capture_lock:
+                ret, frame = self.camera.read_frame()
+            timestamp = time.perf_counter()
+            if self.pace and ret:
+                if last_timestamp is not None:
+                    # Frames decoded late keep their due time and may then miss deadlines
+                    due = last_timestamp + self.frame_interval
+                    if due > timestamp:
+                        time.sleep(due - timestamp)
+                    timestamp = due
+            
+            if not ret:
+                logger.warning("Frame reader failed to read frame")
+                with self._condition:
+                    self.failed = True
+                    self._running = False
+                    self._condition.notify_all()
+                return
+            
+            if self.frame_interval and last_timestamp is not None:
+                missed = round((timestamp - last_timestamp) / self.frame_interval) - 1
+                if missed > 0:
+                    self.dropped_by_driver += missed
+            last_timestamp = timestamp
+            
+            with self._condition:
+                self.frames_captured += 1
+                
+                # The previous frame was never handed out, so our side dropped it
+                if self._latest is not None and self._latest.sequence > self._last_consumed:
+                    self.dropped_by_consumer += 1
+                
+                self._latest = FramePacket(frame, timestamp, self.frames_captured)
+                self._condition.notify_all()
+    
+    def latest(self) -> Optional[FramePacket]:
+        """Return the newest frame without blocking, or None if nothing was captured yet."""
+        with self._condition:
+            if self._latest is not None:
+                self._last_consumed = self._latest.sequence
+            return self._latest
+    
+    def next(self, timeout: Optional[float] = None) -> Optional[FramePacket]:
+        """Block until a frame newer than the last one returned is available."""
+        with self._condition:
+            available = self._condition.wait_for(
+                lambda: (self._latest is not None and self._latest.sequence > self._last_consumed)
+                or not self._running,
+                timeout)
+            
+            if not available or self._latest is None or self._latest.sequence <= self._last_consumed:
+                return None
+            
+            self._last_consumed = self._latest.sequence
+            return self._latest
+    
+    def get_dimensions(self) -> Tuple[int, int]:
+        """Get camera frame dimensions."""
+        return self.camera.get_dimensions()
+    
+    def set_resolution(self, width: int, height: int) -> Tuple[int, int]:
+        """Change the capture resolution without racing the capture thread."""
+        with self._capture_lock:
+            return self.camera.set_resolution(width, height)
+    
+    def set_fps(self, fps: float) -> float:
+        """Change the capture frame rate without racing the capture thread."""
+        with self._capture_lock:
+            fps = self.camera.set_fps(fps)
+        self.frame_interval = 1.0 / fps if fps else None
+        return fps
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Get capture and drop counters."""
+        with self._condition:
+            return {
+                'frames_captured': self.frames_captured,
+                'dropped_by_driver': self.dropped_by_driver,
+                'dropped_by_consumer': self.dropped_by_consumer
+            }
+    
+    def stop(self):
+        """Stop the capture thread."""
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        logger.info(f"Threaded frame reader stopped: {self.get_stats()}")
@@ -0,0 +1,231 @@
+import os
+import cv2
+import time
+import queue
+import logging
+import threading
+import numpy as np
+from collections import deque
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+class VideoRecorder:
+    """
+    Records frames on a writer thread so encoding never blocks the processing loop.
+    
+    Frames are copied into a bounded pool of reusable buffers and encoded by a
+    background thread. When the pool is exhausted because the encoder fell behind,
+    frames are dropped and counted instead of blocking.
+    
+    Between events the last `pre_roll` seconds are kept in a ring, so each clip
+    starts before the event that triggered it and runs until `post_roll` seconds
+    after the event ends. Call begin_event() for a clip that lasts until end_event().
+    
+    Clips are encoded at a constant `fps`, but the loop rate varies (quality
+    levels, inference stride, idle backoff). Each frame is therefore placed by its
+    timestamp: frames are repeated over gaps and skipped when they arrive faster
+    than `fps`, so clips play back in real time.
+    """
+    
+    def __init__(self, output_dir: str = "recordings", fps: float = 30.0, pre_roll: float = 0.0,
+                 post_roll: float = 5.0, pool_size: Optional[int] = None, fourcc: str = "mp4v",
+                 writer_factory: Optional[Callable] = None):
+        self.output_dir = output_dir
+        self.fps = fps
+        self.post_roll = post_roll
+        self.ring_frames = int(round(pre_roll * fps))
+        
+        # Room for the pre-roll plus about a second of encoder backlog
+        self.pool_size = pool_size or self.ring_frames + max(1, int(fps))
+        if self.pool_size <= self.ring_frames:
+            raise ValueError("pool_size must be larger than the pre-roll")
+        
+        self.fourcc = fourcc
+        self.writer_factory = writer_factory or self._open_writer
+        
+        self.frames_written = 0
+        self.dropped_frames = 0
+        # Frames left out or repeated to hold the clip frame rate
+        self.skipped_frames = 0
+        self.repeated_frames = 0
+        self.clips = 0
+        self.last_clip: Optional[str] = None
+        
+        self._free: "queue.Queue[np.ndarray]" = queue.Queue()
+        self._allocated = 0
+        self._ring = deque()
+        self._pending: queue.Queue = queue.Queue()
+        self._clip_path: Optional[str] = None
+        self._record_until = 0.0
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def recording(self) -> bool:
+        return self._clip_path is not None
+    
+    def start(self) -> "VideoRecorder":
+        """Start the writer thread."""
+        os.makedirs(self.output_dir, exist_ok=True)
+        self._thread = threading.Thread(target=self._write_loop, name="VideoRecorder", daemon=True)
+        self._thread.start()
+        return self
+    
+    def _open_writer(self, path: str, width: int, height: int):
+        return cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*self.fourcc), self.fps, (width, height))
+    
+    def _acquire(self, frame: np.ndarray) -> Optional[np.ndarray]:
+        """Get a free buffer matching the frame, or None if the pool is exhausted."""
+        try:
+            buffer = self._free.get_nowait()
+        except queue.Empty:
+            if self._allocated < self.pool_size:
+                self._allocated += 1
+                buffer = np.empty_like(frame)
+            elif self._ring and not self.recording:
+                buffer = self._ring.popleft()[0]
+            else:
+                return None
+        
+        # Resolution changes (e.g. from the QualityController) replace the buffer
+        if buffer.shape != frame.shape or buffer.dtype != frame.dtype:
+            buffer = np.empty_like(frame)
+        return buffer
+    
+    def submit(self, frame: np.ndarray, timestamp: Optional[float] = None) -> bool:
+        """Queue a frame; returns False if it was dropped or is not needed."""
+        if timestamp is None:
+            timestamp = time.perf_counter()
+        
+        if self.recording and timestamp > self._record_until:
+            self._end_clip()
+        if not self.recording and self.ring_frames == 0:
+            return False
+        
+        buffer = self._acquire(frame)
+        if buffer is None:
+            self.dropped_frames += 1
+            return False
+        np.copyto(buffer, frame)
+        
+        if self.recording:
+            self._pending.put((self._clip_path, buffer, timestamp))
+        else:
+            self._ring.append((buffer, timestamp))
+            if len(self._ring) > self.ring_frames:
+                self._free.put(self._ring.popleft()[0])
+        return True
+    
+    def begin_event(self, timestamp: Optional[float] = None):
+        """Start (or extend) a clip that lasts until end_event()."""
+        if not self.recording:
+            self.clips += 1
+            self._clip_path = os.path.join(
+                self.output_dir, time.strftime("clip-%Y%m%d-%H%M%S") + f"-{self.clips:03d}.mp4")
+            self.last_clip = self._clip_path
+            logger.info(f"Recording clip {self._clip_path}")
+            
+            # The pre-roll becomes the start of the clip
+            while self._ring:
+                self._pending.put((self._clip_path, *self._ring.popleft()))
+        self._record_until = float('inf')
+    
+    def end_event(self, timestamp: Optional[float] = None):
+        """Keep recording for post_roll seconds, then close the clip."""
+        if not self.recording:
+            return
+        if timestamp is None:
+            timestamp = time.perf_counter()
+        self._record_until = timestamp + self.post_roll
+    
+    def trigger(self, timestamp: Optional[float] = None):
+        """Record the pre-roll and the next post_roll seconds."""
+        self.begin_event(timestamp)
+        self.end_event(timestamp)
+    
+    def _end_clip(self):
+        self._pending.put((self._clip_path, None, None))
+        self._clip_path = None
+    
+    def _copies(self, timestamp: float, clip_start: float, written: int) -> int:
+        """How many times to write a frame so it lands on its slot of the constant-rate clip."""
+        return round((timestamp - clip_start) * self.fps) + 1 - written
+    
+    def _write_loop(self):
+        writer = None
+        writer_path = None
+        size = None
+        clip_start, written = 0.0, 0
+        # Longest gap filled with repeats; beyond it the clip skips ahead
+        max_repeats = max(1, int(self.fps))
+        
+        while True:
+            item = self._pending.get()
+            if item is None:
+                break
+            path, buffer, timestamp = item
+            
+            if path != writer_path:
+                if writer is not None:
+                    writer.release()
+                writer, writer_path, size = None, path, None
+                clip_start, written = timestamp, 0
+            
+            if buffer is None:
+                if writer is not None:
+                    writer.release()
+                    logger.info(f"Clip saved: {path}")
+                writer, writer_path = None, None
+                continue
+            
+            copies = self._copies(timestamp, clip_start, written)
+            if copies <= 0:
+                self.skipped_frames += 1
+                self._free.put(buffer)
+                continue
+            if copies > max_repeats:
+                clip_start += (copies - max_repeats) / self.fps
+                copies = max_repeats
+            
+            try:
+                if writer is None:
+                    size = (buffer.shape[1], buffer.shape[0])
+                    writer = self.writer_factory(path, *size)
+                frame = buffer
+                if (frame.shape[1], frame.shape[0]) != size:
+                    frame = cv2.resize(frame, size)
+                for _ in range(copies):
+                    writer.write(frame)
+                written += copies
+                self.frames_written += 1
+                self.repeated_frames += copies - 1
+            except Exception as e:
+                logger.error("Failed to write frame to %s: %s", path, e)
+            finally:
+                self._free.put(buffer)
+        
+        if writer is not None:
+            writer.release()
+            logger.info(f"Clip saved: {writer_path}")
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Written, dropped and backlog counters."""
+        return {
+            'frames_written': self.frames_written,
+            'dropped_frames': self.dropped_frames,
+            'skipped_frames': self.skipped_frames,
+            'repeated_frames': self.repeated_frames,
+            'backlog': self._pending.qsize(),
+            'clips': self.clips
+        }
+    
+    def close(self):
+        """Finish the current clip, wait for queued frames to be written and stop the thread."""
+        if self.recording:
+            self._end_clip()
+        self._ring.clear()
+        if self._thread is not None:
+            self._pending.put(None)
+            self._thread.join()
+            self._thread = None
+        logger.info(f"Video recorder closed: {self.get_stats()}")
@@ -2,14 +2,38 @@ import unittest
 import sys
 import os
 
+from tests.test_attention_heatmap import TestAttentionHeatmap
+from tests.test_batch_scoring import TestBatchScoring
 from tests.test_camera_manager import TestCameraManager
 from tests.test_concentration_analyzer import TestConcentrationAnalyzer
 from tests.test_concentration_detector import TestConcentrationDetectorIntegration
+from tests.test_deadline_scheduler import TestDeadlineScheduler
 from tests.test_display_manager import TestDisplayManager
+from tests.test_event_stream import TestEventStream
 from tests.test_eye_analyzer import TestEyeAnalyzer
+from tests.test_eye_state_engine import TestEyeStateEngine
+from tests.test_detector_config import TestDetectorConfig
+from tests.test_frame_source import TestFrameSource
 from tests.test_head_pose_analyzer import TestHeadPoseAnalyzer
+from tests.test_head_pose_estimator import TestHeadPoseEstimator
+from tests.test_landmark_features import TestLandmarkFeatures
+from tests.test_landmark_backends import TestLandmarkBackends
+from tests.test_landmark_filter import TestLandmarkFilter
+from tests.test_landmark_transport import TestCentralScorer, TestEdgeToCentral, TestLandmarkPackets
+from tests.test_mjpeg_capture import TestMjpegCameraManager
+from tests.test_motion_gate import TestMotionGate
 from tests.test_performance_tracker import TestPerformanceTracker
-from tests.test_result_smoother import TestResultSmoother
+from tests.test_pipeline_logging import TestPipelineLogging
+from tests.test_quality_controller import TestQualityController
+from tests.test_resource_monitor import TestResourceMonitor
+from tests.test_result_smoother import TestBatchResultSmoother, TestResultSmoother
+from tests.test_rule_engine import TestRuleEngine
+from tests.test_runtime_tuning import TestRuntimeTuning
+from tests.test_sampling_profiler import TestSamplingProfiler
+from tests.test_session_state import TestSessionState
+from tests.test_synthetic_landmarks import TestSyntheticLandmarks
+from tests.test_threaded_frame_reader import TestThreadedFrameReader
+from tests.test_video_recorder import TestVideoRecorder
 
 # Add the src directory to the path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
@@ -22,12 +46,39 @@ def run_tests():
     # Add all test classes
     test_classes = [
         TestEyeAnalyzer,
+        TestEyeStateEngine,
+        TestAttentionHeatmap,
+        TestDetectorConfig,
         TestHeadPoseAnalyzer,
+        TestHeadPoseEstimator,
+        TestLandmarkFeatures,
+        TestLandmarkBackends,
+        TestLandmarkFilter,
+        TestLandmarkPackets,
+        TestCentralScorer,
         TestConcentrationAnalyzer,
+        TestRuleEngine,
+        TestSamplingProfiler,
+        TestSyntheticLandmarks,
         TestResultSmoother,
+        TestBatchResultSmoother,
+        TestThreadedFrameReader,
+        TestVideoRecorder,
+        TestBatchScoring,
+        TestDeadlineScheduler,
+        TestSessionState,
         TestPerformanceTracker,
+        TestPipelineLogging,
+        TestMotionGate,
+        TestQualityController,
+        TestResourceMonitor,
+        TestRuntimeTuning,
         TestCameraManager,
+        TestMjpegCameraManager,
+        TestFrameSource,
         TestDisplayManager,
+        TestEventStream,
+        TestEdgeToCentral,
         TestConcentrationDetectorIntegration
     ]
     
@@ -0,0 +1,67 @@
+import unittest
+import numpy as np
+import sys
+import os
+import math
+import tempfile
+
+# Add the src directory to the path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from modules.attention_heatmap import AttentionHeatmap
+
+class TestAttentionHeatmap(unittest.TestCase):
+    """Test cases for AttentionHeatmap class."""
+    
+    def setUp(self):
+        self.heatmap = AttentionHeatmap(bins=(4, 2))
+    
+    def test_add_bins_points(self):
+        """Test points land in the right bins and edge cases are handled."""
+        self.assertTrue(self.heatmap.add(0.1, 0.1))
+        self.assertTrue(self.heatmap.add(0.9, 0.9))
+        self.assertTrue(self.heatmap.add(1.0, 1.0))    # upper edge belongs to the last bin
+        self.assertFalse(self.heatmap.add(1.2, 0.5))
+        self.assertFalse(self.heatmap.add(math.nan, 0.5))
+        
+        self.assertEqual(self.heatmap.counts[0, 0], 1)
+        self.assertEqual(self.heatmap.counts[1, 3], 2)
+        self.assertEqual((self.heatmap.total, self.heatmap.outside), (3, 1))
+    
+    def test_batch_matches_histogram2d(self):
+        """Test batched updates equal np.histogram2d and single adds."""
+        points = np.random.default_rng(0).uniform(-0.1, 1.1, (500, 2))
+        points[::50] = np.nan
+        single = AttentionHeatmap(bins=(4, 2))
+        for x, y in points:
+            single.add(x, y)
+        
+        binned = self.heatmap.add_batch(points)
+        
+        inside = points[((points >= 0) & (points <= 1)).all(axis=1)]
+        expected, _, _ = np.histogram2d(inside[:, 1], inside[:, 0], bins=(2, 4), range=((0, 1), (0, 1)))
+        np.testing.assert_array_equal(self.heatmap.counts, expected)
+        np.testing.assert_array_equal(single.counts, expected)
+        self.assertEqual(binned, len(inside))
+        self.assertEqual(self.heatmap.outside, single.outside)
+    
+    def test_snapshot_round_trip(self):
+        """Test snapshots are independent copies and survive save/load."""
+        self.heatmap.add_batch([[0.2, 0.2], [0.2, 0.3], [0.7, 0.8]])
+        snapshot = self.heatmap.snapshot()
+        self.heatmap.reset()
+        
+        self.assertEqual(snapshot.total, 3)
+        self.assertAlmostEqual(snapshot.normalized()[0, 0], 2 / 3)
+        np.testing.assert_array_equal(snapshot.x_edges, [0, 0.25, 0.5, 0.75, 1.0])
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "heatmap.npz")
+            self.heatmap.save(path, snapshot)
+            loaded = AttentionHeatmap.load(path)
+        np.testing.assert_array_equal(loaded.counts, snapshot.counts)
+        self.assertEqual(loaded.total, 3)
+        self.assertEqual(self.heatmap.total, 0)
+
+if __name__ == '__main__':
+    unittest.main()
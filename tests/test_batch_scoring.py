@@ -0,0 +1,132 @@
+import unittest
+import json
+import numpy as np
+import sys
+import os
+import tempfile
+import cv2
+
+# Add the src directory to the path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from concentration_detector import ConcentrationDetector
+from modules.batch_scoring import BatchScoringJob, JobManifest
+from modules.detector_config import DetectorConfig
+
+def synthetic_detector():
+    """Detector on synthetic landmarks, with every stateful stage enabled."""
+    return ConcentrationDetector.from_config(DetectorConfig(landmark_backend="synthetic"),
+                                             landmark_filtering=True, use_head_pose_angles=True)
+
+class CrashingDetector:
+    """Wraps a detector and raises after a number of frames, like a killed process."""
+    
+    def __init__(self, frames_before_crash):
+        self.detector = synthetic_detector()
+        self.frames_left = frames_before_crash
+    
+    def process_frame(self, frame, **kwargs):
+        if self.frames_left == 0:
+            raise RuntimeError("Simulated crash")
+        self.frames_left -= 1
+        return self.detector.process_frame(frame, **kwargs)
+    
+    def __getattr__(self, name):
+        return getattr(self.detector, name)
+
+class TestBatchScoring(unittest.TestCase):
+    """Test cases for BatchScoringJob and JobManifest."""
+    
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+    
+    def write_images(self, name, count):
+        directory = os.path.join(self.tmp_dir.name, name)
+        os.makedirs(directory)
+        for index in range(count):
+            cv2.imwrite(os.path.join(directory, f"{index:04d}.png"), np.full((48, 64, 3), index, dtype=np.uint8))
+        return directory
+    
+    def output_path(self, name):
+        return os.path.join(self.tmp_dir.name, name)
+    
+    def read_output(self, path):
+        with open(path) as output_file:
+            return output_file.read()
+    
+    def test_stop_and_resume_matches_uninterrupted_run(self):
+        """Test a job stopped part way and resumed writes the same output."""
+        source = self.write_images("clip", 60)
+        reference = BatchScoringJob(source, self.output_path("reference.csv"), synthetic_detector,
+                                    checkpoint_interval=10)
+        self.assertTrue(reference.run())
+        
+        job = BatchScoringJob(source, self.output_path("resumed.csv"), synthetic_detector, checkpoint_interval=10)
+        self.assertFalse(job.run(max_frames=25))
+        self.assertFalse(BatchScoringJob(source, job.output_path, synthetic_detector,
+                                         checkpoint_interval=10).run(max_frames=20))
+        self.assertTrue(BatchScoringJob(source, job.output_path, synthetic_detector, checkpoint_interval=10).run())
+        
+        expected = self.read_output(reference.output_path)
+        self.assertEqual(len(expected.splitlines()), 61)
+        self.assertEqual(self.read_output(job.output_path), expected)
+    
+    def test_crash_resumes_from_last_checkpoint(self):
+        """Test rows written after the last checkpoint are discarded and rescored after a crash."""
+        source = self.write_images("clip", 40)
+        reference = BatchScoringJob(source, self.output_path("reference.csv"), synthetic_detector)
+        reference.run()
+        
+        job = BatchScoringJob(source, self.output_path("crashed.csv"), lambda: CrashingDetector(27),
+                              checkpoint_interval=10)
+        with self.assertRaises(RuntimeError):
+            job.run()
+        with open(job.checkpoint_path) as checkpoint_file:
+            self.assertEqual(json.load(checkpoint_file)['frame_index'], 20)
+        
+        resumed = BatchScoringJob(source, job.output_path, synthetic_detector, checkpoint_interval=10)
+        self.assertTrue(resumed.run())
+        
+        self.assertEqual(resumed.frame_index, 40)
+        self.assertEqual(self.read_output(job.output_path), self.read_output(reference.output_path))
+    
+    def test_checkpoint_of_other_source_rejected(self):
+        """Test a checkpoint written for a different source is not resumed."""
+        first, second = self.write_images("first", 5), self.write_images("second", 5)
+        output = self.output_path("out.csv")
+        BatchScoringJob(first, output, synthetic_detector).run(max_frames=2)
+        
+        with self.assertRaises(ValueError):
+            BatchScoringJob(second, output, synthetic_detector).run()
+    
+    def test_manifest_tracks_jobs_across_restarts(self):
+        """Test a manifest reloaded from disk resumes unfinished files and skips finished ones."""
+        sources = [self.write_images(name, count) for name, count in (("a", 12), ("b", 30))]
+        manifest_path = self.output_path("manifest.json")
+        manifest = JobManifest(manifest_path, self.output_path("scores"))
+        self.assertEqual(manifest.add(sources), sources)
+        self.assertEqual(manifest.add(sources), [])
+        
+        counts = manifest.run(synthetic_detector, checkpoint_interval=5, max_frames=20)
+        self.assertEqual(counts, {'done': 1, 'running': 1})
+        
+        restarted = JobManifest(manifest_path, self.output_path("scores"))
+        self.assertEqual(restarted.pending(), [sources[1]])
+        self.assertEqual(restarted.run(synthetic_detector, checkpoint_interval=5), {'done': 2})
+        self.assertEqual(restarted.jobs[sources[1]]['frames'], 30)
+        self.assertEqual(len(self.read_output(restarted.jobs[sources[1]]['output']).splitlines()), 31)
+
+    def test_unreadable_image_fails_job(self):
+        """Test a corrupt image marks the job failed rather than done with a truncated output."""
+        source = self.write_images("clip", 10)
+        with open(os.path.join(source, "0004.png"), "wb") as image_file:
+            image_file.write(b"not an image")
+        manifest = JobManifest(self.output_path("manifest.json"), self.output_path("scores"))
+        manifest.add([source])
+        
+        self.assertEqual(manifest.run(synthetic_detector), {'failed': 1})
+        self.assertIn("Cannot read image", manifest.jobs[source]['error'])
+
+if __name__ == '__main__':
+    unittest.main()
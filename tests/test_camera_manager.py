@@ -66,6 +66,19 @@ class TestCameraManager(unittest.TestCase):
         self.assertEqual(width, 640)
         self.assertEqual(height, 480)
     
+    @patch('cv2.VideoCapture')
+    def test_set_fps(self, mock_video_capture):
+        """Test the frame rate the camera reports is kept."""
+        mock_cap = Mock()
+        mock_cap.isOpened.return_value = True
+        mock_cap.get.side_effect = [640, 480, 15.0]
+        mock_video_capture.return_value = mock_cap
+        
+        camera = CameraManager()
+        
+        self.assertEqual(camera.set_fps(5), 15.0)
+        self.assertEqual(camera.fps, 15.0)
+    
     @patch('cv2.VideoCapture')
     def test_release(self, mock_video_capture):
         """Test camera release."""
@@ -1,14 +1,20 @@
 import unittest
+import json
 import numpy as np
 import sys
 import os
-from unittest.mock import patch
+import tempfile
+from unittest.mock import Mock, patch
 
 # Add the src directory to the path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from concentration_detector import ConcentrationDetector
+from modules.landmark_features import gather_landmarks
 from tests.test_config import MockFaceLandmarks, MockFaceMeshProcessor
+from tests.test_head_pose_estimator import project_pose
+from modules.synthetic_landmarks import SyntheticFaceGenerator, concat_tracks
+from modules.detector_config import DetectorConfig
 
 class TestConcentrationDetectorIntegration(unittest.TestCase):
     """Integration tests for the complete ConcentrationDetector."""
@@ -68,6 +74,114 @@ class TestConcentrationDetectorIntegration(unittest.TestCase):
         self.assertEqual(status, "Eyes on screen")
         self.assertGreater(confidence, 0.8)
     
+    def test_is_concentrated_without_iris(self):
+        """Test open eyes without iris landmarks report a detection error."""
+        landmarks = MockFaceLandmarks({
+            159: (0.3, 0.4, 0.0), 145: (0.3, 0.45, 0.0),
+            133: (0.25, 0.425, 0.0), 33: (0.35, 0.425, 0.0),
+            386: (0.7, 0.4, 0.0), 374: (0.7, 0.45, 0.0),
+            362: (0.65, 0.425, 0.0), 263: (0.75, 0.425, 0.0)
+        })
+        
+        is_concentrated, status, confidence = self.detector.is_concentrated(
+            landmarks, 640, 480
+        )
+        
+        self.assertFalse(is_concentrated)
+        self.assertEqual(status, "Detection Error")
+    
+    def test_is_concentrated_batch(self):
+        """Test batched decisions match the per-face path."""
+        landmarks = MockFaceLandmarks({
+            159: (0.3, 0.4, 0.0), 145: (0.3, 0.45, 0.0),
+            133: (0.25, 0.425, 0.0), 33: (0.35, 0.425, 0.0),
+            386: (0.7, 0.4, 0.0), 374: (0.7, 0.45, 0.0),
+            362: (0.65, 0.425, 0.0), 263: (0.75, 0.425, 0.0),
+            468: (0.3, 0.425, 0.0), 473: (0.7, 0.425, 0.0)
+        })
+        points = np.stack([gather_landmarks(landmarks)] * 3)
+        
+        concentrated, rule_index, confidence = self.detector.is_concentrated_batch(points, 640, 480)
+        
+        expected = self.detector.is_concentrated(landmarks, 640, 480)
+        self.assertTrue(all(concentrated))
+        self.assertEqual(self.detector.rule_engine.reasons[rule_index[0]], expected[1])
+        self.assertAlmostEqual(confidence[0], expected[2])
+    
+    def test_head_pose_angles(self):
+        """Test solvePnP angles drive the tilt and head-turn rules when enabled."""
+        detector = ConcentrationDetector(use_head_pose_angles=True)
+        estimator = detector.head_pose_estimator
+        base = gather_landmarks(MockFaceLandmarks({
+            159: (0.3, 0.4, 0.0), 145: (0.3, 0.45, 0.0),
+            386: (0.7, 0.4, 0.0), 374: (0.7, 0.45, 0.0),
+            133: (0.25, 0.425, 0.0), 362: (0.65, 0.425, 0.0),
+            468: (0.3, 0.425, 0.0), 473: (0.7, 0.425, 0.0)
+        }))
+        
+        level = project_pose(estimator, 0, 0, 3, base=base)
+        tilted = project_pose(estimator, 0, 0, 25, base=base)
+        
+        self.assertNotEqual(detector.is_concentrated_points(level, 640, 480)[1], "Face Tilted")
+        self.assertEqual(detector.is_concentrated_points(tilted, 640, 480, face_id=1)[1], "Face Tilted")
+        
+        _, rule_index, _ = detector.is_concentrated_batch(np.stack([level, tilted]), 640, 480)
+        self.assertEqual(detector.rule_engine.reasons[rule_index[1]], "Face Tilted")
+        self.assertNotEqual(detector.rule_engine.reasons[rule_index[0]], "Face Tilted")
+    
+    def test_synthetic_sequences(self):
+        """Test per-face and batched decisions agree across generated scenarios."""
+        generator = SyntheticFaceGenerator(seed=5)
+        track = concat_tracks(generator.with_blinks(generator.steady(150), rate_per_minute=60),
+                              generator.gaze_sweep(150), generator.head_turn(150), generator.tilt(150),
+                              generator.glance_down(150))
+        faces = generator.render(track, noise=0.0005)
+        
+        expected = [self.detector.is_concentrated(results.multi_face_landmarks[0], 640, 480)
+                    for results in generator.to_results(faces)]
+        concentrated, rule_index, confidence = self.detector.is_concentrated_batch(
+            np.stack([gather_landmarks(face) for face in faces]), 640, 480)
+        
+        reasons = self.detector.rule_engine.reasons
+        self.assertEqual([(bool(c), reasons[i]) for c, i in zip(concentrated, rule_index)],
+                         [result[:2] for result in expected])
+        np.testing.assert_allclose(confidence, [result[2] for result in expected])
+        self.assertTrue({"Eyes Closed", "Eyes on screen", "Face Tilted", "Looking Down"}
+                        <= {result[1] for result in expected})
+    
+    def test_eye_state_from_processed_frames(self):
+        """Test process_frame keeps blink and PERCLOS statistics per face."""
+        generator = SyntheticFaceGenerator(seed=2)
+        track = generator.with_blinks(generator.steady(300), rate_per_minute=30)
+        results = generator.to_results(generator.render(track))
+        self.detector.face_processor.process_frame = lambda frame: next(results)
+        frame = np.zeros((48, 64, 3), dtype=np.uint8)
+        
+        for i in range(300):
+            self.detector.process_frame(frame, capture_time=i / 30)
+        
+        state = self.detector.get_eye_state(0)
+        self.assertGreater(state.blink_count, 0)
+        self.assertGreater(state.perclos[60.0], 0)
+        self.assertLess(state.perclos[60.0], 0.2)
+        self.assertIsNone(self.detector.get_eye_state(1))
+    
+    def test_attention_heatmap(self):
+        """Test processed frames accumulate gaze points, lower while glancing down."""
+        generator = SyntheticFaceGenerator(seed=4)
+        track = concat_tracks(generator.steady(90), generator.glance_down(120, period=8.0))
+        results = generator.to_results(generator.render(track))
+        self.detector.face_processor.process_frame = lambda frame: next(results)
+        heatmap = self.detector.enable_attention_heatmap(bins=(10, 10))
+        frame = np.zeros((48, 64, 3), dtype=np.uint8)
+        
+        statuses = [self.detector.process_frame(frame, capture_time=i / 30)[1] for i in range(210)]
+        
+        self.assertEqual(heatmap.total, 210)
+        self.assertGreater(heatmap.counts[4:6].sum(), 100)  # vertical ratio around 0.5
+        self.assertGreater(heatmap.counts[8:].sum(), 10)  # near the lower lid
+        self.assertIn("Not Concentrated (Looking Down)", statuses)
+    
     @patch('cv2.flip')
     @patch('cv2.cvtColor')
     def test_process_frame_no_face(self, mock_cvt_color, mock_flip):
@@ -84,6 +198,247 @@ class TestConcentrationDetectorIntegration(unittest.TestCase):
         self.assertEqual(color, (0, 0, 255))  # Red
         self.assertEqual(confidence, 0.0)
     
+    def test_process_frame_with_filter_and_stride(self):
+        """Test strided inference reuses predicted landmarks between Face Mesh calls."""
+        landmarks = MockFaceLandmarks({
+            159: (0.3, 0.4, 0.0), 145: (0.3, 0.45, 0.0),
+            133: (0.25, 0.425, 0.0), 33: (0.35, 0.425, 0.0),
+            386: (0.7, 0.4, 0.0), 374: (0.7, 0.45, 0.0),
+            362: (0.65, 0.425, 0.0), 263: (0.75, 0.425, 0.0),
+            468: (0.3, 0.425, 0.0), 473: (0.7, 0.425, 0.0)
+        })
+        detector = ConcentrationDetector(landmark_filtering=True, inference_stride=2)
+        detector.face_processor.process_frame = Mock(return_value=Mock(multi_face_landmarks=[landmarks]))
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        
+        for i in range(4):
+            _, status, color, _ = detector.process_frame(frame, capture_time=i / 30)
+        
+        self.assertEqual(detector.face_processor.process_frame.call_count, 2)
+        self.assertEqual(status, "Concentrated (Eyes on screen)")
+        self.assertEqual(color, (0, 255, 0))
+    
+    def test_requested_profile_starts_on_next_frame(self):
+        """Test a profile request is picked up by process_frame on the processing thread."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "detector.collapsed")
+            self.detector.request_profile(duration=30, output_path=path)
+            self.assertIsNone(self.detector.profiler)
+            
+            frame = np.zeros((48, 64, 3), dtype=np.uint8)
+            self.detector.process_frame(frame)
+            self.assertTrue(self.detector.profiler.running)
+            
+            self.assertEqual(self.detector.stop_profiling(), path)
+            self.assertTrue(os.path.exists(path))
+            self.assertIsNone(self.detector.stop_profiling())
+    
+    def test_transition_events(self):
+        """Test process_frame feeds the event stream and cleanup flushes it."""
+        events = []
+        stream = self.detector.enable_events(min_duration=0.0, callback=events.append)
+        frame = np.zeros((48, 64, 3), dtype=np.uint8)
+        
+        for index in range(3):
+            self.detector.process_frame(frame, timestamp=100 + index)
+        self.assertEqual(stream.state, "Not Concentrated (No Face Detected)")
+        self.assertEqual(events, [])
+        
+        self.detector.cleanup()
+        self.assertEqual(len(events), 1)
+        self.assertIsNone(events[0].next_state)
+        # Episodes are timed on the frame clock, up to the last frame
+        self.assertEqual((events[0].start_time, events[0].end_time), (100, 102))
+    
+    def test_apply_config(self):
+        """Test new thresholds are pushed into the analyzers while smoothing state is kept."""
+        for _ in range(10):
+            self.detector.smoother.smooth_result(True)
+        
+        changed = self.detector.apply_config(self.detector.config._replace(ear_threshold=0.2, history_size=8))
+        
+        self.assertEqual(changed, ['ear_threshold', 'history_size'])
+        self.assertEqual(self.detector.eye_analyzer.ear_threshold, 0.2)
+        self.assertEqual(self.detector.get_rule_params()['ear_threshold'], 0.2)
+        self.assertEqual(len(self.detector.smoother.concentration_history), 8)
+        self.assertEqual(self.detector.face_processor.rebuilds, 0)
+        
+        self.detector.apply_config(self.detector.config._replace(detection_confidence=0.5))
+        self.assertEqual(self.detector.face_processor.rebuilds, 1)
+        self.assertEqual(self.detector.apply_config(self.detector.config), [])
+    
+    def test_config_reload_keeps_quality_level(self):
+        """Test a Face Mesh rebuild from a config edit keeps the quality controller's refine setting."""
+        processor = self.detector.face_processor
+        processor.set_refine_landmarks = Mock()
+        processor.reconfigure = Mock(return_value=True)
+        self.detector.set_quality(inference_scale=0.5, refine_landmarks=False)
+        
+        self.detector.apply_config(self.detector.config._replace(detection_confidence=0.6))
+        
+        processor.reconfigure.assert_called_once_with(0.6, self.detector.config.tracking_confidence, False)
+        self.assertEqual(self.detector.inference_scale, 0.5)
+        
+        self.detector.apply_config(self.detector.config._replace(refine_landmarks=False))
+        self.detector.apply_config(self.detector.config._replace(refine_landmarks=True))
+        self.assertTrue(processor.reconfigure.call_args.args[2])
+        self.assertTrue(self.detector.refine_landmarks)
+    
+    def test_requested_config_applied_between_frames(self):
+        """Test a requested config takes effect at the next processed frame."""
+        self.detector.request_config(DetectorConfig(gaze_ratio_threshold=0.6))
+        self.assertEqual(self.detector.concentration_analyzer.gaze_ratio_threshold, 0.55)
+        
+        self.detector.process_frame(np.zeros((48, 64, 3), dtype=np.uint8))
+        
+        self.assertEqual(self.detector.concentration_analyzer.gaze_ratio_threshold, 0.6)
+        with self.assertRaises(ValueError):
+            self.detector.request_config(DetectorConfig(vote_window=0))
+    
+    def test_from_config(self):
+        """Test a detector can be created from a config."""
+        detector = ConcentrationDetector.from_config(DetectorConfig(ear_threshold=0.21, yaw_threshold=25.0))
+        
+        self.assertEqual(detector.eye_analyzer.ear_threshold, 0.21)
+        self.assertEqual(detector.head_analyzer.yaw_threshold, 25.0)
+        self.assertEqual(detector.config.ear_threshold, 0.21)
+    
+    def test_synthetic_landmark_backend(self):
+        """Test the stub backend drives the whole pipeline without Face Mesh."""
+        detector = ConcentrationDetector.from_config(DetectorConfig(landmark_backend="synthetic"))
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        
+        statuses = {detector.process_frame(frame)[1] for _ in range(300)}
+        
+        self.assertIsNone(detector.face_processor)
+        self.assertTrue(any(status.startswith("Concentrated") for status in statuses))
+        self.assertTrue(any(status.startswith("Not Concentrated") for status in statuses))
+    
+    def test_state_round_trip(self):
+        """Test a detector restored from get_state() continues exactly like the original."""
+        def make_detector():
+            return ConcentrationDetector.from_config(DetectorConfig(landmark_backend="synthetic", history_size=20),
+                                                     landmark_filtering=True, use_head_pose_angles=True)
+        original, restored = make_detector(), make_detector()
+        frame = np.zeros((48, 64, 3), dtype=np.uint8)
+        for index in range(50):
+            original.process_frame(frame, timestamp=index / 30)
+        
+        restored.set_state(json.loads(json.dumps(original.get_state())))
+        
+        for index in range(50, 100):
+            expected = original.process_frame(frame, timestamp=index / 30)
+            actual = restored.process_frame(frame, timestamp=index / 30)
+            self.assertEqual(actual[1:], expected[1:])
+        self.assertEqual(restored.config.history_size, 20)
+    
+    def test_snapshot_migrates_session(self):
+        """Test a session restored from a snapshot on another clock continues like the original."""
+        def make_detector():
+            detector = ConcentrationDetector.from_config(DetectorConfig(landmark_backend="synthetic"),
+                                                         landmark_filtering=True, use_head_pose_angles=True)
+            detector.enable_events(min_duration=0.0)
+            detector.enable_attention_heatmap()
+            return detector
+        original, migrated = make_detector(), make_detector()
+        events = {id(original): [], id(migrated): []}
+        for detector in (original, migrated):
+            detector.event_stream.subscribe(events[id(detector)].append)
+        frame = np.zeros((48, 64, 3), dtype=np.uint8)
+        for index in range(600):
+            original.process_frame(frame, timestamp=1000 + index / 30)
+        
+        data = original.snapshot(timestamp=1000 + 600 / 30)
+        migrated.restore(data, timestamp=5 + 600 / 30)
+        events[id(original)].clear()
+        
+        self.assertLess(len(data), 16384)
+        self.assertEqual(migrated.get_eye_state(0).blink_count, original.get_eye_state(0).blink_count)
+        for index in range(600, 900):
+            expected = original.process_frame(frame, timestamp=1000 + index / 30)
+            actual = migrated.process_frame(frame, timestamp=5 + index / 30)
+            # Shifted timestamps change filter time steps by rounding error only
+            self.assertEqual(actual[1:3], expected[1:3])
+            self.assertAlmostEqual(actual[3], expected[3], places=9)
+        original_eyes, migrated_eyes = original.get_eye_state(0), migrated.get_eye_state(0)
+        self.assertEqual(migrated_eyes.blink_count, original_eyes.blink_count)
+        for window, perclos in original_eyes.perclos.items():
+            self.assertAlmostEqual(migrated_eyes.perclos[window], perclos)
+        self.assertEqual([event.state for event in events[id(migrated)]],
+                         [event.state for event in events[id(original)]])
+        for moved, event in zip(events[id(migrated)], events[id(original)]):
+            self.assertAlmostEqual(moved.start_time + 995, event.start_time, places=6)
+            self.assertAlmostEqual(moved.duration, event.duration, places=6)
+        np.testing.assert_array_equal(migrated.attention_heatmap.counts, original.attention_heatmap.counts)
+    
+    def test_restore_enables_saved_components(self):
+        """Test restoring into a plain detector enables events, motion gating and the heatmap."""
+        original = ConcentrationDetector.from_config(DetectorConfig(landmark_backend="synthetic"))
+        original.enable_events(min_duration=0.0)
+        original.enable_motion_gating()
+        original.enable_attention_heatmap(bins=(8, 6), x_range=(-1.0, 2.0))
+        frame = np.zeros((48, 64, 3), dtype=np.uint8)
+        for index in range(60):
+            original.process_frame(frame, timestamp=index / 30)
+        
+        restored = ConcentrationDetector.from_config(DetectorConfig(landmark_backend="synthetic"))
+        restored.restore(original.snapshot(timestamp=2.0), timestamp=2.0)
+        
+        self.assertEqual(restored.event_stream.state, original.event_stream.state)
+        self.assertEqual(restored.motion_gate.get_state(), original.motion_gate.get_state())
+        self.assertEqual(restored.attention_heatmap.x_range, (-1.0, 2.0))
+        np.testing.assert_array_equal(restored.attention_heatmap.counts, original.attention_heatmap.counts)
+    
+    def test_strided_frames_advance_landmark_backend(self):
+        """Test frames that reuse landmarks still advance the backend, so replays keep their place."""
+        backend = Mock(uses_pixels=False)
+        backend.detect.return_value = [gather_landmarks(MockFaceLandmarks())]
+        self.detector.set_landmark_backend(backend)
+        self.detector.set_quality(inference_stride=3)
+        frame = np.zeros((48, 64, 3), dtype=np.uint8)
+        
+        for _ in range(6):
+            self.detector.process_frame(frame)
+        
+        self.assertEqual((backend.detect.call_count, backend.skip_frame.call_count), (2, 4))
+    
+    def test_restore_rejects_invalid_snapshot(self):
+        """Test data that is not a snapshot raises ValueError and leaves the detector untouched."""
+        with self.assertRaises(ValueError):
+            self.detector.restore(b'not a snapshot')
+        self.assertEqual(self.detector.smoother.concentration_history, [])
+    
+    def test_config_switches_landmark_backend(self):
+        """Test changing the backend in the config replaces and cleans up the old one."""
+        old_backend = self.detector.landmark_backend
+        old_backend.cleanup = Mock()
+        
+        self.detector.apply_config(self.detector.config._replace(landmark_backend="synthetic"))
+        
+        old_backend.cleanup.assert_called_once()
+        self.assertFalse(self.detector.landmark_backend.uses_pixels)
+        _, status, _, _ = self.detector.process_frame(np.zeros((48, 64, 3), dtype=np.uint8))
+        self.assertNotEqual(status, "No Face Detected")
+    
+    def test_motion_gating_skips_still_frames(self):
+        """Test Face Mesh only runs again once the scene changes."""
+        calls = []
+        original = self.detector.face_processor.process_frame
+        self.detector.face_processor.process_frame = lambda frame: calls.append(frame) or original(frame)
+        gate = self.detector.enable_motion_gating(still_interval=60.0)
+        
+        still = np.full((240, 320, 3), 90, dtype=np.uint8)
+        for _ in range(5):
+            _, status, _, _ = self.detector.process_frame(still)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(status, "No Face Detected")
+        
+        moved = still.copy()
+        moved[50:150, 50:150] = 250
+        self.detector.process_frame(moved)
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(gate.get_stats()['skipped_frames'], 4)
+    
     def test_reset_history(self):
         """Test resetting detection history."""
         # Add some history
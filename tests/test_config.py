@@ -23,7 +23,11 @@ class MockFaceLandmarks:
 # Mock the import for integration tests
 class MockFaceMeshProcessor:
     def __init__(self, *args, **kwargs):
-        pass
+        self.rebuilds = 0
+    
+    def reconfigure(self, detection_confidence, tracking_confidence, refine_landmarks):
+        self.rebuilds += 1
+        return True
     
     def process_frame(self, frame):
         mock_results = Mock()
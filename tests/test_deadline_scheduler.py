@@ -0,0 +1,150 @@
+import unittest
+import time
+import numpy as np
+import sys
+import os
+
+# Add the src directory to the path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from modules.deadline_scheduler import DeadlineScheduler
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+class FakeDetector:
+    """Records processed frames and advances the fake clock by a fixed cost."""
+    
+    def __init__(self, clock, cost, first_cost=None):
+        self.clock = clock
+        self.cost = cost
+        self.first_cost = first_cost
+        self.frames = []
+    
+    def process_frame(self, frame, capture_time=None):
+        self.frames.append(int(frame[0, 0, 0]))
+        self.clock.now += self.first_cost if len(self.frames) == 1 and self.first_cost else self.cost
+        return frame, "Concentrated", (0, 255, 0), 1.0
+
+def frame(value):
+    return np.full((4, 4, 3), value, dtype=np.uint8)
+
+class TestDeadlineScheduler(unittest.TestCase):
+    """Test cases for DeadlineScheduler class."""
+    
+    def setUp(self):
+        self.clock = FakeClock()
+        self.scheduler = DeadlineScheduler(clock=self.clock)
+    
+    def test_earliest_deadline_first(self):
+        """Test frames within a priority class run in deadline order, not arrival order."""
+        detectors = {stream_id: FakeDetector(self.clock, 0.001) for stream_id in (1, 2)}
+        self.scheduler.add_stream(1, detectors[1], deadline=0.5)
+        self.scheduler.add_stream(2, detectors[2], deadline=0.1)
+        
+        self.scheduler.submit(1, frame(1))
+        self.scheduler.submit(2, frame(2))
+        order = [self.scheduler.step().stream_id for _ in range(2)]
+        
+        self.assertEqual(order, [2, 1])
+        self.assertIsNone(self.scheduler.step())
+    
+    def test_frames_that_would_miss_deadline_are_shed(self):
+        """Test a frame is dropped before inference once its stream's service time would overrun it."""
+        detector = FakeDetector(self.clock, 0.04)
+        self.scheduler.add_stream(1, detector, deadline=0.1, max_pending=10)
+        for value in range(3):
+            self.scheduler.submit(1, frame(value))
+        
+        results = [self.scheduler.step() for _ in range(3)]
+        
+        # Frame 2 starts at 0.08 and would finish at 0.12, past its 0.1 deadline
+        self.assertEqual(detector.frames, [0, 1])
+        self.assertIsNone(results[2])
+        stats = self.scheduler.get_stats()[1]
+        self.assertEqual((stats.completed, stats.on_time, stats.expired), (2, 2, 1))
+        self.assertAlmostEqual(stats.on_time_ratio, 2 / 3)
+    
+    def test_slow_first_frame_does_not_starve_stream(self):
+        """Test a stream whose first frame overran its deadline is probed again instead of expiring forever."""
+        detector = FakeDetector(self.clock, 0.001, first_cost=0.15)
+        self.scheduler.add_stream(1, detector, deadline=0.1)
+        
+        for index in range(60):
+            self.clock.now = max(self.clock.now, index / 30)
+            self.scheduler.submit(1, frame(index), capture_time=self.clock.now)
+            self.scheduler.step()
+        
+        stats = self.scheduler.get_stats()[1]
+        self.assertEqual(stats.expired, 10)
+        self.assertEqual(stats.on_time, 49)
+        self.assertAlmostEqual(stats.service_time, 0.001)
+    
+    def test_priority_class_protected_under_overload(self):
+        """Test overload is shed from the low priority stream while the high priority one stays on time."""
+        detectors = {stream_id: FakeDetector(self.clock, 0.02) for stream_id in (1, 2)}
+        self.scheduler.add_stream(1, detectors[1], deadline=0.05, priority=0)
+        self.scheduler.add_stream(2, detectors[2], deadline=0.05, priority=1)
+        
+        # Both streams at 30 FPS, but the worker can only serve about one and a half
+        for index in range(60):
+            self.clock.now = max(self.clock.now, index / 30)
+            for stream_id in (1, 2):
+                self.scheduler.submit(stream_id, frame(index), capture_time=index / 30)
+            while self.scheduler.step() is not None and self.clock.now < (index + 1) / 30:
+                pass
+        
+        stats = self.scheduler.get_stats()
+        self.assertEqual(stats[1].on_time_ratio, 1.0)
+        self.assertLess(stats[2].on_time_ratio, 0.8)
+        self.assertGreater(stats[2].expired + stats[2].superseded, 0)
+        self.assertEqual(stats[2].late, 0)
+    
+    def test_newer_frames_supersede_oldest(self):
+        """Test a stream keeps at most max_pending queued frames."""
+        detector = FakeDetector(self.clock, 0.001)
+        self.scheduler.add_stream(1, detector, deadline=1.0, max_pending=2)
+        for value in range(4):
+            self.scheduler.submit(1, frame(value))
+        
+        while self.scheduler.step() is not None:
+            pass
+        
+        self.assertEqual(detector.frames, [2, 3])
+        self.assertEqual(self.scheduler.get_stats()[1].superseded, 2)
+    
+    def test_invalid_stream_settings(self):
+        """Test invalid deadlines, priorities and duplicate streams raise ValueError."""
+        detector = FakeDetector(self.clock, 0.0)
+        with self.assertRaises(ValueError):
+            self.scheduler.add_stream(1, detector, deadline=0)
+        with self.assertRaises(ValueError):
+            self.scheduler.add_stream(1, detector, priority=-1)
+        self.scheduler.add_stream(1, detector)
+        with self.assertRaises(ValueError):
+            self.scheduler.add_stream(1, detector)
+    
+    def test_worker_thread_publishes_results(self):
+        """Test the worker thread processes submitted frames and reports each result."""
+        results = []
+        scheduler = DeadlineScheduler(callback=results.append).start()
+        self.addCleanup(scheduler.stop)
+        detector = FakeDetector(FakeClock(), 0.0)
+        scheduler.add_stream(7, detector, deadline=1.0)
+        
+        scheduler.submit(7, frame(5))
+        deadline = time.monotonic() + 5.0
+        while not results and time.monotonic() < deadline:
+            time.sleep(0.01)
+        
+        self.assertEqual(len(results), 1)
+        self.assertTrue(results[0].on_time)
+        self.assertEqual(scheduler.get_latest(7).sequence, 1)
+        self.assertEqual(detector.frames, [5])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import unittest
+import json
+import os
+import sys
+import tempfile
+from unittest.mock import Mock
+
+# Add the src directory to the path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from modules.detector_config import DetectorConfig, ConfigWatcher, load_config
+
+class TestDetectorConfig(unittest.TestCase):
+    """Test cases for DetectorConfig, load_config and ConfigWatcher."""
+    
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.path = os.path.join(self.tmpdir.name, "detector.json")
+    
+    def write(self, data):
+        with open(self.path, "w") as config_file:
+            json.dump(data, config_file)
+    
+    def test_defaults_are_valid(self):
+        """Test the default config validates and matches the detector defaults."""
+        config = DetectorConfig().validate()
+        self.assertEqual(config.ear_threshold, 0.25)
+        self.assertEqual(config.history_size, 30)
+    
+    def test_validation_lists_all_errors(self):
+        """Test every invalid setting is reported."""
+        config = DetectorConfig(detection_confidence=1.5, ear_threshold=0, history_size=3, vote_window=5)
+        
+        with self.assertRaises(ValueError) as context:
+            config.validate()
+        message = str(context.exception)
+        self.assertIn("detection_confidence", message)
+        self.assertIn("ear_threshold", message)
+        self.assertIn("history_size", message)
+    
+    def test_file_and_environment(self):
+        """Test file values override defaults and environment values override the file."""
+        self.write({"ear_threshold": 0.22, "history_size": 60, "refine_landmarks": False})
+        env = {"GAZECRAZE_HISTORY_SIZE": "45", "GAZECRAZE_REFINE_LANDMARKS": "yes"}
+        
+        config = load_config(self.path, env=env)
+        
+        self.assertEqual(config.ear_threshold, 0.22)
+        self.assertEqual(config.history_size, 45)
+        self.assertIsInstance(config.history_size, int)
+        self.assertTrue(config.refine_landmarks)
+    
+    def test_rejects_bad_input(self):
+        """Test unknown keys, wrong types and invalid values are rejected."""
+        self.write({"ear_treshold": 0.2})
+        with self.assertRaises(ValueError):
+            load_config(self.path, env={})
+        
+        with self.assertRaises(ValueError):
+            load_config(env={"GAZECRAZE_VOTE_WINDOW": "2.5"})
+        with self.assertRaises(ValueError):
+            load_config(env={"GAZECRAZE_REFINE_LANDMARKS": "maybe"})
+        with self.assertRaises(ValueError):
+            load_config(env={"GAZECRAZE_INFERENCE_SCALE": "0"})
+        with self.assertRaises(ValueError):
+            load_config(env={"GAZECRAZE_LANDMARK_BACKEND": "dlib"})
+        with self.assertRaises(ValueError):
+            load_config(env={"GAZECRAZE_LANDMARK_BACKEND": "replay"})
+    
+    def test_landmark_backend_from_environment(self):
+        """Test the landmark backend and its source are read as strings."""
+        config = load_config(env={"GAZECRAZE_LANDMARK_BACKEND": "replay",
+                                  "GAZECRAZE_LANDMARK_SOURCE": "session.npz"})
+        self.assertEqual((config.landmark_backend, config.landmark_source), ("replay", "session.npz"))
+    
+    def test_changed_fields(self):
+        """Test changed settings are listed by name."""
+        changed = DetectorConfig(ear_threshold=0.2, refine_landmarks=False).changed_fields(DetectorConfig())
+        self.assertEqual(changed, ['refine_landmarks', 'ear_threshold'])
+    
+    def test_watcher_hands_over_valid_changes(self):
+        """Test the watcher passes new configs on and ignores invalid edits."""
+        self.write({"ear_threshold": 0.25})
+        detector = Mock()
+        watcher = ConfigWatcher(self.path, detector)
+        self.assertFalse(watcher.check())
+        
+        self.write({"ear_threshold": 0.2})
+        os.utime(self.path, ns=(1, 10 ** 18))
+        self.assertTrue(watcher.check())
+        self.assertEqual(detector.request_config.call_args[0][0].ear_threshold, 0.2)
+        
+        self.write({"ear_threshold": -1})
+        os.utime(self.path, ns=(1, 2 * 10 ** 18))
+        self.assertFalse(watcher.check())
+        self.assertEqual(detector.request_config.call_count, 1)
+
+if __name__ == '__main__':
+    unittest.main()
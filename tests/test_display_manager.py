@@ -4,6 +4,7 @@ import sys
 import os
 from unittest.mock import patch
 import time
+import cv2
 
 # Add the src directory to the path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
@@ -52,3 +53,50 @@ class TestDisplayManager(unittest.TestCase):
         
         # Should be called twice (FPS and instructions)
         self.assertEqual(mock_put_text.call_count, 2)
+    
+    def test_overlay_matches_put_text(self):
+        """Test cached text produces the same pixels as drawing with cv2.putText."""
+        frame = np.full((480, 640, 3), 40, dtype=np.uint8)
+        expected = frame.copy()
+        cv2.putText(expected, "Eyes on screen", (30, 50), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 0), 2)
+        cv2.putText(expected, "Confidence: 0.85", (30, 80), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
+        
+        self.display.draw_status(frame, "Eyes on screen", (0, 255, 0), 0.85)
+        
+        np.testing.assert_array_equal(frame, expected)
+    
+    def test_unchanged_text_not_rerendered(self):
+        """Test repeated frames reuse sprites instead of calling cv2.putText."""
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        self.display.draw_status(frame, "Eyes on screen", (0, 255, 0), 0.85)
+        self.display.draw_info(frame, 480)
+        
+        with patch('cv2.putText') as mock_put_text:
+            for _ in range(10):
+                self.display.draw_status(frame, "Eyes on screen", (0, 255, 0), 0.85)
+                self.display.draw_info(frame, 480)
+        
+        mock_put_text.assert_not_called()
+    
+    def test_numeric_text_throttled(self):
+        """Test confidence text only refreshes once per refresh interval."""
+        display = DisplayManager(text_refresh_interval=60.0)
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        
+        display.draw_status(frame, "Eyes on screen", (0, 255, 0), 0.85)
+        display.draw_status(frame, "Eyes on screen", (0, 255, 0), 0.91)
+        self.assertEqual(display._confidence_text, "Confidence: 0.85")
+        
+        display.text_refresh_interval = 0.0
+        display.draw_status(frame, "Eyes on screen", (0, 255, 0), 0.91)
+        self.assertEqual(display._confidence_text, "Confidence: 0.91")
+    
+    def test_text_clipped_at_frame_edge(self):
+        """Test text partly outside the frame is clipped instead of failing."""
+        frame = np.zeros((40, 60, 3), dtype=np.uint8)
+        expected = frame.copy()
+        cv2.putText(expected, "Looking Right", (30, 50), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 255), 2)
+        
+        self.display.renderer.draw_text(frame, "Looking Right", (30, 50), 0.8, (0, 0, 255), 2)
+        
+        np.testing.assert_array_equal(frame, expected)
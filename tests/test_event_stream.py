@@ -0,0 +1,114 @@
+import unittest
+import os
+import sys
+
+# Add the src directory to the path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from modules.event_stream import TransitionEventStream, state_label
+
+FPS = 30
+
+class TestEventStream(unittest.TestCase):
+    """Test cases for TransitionEventStream class."""
+    
+    def setUp(self):
+        self.events = []
+        self.stream = TransitionEventStream(min_duration=1.0)
+        self.stream.subscribe(self.events.append)
+        self.time = 0.0
+    
+    def feed(self, concentrated, reason, seconds, confidence=0.8):
+        for _ in range(int(round(seconds * FPS))):
+            self.stream.update(concentrated, reason, confidence, self.time)
+            self.time += 1 / FPS
+    
+    def test_state_label(self):
+        """Test state labels match the status line."""
+        self.assertEqual(state_label(False, "Eyes on left"), "Not Concentrated (Eyes on left)")
+        self.assertEqual(state_label(True, "Eyes on screen", include_reason=False), "Concentrated")
+    
+    def test_emits_only_on_transitions(self):
+        """Test a steady state produces no events and a lasting change produces one."""
+        self.feed(True, "Eyes on screen", 10, confidence=0.9)
+        self.assertEqual(self.events, [])
+        
+        self.feed(False, "Eyes on left", 2, confidence=0.4)
+        
+        self.assertEqual(len(self.events), 1)
+        event = self.events[0]
+        self.assertEqual(event.state, "Concentrated (Eyes on screen)")
+        self.assertEqual(event.next_state, "Not Concentrated (Eyes on left)")
+        self.assertAlmostEqual(event.start_time, 0.0)
+        self.assertAlmostEqual(event.end_time, 10.0, places=6)
+        self.assertAlmostEqual(event.duration, 10.0, places=6)
+        self.assertAlmostEqual(event.mean_confidence, 0.9)
+        self.assertEqual(self.stream.state, "Not Concentrated (Eyes on left)")
+    
+    def test_short_excursions_debounced(self):
+        """Test changes shorter than min_duration are folded into the current episode."""
+        for _ in range(5):
+            self.feed(True, "Eyes on screen", 2, confidence=1.0)
+            self.feed(False, "Eyes Closed", 0.5, confidence=0.0)
+        
+        self.assertEqual(self.events, [])
+        event = self.stream.flush(self.time)
+        self.assertAlmostEqual(event.duration, 12.5, places=6)
+        self.assertAlmostEqual(event.mean_confidence, 0.8)
+        self.assertIsNone(event.next_state)
+    
+    def test_cooldown_delays_next_transition(self):
+        """Test a transition within the cooldown is only emitted once the cooldown has passed."""
+        stream = TransitionEventStream(min_duration=0.5, cooldown=5.0, include_reason=False, queue_size=10)
+        emitted_at = []
+        t = 0.0
+        for concentrated, seconds in [(True, 2), (False, 1), (True, 10)]:
+            for _ in range(seconds * FPS):
+                if stream.update(concentrated, "", 0.5, t) is not None:
+                    emitted_at.append(t)
+                t += 1 / FPS
+        
+        events = [stream.events.get_nowait() for _ in range(stream.events.qsize())]
+        self.assertEqual([event.state for event in events], ["Concentrated", "Not Concentrated"])
+        self.assertAlmostEqual(events[1].end_time, 3.0, places=6)
+        self.assertAlmostEqual(events[1].duration, 1.0, places=6)
+        self.assertGreaterEqual(emitted_at[1] - emitted_at[0], 5.0)
+    
+    def test_state_round_trip_with_time_offset(self):
+        """Test restored episodes and cooldown are shifted onto the new clock."""
+        stream = TransitionEventStream(min_duration=0.0, cooldown=5.0)
+        stream.update(True, "", 1.0, 10.0)
+        stream.update(False, "", 1.0, 12.0)
+        
+        restored = TransitionEventStream(min_duration=0.0, cooldown=5.0)
+        restored.set_state(stream.get_state(), time_offset=-10.0)
+        
+        self.assertIsNone(restored.update(True, "", 1.0, 6.0))   # 4s after the last event
+        event = restored.update(True, "", 1.0, 7.0)
+        self.assertEqual((event.state, event.start_time, event.end_time), ("Not Concentrated", 2.0, 6.0))
+    
+    def test_queue_overflow_counted(self):
+        """Test events that do not fit the queue are counted as dropped."""
+        stream = TransitionEventStream(min_duration=0.0, queue_size=1)
+        for i in range(4):
+            stream.update(i % 2 == 0, "", 0.5, float(i))
+        
+        self.assertEqual(stream.events.qsize(), 1)
+        self.assertEqual(stream.dropped_events, 2)
+    
+    def test_failing_callback_does_not_break_stream(self):
+        """Test an exception in one callback does not stop delivery to others."""
+        def failing(event):
+            raise RuntimeError("consumer down")
+        stream = TransitionEventStream(min_duration=0.0)
+        received = []
+        stream.subscribe(failing)
+        stream.subscribe(received.append)
+        
+        stream.update(True, "", 1.0, 0.0)
+        stream.update(False, "", 1.0, 1.0)
+        
+        self.assertEqual(len(received), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+import unittest
+import numpy as np
+import sys
+import os
+
+# Add the src directory to the path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from modules.eye_state_engine import EyeStateTracker, EyeStateEngine
+
+FPS = 30
+
+class TestEyeStateEngine(unittest.TestCase):
+    """Test cases for EyeStateTracker and EyeStateEngine."""
+    
+    def setUp(self):
+        self.tracker = EyeStateTracker(close_threshold=0.2, open_threshold=0.25, windows=(60.0, 300.0))
+        self.time = 0.0
+    
+    def feed(self, ears):
+        events = []
+        for ear in ears:
+            event = self.tracker.update(ear, ear, self.time)
+            if event is not None:
+                events.append(event)
+            self.time += 1 / FPS
+        return events
+    
+    def test_blink_detected(self):
+        """Test a short closure produces one blink event with its duration."""
+        events = self.feed([0.3] * 30 + [0.1] * 6 + [0.3] * 30)
+        
+        self.assertEqual(len(events), 1)
+        self.assertAlmostEqual(events[0].duration, 6 / FPS, places=6)
+        self.assertAlmostEqual(events[0].min_ear, 0.1)
+        self.assertFalse(events[0].long_closure)
+        self.assertEqual(self.tracker.blink_count, 1)
+    
+    def test_hysteresis(self):
+        """Test EAR hovering between the thresholds does not split a blink."""
+        events = self.feed([0.3] * 10 + [0.15, 0.22, 0.18, 0.23, 0.16, 0.3] + [0.3] * 10)
+        
+        self.assertEqual(len(events), 1)
+    
+    def test_long_closure_not_counted_as_blink(self):
+        """Test closures longer than a blink are reported but excluded from the blink rate."""
+        events = self.feed([0.3] * 10 + [0.05] * 60 + [0.3] * 10)
+        
+        self.assertTrue(events[0].long_closure)
+        self.assertEqual(self.tracker.blink_count, 0)
+    
+    def test_perclos_windows(self):
+        """Test PERCLOS per window follows the share of time with eyes closed."""
+        # 2 minutes open, then 1 minute at 30% closure
+        self.feed([0.3] * (FPS * 120))
+        pattern = [0.05] * 9 + [0.3] * 21
+        self.feed(pattern * 60)
+        
+        state = self.tracker.state()
+        self.assertAlmostEqual(state.perclos[60.0], 0.3, delta=0.02)
+        self.assertAlmostEqual(state.perclos[300.0], 0.1, delta=0.02)
+    
+    def test_blink_rate(self):
+        """Test blink rate is reported per minute over each window."""
+        blink = [0.1] * 6 + [0.3] * 54     # one blink every 2 seconds
+        self.feed(blink * 90)               # 3 minutes
+        
+        state = self.tracker.state()
+        self.assertAlmostEqual(state.blink_rate[60.0], 30, delta=1.5)
+        self.assertAlmostEqual(state.blink_rate[300.0], 30, delta=1.5)
+        self.assertEqual(state.blink_count, 90)
+    
+    def test_window_slides(self):
+        """Test old closures leave the short window but stay in the long one."""
+        self.feed([0.05] * (FPS * 30) + [0.3] * (FPS * 90))
+        
+        state = self.tracker.state()
+        self.assertAlmostEqual(state.perclos[60.0], 0.0)
+        self.assertAlmostEqual(state.perclos[300.0], 0.25, delta=0.01)
+    
+    def test_ring_grows_with_frame_rate(self):
+        """Test high frame rates keep the full window instead of losing samples."""
+        tracker = EyeStateTracker(close_threshold=0.2, windows=(60.0,))
+        for i in range(200 * 60):
+            tracker.update(0.1 if i % 2 else 0.3, 0.1 if i % 2 else 0.3, i / 200)
+        
+        self.assertAlmostEqual(tracker.state().perclos[60.0], 0.5, delta=0.01)
+    
+    def test_engine_tracks_faces_separately(self):
+        """Test each face has its own eye state."""
+        engine = EyeStateEngine(close_threshold=0.2)
+        for i in range(10):
+            engine.update(0, 0.3, 0.3, i / FPS)
+            engine.update(1, 0.1, 0.1, i / FPS)
+        
+        self.assertFalse(engine.get_state(0).closed)
+        self.assertTrue(engine.get_state(1).closed)
+        self.assertIsNone(engine.get_state(2))
+        engine.reset()
+        self.assertIsNone(engine.get_state(0))
+
+    def test_exported_state_continues_exactly(self):
+        """Test a tracker restored from export_state() matches the original, past ring growth."""
+        ears = [0.1 if i % 97 < 5 else 0.3 for i in range(6000)]
+        self.feed(ears[:5000])
+        
+        restored = EyeStateTracker(close_threshold=0.2, open_threshold=0.25, windows=(60.0, 300.0))
+        restored.import_state(self.tracker.export_state())
+        for ear in ears[5000:]:
+            restored.update(ear, ear, self.time)
+            self.tracker.update(ear, ear, self.time)
+            self.time += 1 / FPS
+        
+        self.assertEqual(restored.state(), self.tracker.state())
+
+if __name__ == '__main__':
+    unittest.main()
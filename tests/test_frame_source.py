@@ -0,0 +1,138 @@
+import unittest
+import numpy as np
+import sys
+import os
+import tempfile
+import cv2
+from unittest.mock import Mock
+
+# Add the src directory to the path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from modules.frame_source import (ArraySource, ImageSequenceSource, VideoFileSource,
+                                  PrefetchingSource, open_source)
+
+def numbered_frames(count, width=64, height=48):
+    """Frames whose pixel value encodes their index."""
+    return np.stack([np.full((height, width, 3), i * 10, dtype=np.uint8) for i in range(count)])
+
+class TestFrameSource(unittest.TestCase):
+    """Test cases for the frame source classes."""
+    
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.frames = numbered_frames(10)
+    
+    def write_video(self):
+        """Write the test frames to an MJPG AVI file."""
+        path = os.path.join(self.tmp_dir.name, "clip.avi")
+        writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 10, (64, 48))
+        for frame in self.frames:
+            writer.write(frame)
+        writer.release()
+        return path
+    
+    def test_array_source_read_and_seek(self):
+        """Test reading and seeking an in-memory array."""
+        source = ArraySource(self.frames)
+        
+        ret, frame = source.read_frame()
+        self.assertTrue(ret)
+        self.assertEqual(frame[0, 0, 0], 0)
+        
+        source.seek(7)
+        ret, frame = source.read_frame()
+        self.assertEqual(frame[0, 0, 0], 70)
+        self.assertEqual(source.tell(), 8)
+        self.assertEqual(source.get_dimensions(), (64, 48))
+    
+    def test_array_source_end(self):
+        """Test reads past the end fail."""
+        source = ArraySource(self.frames[:1])
+        source.read_frame()
+        
+        ret, frame = source.read_frame()
+        self.assertFalse(ret)
+        self.assertIsNone(frame)
+    
+    def test_read_range(self):
+        """Test range reads return the requested indices."""
+        source = ArraySource(self.frames)
+        
+        indices = [index for index, _ in source.read_range(3, 6)]
+        self.assertEqual(indices, [3, 4, 5])
+    
+    def test_image_sequence_source(self):
+        """Test reading a directory of images in filename order."""
+        for i, frame in enumerate(self.frames[:3]):
+            cv2.imwrite(os.path.join(self.tmp_dir.name, f"frame_{i:03d}.png"), frame)
+        
+        source = open_source(self.tmp_dir.name)
+        
+        self.assertIsInstance(source, ImageSequenceSource)
+        self.assertEqual(source.frame_count, 3)
+        source.seek(2)
+        ret, frame = source.read_frame()
+        self.assertTrue(ret)
+        self.assertEqual(frame[0, 0, 0], 20)
+    
+    def test_unreadable_image_raises(self):
+        """Test a corrupt image in the sequence raises instead of ending the stream."""
+        for i, frame in enumerate(self.frames[:3]):
+            cv2.imwrite(os.path.join(self.tmp_dir.name, f"frame_{i:03d}.png"), frame)
+        with open(os.path.join(self.tmp_dir.name, "frame_001.png"), "wb") as image_file:
+            image_file.write(b"not an image")
+        source = ImageSequenceSource(self.tmp_dir.name)
+        
+        self.assertTrue(source.read_frame()[0])
+        with self.assertRaises(RuntimeError):
+            source.read_frame()
+    
+    def test_video_file_seek(self):
+        """Test frame-accurate seeking in a video file."""
+        source = VideoFileSource(self.write_video())
+        self.addCleanup(source.release)
+        
+        self.assertEqual(source.frame_count, 10)
+        source.seek(6)
+        ret, frame = source.read_frame()
+        self.assertTrue(ret)
+        self.assertAlmostEqual(int(frame[0, 0, 0]), 60, delta=3)
+        
+        # Backward seek
+        source.seek(2)
+        ret, frame = source.read_frame()
+        self.assertAlmostEqual(int(frame[0, 0, 0]), 20, delta=3)
+    
+    def test_video_file_missing(self):
+        """Test opening a missing video file fails."""
+        with self.assertRaises(RuntimeError):
+            VideoFileSource(os.path.join(self.tmp_dir.name, "missing.avi"))
+    
+    def test_prefetching_source(self):
+        """Test decode-ahead reads and seeks return frames in order."""
+        source = open_source(self.frames, prefetch_depth=3)
+        self.addCleanup(source.release)
+        
+        self.assertIsInstance(source, PrefetchingSource)
+        values = [int(frame[0, 0, 0]) for _, frame in source.read_range(0, 4)]
+        self.assertEqual(values, [0, 10, 20, 30])
+        
+        source.seek(8)
+        values = [int(frame[0, 0, 0]) for _, frame in source.read_range(8)]
+        self.assertEqual(values, [80, 90])
+        self.assertFalse(source.read_frame()[0])
+    
+    def test_prefetching_source_passes_on_errors(self):
+        """Test an exception in the decode thread is raised by read_frame instead of blocking it."""
+        failing = ArraySource(self.frames)
+        failing.read_frame = Mock(side_effect=[(True, self.frames[0]), (True, self.frames[1]), IOError("codec")])
+        source = PrefetchingSource(failing, prefetch_depth=2)
+        self.addCleanup(source.release)
+        
+        self.assertTrue(source.read_frame()[0])
+        self.assertTrue(source.read_frame()[0])
+        for _ in range(2):
+            with self.assertRaises(IOError):
+                source.read_frame()
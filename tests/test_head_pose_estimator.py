@@ -0,0 +1,82 @@
+import unittest
+import numpy as np
+import cv2
+import sys
+import os
+
+# Add the src directory to the path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from modules.landmark_features import LANDMARK_INDICES, POSE_ROWS
+from modules.head_pose_estimator import HeadPoseEstimator, MODEL_POINTS
+
+WIDTH, HEIGHT = 640, 480
+
+def project_pose(estimator, yaw, pitch, roll, distance=1500.0, base=None):
+    """Gathered landmarks whose pose rows are the model points seen at the given angles."""
+    yaw, pitch, roll = np.radians([yaw, pitch, roll])
+    rx = np.array([[1, 0, 0], [0, np.cos(pitch), -np.sin(pitch)], [0, np.sin(pitch), np.cos(pitch)]])
+    ry = np.array([[np.cos(yaw), 0, np.sin(yaw)], [0, 1, 0], [-np.sin(yaw), 0, np.cos(yaw)]])
+    rz = np.array([[np.cos(roll), -np.sin(roll), 0], [np.sin(roll), np.cos(roll), 0], [0, 0, 1]])
+    rvec, _ = cv2.Rodrigues(rz @ ry @ rx)
+    image_points, _ = cv2.projectPoints(MODEL_POINTS, rvec, np.array([0.0, 0.0, distance]),
+                                        estimator.camera_matrix(WIDTH, HEIGHT), None)
+    points = np.full((len(LANDMARK_INDICES), 3), 0.5) if base is None else base.copy()
+    points[POSE_ROWS, :2] = image_points.reshape(-1, 2) / (WIDTH, HEIGHT)
+    return points
+
+class TestHeadPoseEstimator(unittest.TestCase):
+    """Test cases for HeadPoseEstimator."""
+    
+    def setUp(self):
+        self.estimator = HeadPoseEstimator()
+    
+    def test_frontal_face(self):
+        """Test a frontal face yields angles near zero."""
+        pose = self.estimator.estimate(project_pose(self.estimator, 0, 0, 0), WIDTH, HEIGHT)
+        
+        np.testing.assert_allclose(pose, (0, 0, 0), atol=0.5)
+    
+    def test_recovers_angles(self):
+        """Test yaw, pitch and roll are recovered from a projected face."""
+        for angles in [(-25, 0, 0), (0, 15, 0), (0, 0, 12), (20, -10, 5)]:
+            self.estimator.reset()
+            pose = self.estimator.estimate(project_pose(self.estimator, *angles), WIDTH, HEIGHT)
+            np.testing.assert_allclose(pose, angles, atol=0.5)
+    
+    def test_warm_start_tracks_motion(self):
+        """Test consecutive frames reuse the previous solution and follow the head."""
+        for yaw in range(0, 40, 2):
+            pose = self.estimator.estimate(project_pose(self.estimator, yaw, 5, 0), WIDTH, HEIGHT)
+            self.assertAlmostEqual(pose.yaw, yaw, delta=0.5)
+        
+        self.assertIn(0, self.estimator._previous)
+    
+    def test_faces_tracked_separately(self):
+        """Test each face keeps its own warm-start state."""
+        left = self.estimator.estimate(project_pose(self.estimator, 20, 0, 0), WIDTH, HEIGHT, face_id=0)
+        right = self.estimator.estimate(project_pose(self.estimator, -20, 0, 0), WIDTH, HEIGHT, face_id=1)
+        
+        self.assertAlmostEqual(left.yaw, 20, delta=0.5)
+        self.assertAlmostEqual(right.yaw, -20, delta=0.5)
+        
+        self.estimator.reset(face_id=0)
+        self.assertNotIn(0, self.estimator._previous)
+        self.assertIn(1, self.estimator._previous)
+    
+    def test_missing_landmarks(self):
+        """Test missing pose landmarks return None."""
+        points = project_pose(self.estimator, 0, 0, 0)
+        points[POSE_ROWS[1]] = np.nan
+        
+        self.assertIsNone(self.estimator.estimate(points, WIDTH, HEIGHT))
+    
+    def test_camera_matrix_cached(self):
+        """Test intrinsics are computed once per resolution."""
+        first = self.estimator.camera_matrix(WIDTH, HEIGHT)
+        
+        self.assertIs(self.estimator.camera_matrix(WIDTH, HEIGHT), first)
+        self.assertEqual(self.estimator.camera_matrix(1280, 720)[0, 2], 640)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+import unittest
+import numpy as np
+import os
+import sys
+import tempfile
+from unittest.mock import Mock
+
+# Add the src directory to the path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from modules.landmark_backends import (LandmarkBackend, MediaPipeBackend, RecordingBackend, ReplayBackend,
+                                       SyntheticBackend, load_landmarks, save_landmarks)
+from modules.landmark_features import LANDMARK_INDICES
+from tests.test_config import MockFaceLandmarks
+
+class TestLandmarkBackends(unittest.TestCase):
+    """Test cases for the landmark backends."""
+    
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.path = os.path.join(self.tmpdir.name, "landmarks.npz")
+    
+    def test_mediapipe_backend_gathers_landmarks(self):
+        """Test Face Mesh results become one gathered array per face."""
+        processor = Mock()
+        processor.process_frame.return_value = Mock(multi_face_landmarks=[MockFaceLandmarks()] * 2)
+        backend = MediaPipeBackend(processor)
+        
+        faces = backend.detect(np.zeros((4, 4, 3), dtype=np.uint8))
+        
+        self.assertEqual(len(faces), 2)
+        self.assertEqual(faces[0].shape, (len(LANDMARK_INDICES), 3))
+        self.assertTrue(backend.uses_pixels)
+        
+        processor.process_frame.return_value = Mock(multi_face_landmarks=None)
+        self.assertEqual(backend.detect(np.zeros((4, 4, 3), dtype=np.uint8)), [])
+    
+    def test_synthetic_backend_cycles(self):
+        """Test the stub ignores pixels and loops over its pre-rendered frames."""
+        backend = SyntheticBackend(frames=30, occlusion_rate=0)
+        
+        first = backend.detect(None)
+        for _ in range(29):
+            backend.detect(None)
+        
+        self.assertFalse(backend.uses_pixels)
+        self.assertEqual(first[0].shape, (len(LANDMARK_INDICES), 3))
+        self.assertIs(backend.detect(None)[0], first[0])
+    
+    def test_synthetic_backend_occlusions(self):
+        """Test occluded frames report no face."""
+        backend = SyntheticBackend(frames=900, occlusion_rate=60)
+        counts = [len(backend.detect(None)) for _ in range(900)]
+        self.assertTrue(0 in counts and 1 in counts)
+    
+    def test_save_and_load_landmarks(self):
+        """Test frames with different face counts survive a round trip."""
+        face = np.random.default_rng(0).random((len(LANDMARK_INDICES), 3))
+        save_landmarks(self.path, [[face], [], [face, face * 0.5]])
+        
+        frames = load_landmarks(self.path)
+        
+        self.assertEqual([len(faces) for faces in frames], [1, 0, 2])
+        np.testing.assert_array_equal(frames[2][1], face * 0.5)
+    
+    def test_record_then_replay(self):
+        """Test a recording replays the same landmarks frame by frame."""
+        recorder = RecordingBackend(SyntheticBackend(frames=20, seed=1), self.path)
+        recorded = [recorder.detect(None) for _ in range(20)]
+        recorder.cleanup()
+        
+        replay = ReplayBackend(self.path)
+        for faces in recorded:
+            replayed = replay.detect(None)
+            self.assertEqual(len(replayed), len(faces))
+            for expected, actual in zip(faces, replayed):
+                np.testing.assert_array_equal(actual, expected)
+        self.assertEqual(replay.detect(None), [])
+    
+    def test_recording_written_in_chunks(self):
+        """Test a recording keeps at most one chunk in memory and replays across chunk boundaries."""
+        recorder = RecordingBackend(SyntheticBackend(frames=20, seed=1), self.path, chunk_frames=6)
+        recorded = []
+        for _ in range(20):
+            recorded.append(recorder.detect(None))
+            self.assertLess(len(recorder.frames), 6)
+        recorder.cleanup()
+        
+        frames = load_landmarks(self.path)
+        
+        self.assertEqual((recorder.chunks, recorder.frames_saved), (4, 20))
+        self.assertEqual([len(faces) for faces in frames], [len(faces) for faces in recorded])
+        for faces, loaded in zip(recorded, frames):
+            for expected, actual in zip(faces, loaded):
+                np.testing.assert_array_equal(actual, expected)
+    
+    def test_replay_follows_source_frames(self):
+        """Test a replay stays aligned with the source when inference is strided differently."""
+        recorder = RecordingBackend(SyntheticBackend(frames=12, seed=1, occlusion_rate=0), self.path)
+        recorded = {}
+        for index in range(12):
+            # Recorded with inference on every third frame
+            if index % 3 == 0:
+                recorded[index] = recorder.detect(None)
+            else:
+                recorder.skip_frame()
+        recorder.cleanup()
+        
+        replay = ReplayBackend(self.path)
+        for index in range(10):
+            # Replayed with inference on every other frame
+            if index % 2 == 0:
+                np.testing.assert_array_equal(replay.detect(None)[0], recorded[index - index % 3][0])
+            else:
+                replay.skip_frame()
+        self.assertEqual(replay.position, 10)
+    
+    def test_replay_loop(self):
+        """Test a looping replay starts over at the end."""
+        face = np.ones((len(LANDMARK_INDICES), 3))
+        save_landmarks(self.path, [[face], []])
+        replay = ReplayBackend(self.path, loop=True)
+        
+        counts = [len(replay.detect(None)) for _ in range(5)]
+        
+        self.assertEqual(counts, [1, 0, 1, 0, 1])
+    
+    def test_base_backend_is_abstract(self):
+        """Test the interface requires detect()."""
+        with self.assertRaises(NotImplementedError):
+            LandmarkBackend().detect(None)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+import unittest
+import numpy as np
+import sys
+import os
+
+# Add the src directory to the path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from modules.eye_analyzer import EyeAnalyzer
+from modules.head_pose_analyzer import HeadPoseAnalyzer
+from modules.landmark_features import (LANDMARK_INDICES, NUM_FEATURES, DEFAULT_EAR, F_LEFT_EAR,
+                                       compute_face_features, extract_features, gather_landmarks,
+                                       gaze_vector)
+from tests.test_config import MockFaceLandmarks
+
+class TestLandmarkFeatures(unittest.TestCase):
+    """Test cases for the fused landmark feature kernel."""
+    
+    def setUp(self):
+        self.rng = np.random.default_rng(0)
+        self.frame_width = 640
+        self.frame_height = 480
+    
+    def random_landmarks(self):
+        """Mock landmarks with random positions for every index the kernel uses."""
+        return MockFaceLandmarks({int(i): tuple(self.rng.uniform(0, 1, 3)) for i in LANDMARK_INDICES})
+    
+    def test_matches_analyzers(self):
+        """Test features are identical to the per-method analyzer calculations."""
+        eye_analyzer = EyeAnalyzer()
+        head_analyzer = HeadPoseAnalyzer()
+        
+        for _ in range(50):
+            landmarks = self.random_landmarks()
+            features = compute_face_features(landmarks, self.frame_width, self.frame_height)
+            
+            left_ear = eye_analyzer.calculate_ear(159, 145, 133, 33, landmarks,
+                                                  self.frame_width, self.frame_height)
+            right_ear = eye_analyzer.calculate_ear(386, 374, 362, 263, landmarks,
+                                                   self.frame_width, self.frame_height)
+            left_gaze, right_gaze = eye_analyzer.calculate_gaze_ratios(landmarks, self.frame_width,
+                                                                       self.frame_height)
+            
+            self.assertEqual(features.left_ear, left_ear)
+            self.assertEqual(features.right_ear, right_ear)
+            self.assertEqual(features.left_gaze_ratio, left_gaze)
+            self.assertEqual(features.right_gaze_ratio, right_gaze)
+            self.assertEqual(head_analyzer.classify_tilt(features.tilt),
+                             head_analyzer.check_face_tilt(landmarks, self.frame_width, self.frame_height))
+            self.assertEqual(head_analyzer.classify_head_pose(features.iris_z_diff),
+                             head_analyzer.analyze_head_pose(landmarks))
+            self.assertEqual(features.gaze_missing, 0.0)
+    
+    def test_vertical_gaze_matches_analyzer(self):
+        """Test vertical gaze ratios match EyeAnalyzer and combine into a 2D gaze vector."""
+        eye_analyzer = EyeAnalyzer()
+        
+        for _ in range(50):
+            landmarks = self.random_landmarks()
+            features = compute_face_features(landmarks, self.frame_width, self.frame_height)
+            
+            self.assertEqual((features.left_gaze_y, features.right_gaze_y),
+                             eye_analyzer.calculate_vertical_gaze_ratios(landmarks, self.frame_width,
+                                                                         self.frame_height))
+            x, y = gaze_vector(np.asarray(features))
+            self.assertAlmostEqual(x, 0.5 + (features.left_gaze_ratio - features.right_gaze_ratio) / 2)
+            self.assertAlmostEqual(y, (features.left_gaze_y + features.right_gaze_y) / 2)
+    
+    def test_missing_iris(self):
+        """Test landmarks without iris refinement are flagged."""
+        landmarks = MockFaceLandmarks({
+            159: (0.3, 0.4, 0.0), 145: (0.3, 0.45, 0.0),
+            133: (0.25, 0.425, 0.0), 33: (0.35, 0.425, 0.0),
+            386: (0.7, 0.4, 0.0), 374: (0.7, 0.45, 0.0),
+            362: (0.65, 0.425, 0.0), 263: (0.75, 0.425, 0.0)
+        })
+        
+        features = compute_face_features(landmarks, self.frame_width, self.frame_height)
+        
+        self.assertEqual(features.gaze_missing, 1.0)
+        self.assertGreater(features.left_ear, 0)
+        self.assertEqual(features.tilt, 0.0)
+    
+    def test_missing_eye_landmarks_use_default_ear(self):
+        """Test missing eyelid landmarks fall back to the default EAR."""
+        landmarks = MockFaceLandmarks({468: (0.3, 0.425, 0.0), 473: (0.7, 0.425, 0.0)})
+        
+        features = compute_face_features(landmarks, self.frame_width, self.frame_height)
+        
+        self.assertEqual(features.left_ear, DEFAULT_EAR)
+        self.assertEqual(features.right_ear, DEFAULT_EAR)
+    
+    def test_zero_eye_width(self):
+        """Test a zero eye width gives NaN gaze ratios."""
+        landmarks = MockFaceLandmarks({int(i): (0.5, 0.5, 0.0) for i in LANDMARK_INDICES})
+        
+        features = compute_face_features(landmarks, self.frame_width, self.frame_height)
+        
+        self.assertTrue(np.isnan(features.left_gaze_ratio))
+        self.assertEqual(features.gaze_missing, 0.0)
+    
+    def test_array_input_and_batches(self):
+        """Test gathering from arrays and computing features for a batch."""
+        mesh = self.rng.uniform(0, 1, (478, 3))
+        points = gather_landmarks(mesh)
+        self.assertEqual(points.shape, (len(LANDMARK_INDICES), 3))
+        np.testing.assert_array_equal(points, mesh[LANDMARK_INDICES])
+        
+        batch = self.rng.uniform(0, 1, (4, len(LANDMARK_INDICES), 3))
+        features = extract_features(batch, self.frame_width, self.frame_height)
+        
+        self.assertEqual(features.shape, (4, NUM_FEATURES))
+        np.testing.assert_array_equal(features[2], extract_features(batch[2], self.frame_width,
+                                                                     self.frame_height))
+        self.assertEqual(features[0, F_LEFT_EAR],
+                         compute_face_features(self.as_mesh(batch[0]), self.frame_width,
+                                               self.frame_height).left_ear)
+    
+    def as_mesh(self, points):
+        """Scatter gathered points back into a full 478-point mesh."""
+        mesh = np.zeros((478, 3))
+        mesh[LANDMARK_INDICES] = points
+        return mesh
+    
+    def test_short_mesh_array(self):
+        """Test a 468-point mesh (no iris) gathers with NaN iris rows."""
+        points = gather_landmarks(self.rng.uniform(0, 1, (468, 3)))
+        
+        self.assertTrue(np.isnan(points[-2:]).all())
+        self.assertFalse(np.isnan(points[:-2]).any())
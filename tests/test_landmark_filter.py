@@ -0,0 +1,86 @@
+import unittest
+import numpy as np
+import sys
+import os
+
+# Add the src directory to the path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from modules.landmark_features import LANDMARK_INDICES
+from modules.landmark_filter import OneEuroFilter, LandmarkFilterBank
+
+NUM_POINTS = len(LANDMARK_INDICES)
+
+class TestLandmarkFilter(unittest.TestCase):
+    """Test cases for OneEuroFilter and LandmarkFilterBank."""
+    
+    def setUp(self):
+        self.rng = np.random.default_rng(2)
+        self.base = self.rng.uniform(0.3, 0.7, (NUM_POINTS, 3))
+    
+    def test_first_measurement_passes_through(self):
+        """Test the first sample initializes the filter unchanged."""
+        one_euro = OneEuroFilter()
+        np.testing.assert_array_equal(one_euro(self.base, 0.0), self.base)
+    
+    def test_reduces_jitter(self):
+        """Test noise on a static face is attenuated."""
+        one_euro = OneEuroFilter(min_cutoff=1.0, beta=0.0)
+        raw_errors, filtered_errors = [], []
+        for i in range(300):
+            noisy = self.base + self.rng.normal(0, 0.002, self.base.shape)
+            filtered = one_euro(noisy, i / 30)
+            if i > 30:
+                raw_errors.append(np.abs(noisy - self.base).mean())
+                filtered_errors.append(np.abs(filtered - self.base).mean())
+        
+        self.assertLess(np.mean(filtered_errors), np.mean(raw_errors) / 2)
+    
+    def test_beta_reduces_lag(self):
+        """Test a higher speed coefficient follows fast movement more closely."""
+        slow, fast = OneEuroFilter(beta=0.0), OneEuroFilter(beta=50.0)
+        for i in range(10):
+            moved = self.base + 0.01 * i
+            slow_out = slow(moved, i / 30)
+            fast_out = fast(moved, i / 30)
+        
+        self.assertLess(np.abs(fast_out - moved).max(), np.abs(slow_out - moved).max())
+    
+    def test_missing_landmarks_restart(self):
+        """Test NaN landmarks pass through and restart cleanly."""
+        one_euro = OneEuroFilter()
+        missing = self.base.copy()
+        missing[-2:] = np.nan
+        
+        one_euro(missing, 0.0)
+        filtered = one_euro(self.base, 1 / 30)
+        
+        np.testing.assert_array_equal(filtered[-2:], self.base[-2:])
+        self.assertFalse(np.isnan(filtered).any())
+    
+    def test_predict_extrapolates_motion(self):
+        """Test prediction continues the filtered velocity."""
+        one_euro = OneEuroFilter(beta=50.0)
+        for i in range(20):
+            one_euro(self.base + 0.01 * i, i / 30)
+        
+        predicted = one_euro.predict(20 / 30)
+        
+        self.assertTrue((predicted > one_euro.value).all())
+    
+    def test_filter_bank_per_face(self):
+        """Test faces are filtered independently and stale faces restart."""
+        bank = LandmarkFilterBank(max_gap=0.5)
+        bank.filter(0, self.base, 0.0)
+        bank.filter(1, self.base + 0.1, 0.0)
+        
+        self.assertEqual(sorted(bank.face_ids()), [0, 1])
+        self.assertIsNotNone(bank.predict(0, 0.1))
+        self.assertIsNone(bank.predict(0, 1.0))
+        self.assertIsNone(bank.predict(5, 0.1))
+        
+        # After a long gap the raw measurement is used again
+        np.testing.assert_array_equal(bank.filter(0, self.base + 0.2, 2.0), self.base + 0.2)
+        
+        bank.reset()
+        self.assertEqual(bank.face_ids(), [])
@@ -0,0 +1,198 @@
+import unittest
+import time
+import numpy as np
+import sys
+import os
+from unittest.mock import Mock
+
+# Add the src directory to the path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from modules.detector_config import DetectorConfig
+from modules.landmark_features import LANDMARK_INDICES, FaceFeatures, extract_features
+from modules.landmark_transport import (CentralScorer, CentralServer, EdgeSender, LandmarkPacket,
+                                        decode_packet, encode_packet, split_packets)
+from modules.result_smoother import ResultSmoother
+from modules.rule_engine import RuleEngine
+from modules.synthetic_landmarks import SyntheticFaceGenerator
+from tests.test_config import MockFaceLandmarks
+
+def synthetic_points(frames: int, seed: int = 0) -> np.ndarray:
+    generator = SyntheticFaceGenerator(seed=seed)
+    track = generator.head_turn(frames, period=frames / generator.fps)
+    return generator.render(track, indices=LANDMARK_INDICES)
+
+class TestLandmarkPackets(unittest.TestCase):
+    """Test cases for the landmark packet format."""
+    
+    def test_round_trip_quantization_error(self):
+        """Test decoded landmarks stay well below a pixel from the originals."""
+        points = synthetic_points(3)
+        packet = LandmarkPacket(7, 42, 1234.5, 640, 480, points)
+        
+        data = encode_packet(packet)
+        decoded = decode_packet(data)
+        
+        self.assertEqual(len(data), 24 + 3 * len(LANDMARK_INDICES) * 3 * 2)
+        self.assertEqual(decoded[:5], (7, 42, 1234.5, 640, 480))
+        self.assertLess(np.abs(decoded.faces - points).max(), 5e-5)
+    
+    def test_missing_landmarks_survive(self):
+        """Test NaN landmarks (no iris refinement) decode as NaN."""
+        points = synthetic_points(1)
+        points[0, -2:] = np.nan
+        
+        faces = decode_packet(encode_packet(LandmarkPacket(1, 1, 0.0, 640, 480, points))).faces
+        
+        self.assertTrue(np.isnan(faces[0, -2:]).all())
+        self.assertFalse(np.isnan(faces[0, :-2]).any())
+    
+    def test_split_packets_keeps_partial_data(self):
+        """Test complete packets are consumed and a trailing fragment is kept."""
+        first = encode_packet(LandmarkPacket(1, 1, 0.0, 640, 480, synthetic_points(1)))
+        empty = encode_packet(LandmarkPacket(2, 1, 0.0, 640, 480, np.empty((0, len(LANDMARK_INDICES), 3))))
+        buffer = bytearray(first + empty + first[:10])
+        
+        packets = split_packets(buffer)
+        
+        self.assertEqual([packet.stream_id for packet in packets], [1, 2])
+        self.assertEqual(len(packets[1].faces), 0)
+        self.assertEqual(bytes(buffer), first[:10])
+    
+    def test_invalid_data_rejected(self):
+        """Test data that is not a landmark packet raises ValueError."""
+        with self.assertRaises(ValueError):
+            split_packets(bytearray(b'GET / HTTP/1.1\r\n\r\n' + bytes(16)))
+
+class TestCentralScorer(unittest.TestCase):
+    """Test cases for CentralScorer class."""
+    
+    def test_matches_per_stream_scalar_path(self):
+        """Test batched scoring equals the scalar rules plus a smoother per stream."""
+        config = DetectorConfig()
+        scorer = CentralScorer(config)
+        engine = RuleEngine()
+        streams = {stream_id: synthetic_points(60, seed=stream_id) for stream_id in range(4)}
+        smoothers = {stream_id: ResultSmoother(vote_window=config.vote_window) for stream_id in streams}
+        
+        for frame in range(0, 60, 2):
+            # Two frames per stream per batch, interleaved
+            packets = [LandmarkPacket(stream_id, frame + offset, 0.0, 640, 480, points[frame + offset][None])
+                       for offset in range(2) for stream_id, points in streams.items()]
+            packets = [decode_packet(encode_packet(packet)) for packet in packets]
+            
+            results = scorer.score(packets)
+            
+            for packet, result in zip(packets, results):
+                features = FaceFeatures.from_vector(extract_features(packet.faces[0], 640, 480))
+                concentrated, reason, confidence = engine.evaluate(features, config.rule_params())
+                self.assertEqual((result.stream_id, result.sequence), (packet.stream_id, packet.sequence))
+                self.assertEqual(result.concentrated, smoothers[packet.stream_id].smooth_result(concentrated))
+                self.assertEqual(result.reason, reason)
+                self.assertAlmostEqual(result.confidence, confidence)
+    
+    def test_packet_without_face(self):
+        """Test packets without faces report no face and do not touch smoothing."""
+        scorer = CentralScorer()
+        
+        result = scorer.score([LandmarkPacket(3, 1, 0.0, 640, 480, np.empty((0, len(LANDMARK_INDICES), 3)))])[0]
+        
+        self.assertEqual((result.concentrated, result.reason), (False, "No Face Detected"))
+        self.assertEqual(scorer.smoother.counts.sum(), 0)
+    
+    def test_forget_reuses_slot(self):
+        """Test a forgotten stream's slot is cleared and reused."""
+        scorer = CentralScorer()
+        packet = LandmarkPacket(1, 1, 0.0, 640, 480, synthetic_points(1))
+        scorer.score([packet])
+        
+        scorer.forget(1)
+        scorer.score([packet._replace(stream_id=2)])
+        
+        self.assertEqual(scorer._slots, {2: 0})
+        self.assertEqual(scorer.smoother.counts[0], 1)
+
+class TestEdgeToCentral(unittest.TestCase):
+    """End-to-end tests over localhost."""
+    
+    def setUp(self):
+        self.batches = []
+        self.server = CentralServer(CentralScorer(), host="127.0.0.1", batch_interval=0.01,
+                                    callback=self.batches.append).start()
+    
+    def tearDown(self):
+        self.server.stop()
+    
+    def make_sender(self, stream_id: int, points: np.ndarray) -> EdgeSender:
+        faces = iter([MockFaceLandmarks({int(index): tuple(point) for index, point in zip(LANDMARK_INDICES, frame)})
+                      for frame in points])
+        processor = Mock()
+        processor.process_frame.side_effect = lambda frame: Mock(multi_face_landmarks=[next(faces)])
+        return EdgeSender(*self.server.address, stream_id=stream_id, face_processor=processor)
+    
+    def wait_for(self, condition, timeout: float = 5.0):
+        deadline = time.monotonic() + timeout
+        while not condition() and time.monotonic() < deadline:
+            time.sleep(0.01)
+    
+    def test_streams_scored_centrally(self):
+        """Test several edge senders' landmarks arrive and are scored per stream."""
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        senders = [self.make_sender(stream_id, synthetic_points(10, seed=stream_id)) for stream_id in (5, 6)]
+        
+        for _ in range(10):
+            for sender in senders:
+                self.assertEqual(sender.process_frame(frame), 1)
+        self.wait_for(lambda: self.server.packets_received == 20)
+        for sender in senders:
+            sender.close()
+        self.wait_for(lambda: all(self.server.get_latest(s) is not None and self.server.get_latest(s).sequence == 10
+                                  for s in (5, 6)))
+        
+        self.assertEqual(self.server.packets_received, 20)
+        self.assertEqual(senders[0].sent_packets, 10)
+        self.assertLess(senders[0].bytes_sent / 10, 200)
+        for stream_id in (5, 6):
+            self.assertEqual(self.server.get_latest(stream_id).sequence, 10)
+        self.assertEqual(sum(len(batch) for batch in self.batches), 20)
+    
+    def test_duplicate_stream_id_rejected(self):
+        """Test a second live connection sending an owned stream ID is closed, and the ID freed on disconnect."""
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        owner = self.make_sender(3, synthetic_points(2))
+        owner.process_frame(frame)
+        self.wait_for(lambda: self.server.get_latest(3) is not None)
+        
+        duplicate = self.make_sender(3, synthetic_points(2, seed=1))
+        duplicate.process_frame(frame)
+        self.wait_for(lambda: self.server.rejected_connections == 1)
+        self.assertEqual(self.server.rejected_connections, 1)
+        self.assertEqual(self.server.packets_received, 1)
+        
+        owner.close()
+        self.wait_for(lambda: 3 not in self.server.scorer._slots)
+        self.assertNotIn(3, self.server.scorer._slots)
+        
+        replacement = self.make_sender(3, synthetic_points(1, seed=2))
+        replacement.process_frame(frame)
+        self.wait_for(lambda: self.server.packets_received == 2)
+        self.assertEqual(self.server.packets_received, 2)
+        self.assertEqual(self.server.rejected_connections, 1)
+        duplicate.close()
+        replacement.close()
+    
+    def test_sender_drops_while_unreachable(self):
+        """Test an unreachable central service drops packets instead of blocking."""
+        port = self.server.address[1]
+        self.server.stop()
+        self.server = CentralServer(CentralScorer(), host="127.0.0.1")
+        sender = EdgeSender("127.0.0.1", port, stream_id=1, face_processor=Mock(), reconnect_interval=60.0)
+        
+        self.assertFalse(sender.send([], 640, 480))
+        self.assertFalse(sender.send([], 640, 480))
+        
+        self.assertEqual(sender.dropped_packets, 2)
+        self.assertEqual(sender.sequence, 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+import numpy as np
+import sys
+import os
+import cv2
+from unittest.mock import Mock, patch
+
+# Add the src directory to the path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from modules.mjpeg_capture import MjpegCameraManager
+
+MJPG = float(cv2.VideoWriter_fourcc(*"MJPG"))
+YUYV = float(cv2.VideoWriter_fourcc(*"YUYV"))
+
+def jpeg_frame(value, width=64, height=48):
+    """JPEG bytes shaped like a compressed capture buffer (1 x N)."""
+    frame = np.full((height, width, 3), value, dtype=np.uint8)
+    return cv2.imencode(".jpg", frame)[1].reshape(1, -1)
+
+def mock_capture(frames, fourcc=MJPG, width=64, height=48):
+    cap = Mock()
+    cap.isOpened.return_value = True
+    cap.get.side_effect = [fourcc, width, height]
+    cap.set.return_value = True
+    remaining = list(frames)
+    cap.read.side_effect = lambda: (True, remaining.pop(0)) if remaining else (False, None)
+    return cap
+
+class TestMjpegCameraManager(unittest.TestCase):
+    """Test cases for MjpegCameraManager class."""
+    
+    @patch('cv2.VideoCapture')
+    def test_frames_decoded_in_order(self, mock_video_capture):
+        """Test frames decoded on several workers come back in capture order."""
+        values = list(range(10, 250, 10))
+        mock_video_capture.return_value = mock_capture([jpeg_frame(v) for v in values])
+        
+        camera = MjpegCameraManager(decode_workers=3)
+        decoded = []
+        while True:
+            ret, frame = camera.read_frame()
+            if not ret:
+                break
+            decoded.append(frame)
+        camera.release()
+        
+        self.assertTrue(camera.compressed)
+        self.assertEqual(len(decoded), len(values))
+        for value, frame in zip(values, decoded):
+            self.assertEqual(frame.shape, (48, 64, 3))
+            self.assertLessEqual(abs(int(frame[24, 32, 0]) - value), 3)
+    
+    @patch('cv2.VideoCapture')
+    def test_reduced_decode(self, mock_video_capture):
+        """Test decode_scale shrinks decoded frames and reported dimensions."""
+        mock_video_capture.return_value = mock_capture([jpeg_frame(128)])
+        
+        camera = MjpegCameraManager(decode_scale=4)
+        ret, frame = camera.read_frame()
+        
+        self.assertTrue(ret)
+        self.assertEqual(frame.shape, (12, 16, 3))
+        self.assertEqual(camera.get_dimensions(), (16, 12))
+        camera.release()
+    
+    @patch('cv2.VideoCapture')
+    def test_corrupt_frame_skipped(self, mock_video_capture):
+        """Test an undecodable buffer is skipped rather than ending capture."""
+        corrupt = np.zeros((1, 100), dtype=np.uint8)
+        mock_video_capture.return_value = mock_capture([corrupt, jpeg_frame(200)])
+        
+        camera = MjpegCameraManager()
+        ret, frame = camera.read_frame()
+        
+        self.assertTrue(ret)
+        self.assertEqual(camera.decode_failures, 1)
+        camera.release()
+    
+    @patch('cv2.VideoCapture')
+    def test_fallback_without_mjpg(self, mock_video_capture):
+        """Test frames decoded by the driver pass through when MJPG is refused."""
+        mock_video_capture.return_value = mock_capture([np.full((48, 64, 3), 7, dtype=np.uint8)], fourcc=YUYV)
+        
+        camera = MjpegCameraManager(decode_scale=2)
+        ret, frame = camera.read_frame()
+        
+        self.assertFalse(camera.compressed)
+        self.assertEqual(frame.shape, (24, 32, 3))
+        camera.release()
+    
+    def test_invalid_decode_scale(self):
+        """Test unsupported scales are rejected."""
+        with self.assertRaises(ValueError):
+            MjpegCameraManager(decode_scale=3)
+
+if __name__ == '__main__':
+    unittest.main()
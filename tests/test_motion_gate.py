@@ -0,0 +1,85 @@
+import unittest
+import numpy as np
+import sys
+import os
+
+# Add the src directory to the path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from modules.motion_gate import MotionGate
+
+def make_frame(square_x=None):
+    """Gray frame with an optional bright square at square_x."""
+    frame = np.full((480, 640, 3), 80, dtype=np.uint8)
+    if square_x is not None:
+        frame[200:280, square_x:square_x + 80] = 220
+    return frame
+
+class TestMotionGate(unittest.TestCase):
+    """Test cases for MotionGate class."""
+    
+    def setUp(self):
+        self.gate = MotionGate(still_interval=0.5, idle_after=10.0, idle_interval=2.0)
+    
+    def test_still_scene_is_skipped(self):
+        """Test inference is skipped while nothing moves, until the refresh interval."""
+        frame = make_frame(100)
+        
+        self.assertTrue(self.gate.should_infer(frame, 0.0))
+        self.assertFalse(self.gate.should_infer(frame.copy(), 0.1))
+        self.assertFalse(self.gate.should_infer(frame.copy(), 0.4))
+        self.assertTrue(self.gate.should_infer(frame.copy(), 0.5))
+        self.assertEqual(self.gate.get_stats()['skipped_frames'], 2)
+    
+    def test_motion_triggers_inference(self):
+        """Test a moving object triggers inference while sensor noise does not."""
+        self.gate.should_infer(make_frame(100), 0.0)
+        
+        noisy = make_frame(100).astype(np.int16) + np.random.default_rng(0).integers(-4, 5, (480, 640, 3))
+        self.assertFalse(self.gate.should_infer(noisy.astype(np.uint8), 0.1))
+        self.assertTrue(self.gate.should_infer(make_frame(140), 0.2))
+    
+    def test_idle_after_no_face(self):
+        """Test the gate idles without faces and wakes when one is found."""
+        changes = []
+        self.gate.subscribe(changes.append)
+        
+        self.gate.report_faces(0, 0.0)
+        self.gate.report_faces(0, 9.0)
+        self.assertFalse(self.gate.idle)
+        self.gate.report_faces(0, 10.0)
+        self.assertTrue(self.gate.idle)
+        
+        # While idle, a still scene is only rechecked every idle_interval
+        frame = make_frame()
+        self.gate.should_infer(frame, 10.0)
+        self.assertFalse(self.gate.should_infer(frame, 11.0))
+        self.assertTrue(self.gate.should_infer(frame, 12.0))
+        
+        self.gate.report_faces(1, 12.0)
+        self.assertFalse(self.gate.idle)
+        self.assertEqual(changes, [True, False])
+    
+    def test_reset_forces_inference(self):
+        """Test the next frame is inferred after a reset."""
+        frame = make_frame()
+        self.gate.should_infer(frame, 0.0)
+        self.gate.reset()
+        self.assertTrue(self.gate.should_infer(frame, 0.1))
+
+    def test_state_moves_to_another_clock(self):
+        """Test a restored gate keeps its reference frame and timers relative to the new clock."""
+        frame = make_frame(100)
+        self.gate.should_infer(frame, 100.0)
+        self.gate.report_faces(0, 100.0)
+        self.gate.report_faces(0, 111.0)
+        
+        restored = MotionGate(still_interval=0.5, idle_after=10.0, idle_interval=2.0)
+        restored.set_state(self.gate.get_state(), time_offset=-100.0)
+        
+        self.assertTrue(restored.idle)
+        self.assertFalse(restored.should_infer(frame.copy(), 1.5))
+        self.assertTrue(restored.should_infer(frame.copy(), 2.0))
+
+if __name__ == '__main__':
+    unittest.main()
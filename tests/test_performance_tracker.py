@@ -40,3 +40,16 @@ class TestPerformanceTracker(unittest.TestCase):
         self.assertGreater(stats['runtime'], 0)
         self.assertGreater(stats['fps'], 0)
 
+    def test_latency_stats(self):
+        """Test rolling latency statistics."""
+        for latency in [0.01, 0.02, 0.03]:
+            self.tracker.record_latency(latency)
+        
+        stats = self.tracker.get_latency_stats()
+        
+        self.assertEqual(stats['samples'], 3)
+        self.assertAlmostEqual(stats['mean'], 0.02)
+        self.assertAlmostEqual(stats['max'], 0.03)
+        
+        self.tracker.reset_latency()
+        self.assertEqual(self.tracker.get_latency_stats()['samples'], 0)
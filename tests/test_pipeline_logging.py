@@ -0,0 +1,135 @@
+import unittest
+import logging
+import threading
+import time
+import sys
+import os
+
+# Add the src directory to the path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from modules.pipeline_logging import PipelineLogging, RateLimitFilter
+
+class CaptureHandler(logging.Handler):
+    """Collects formatted messages and the thread that emitted them."""
+    
+    def __init__(self, gate: threading.Event = None):
+        super().__init__()
+        self.messages = []
+        self.threads = []
+        self.gate = gate
+    
+    def emit(self, record):
+        if self.gate is not None:
+            self.gate.wait(5.0)
+        self.messages.append(record.getMessage())
+        self.threads.append(threading.current_thread().name)
+
+class CountingArg:
+    """Argument that counts how often it is formatted."""
+    
+    def __init__(self):
+        self.formatted = 0
+    
+    def __str__(self):
+        self.formatted += 1
+        return "camera lost"
+
+class TestPipelineLogging(unittest.TestCase):
+    """Test cases for PipelineLogging and RateLimitFilter."""
+    
+    def setUp(self):
+        # Unregistered, so no other handlers are attached to it
+        self.logger = logging.Logger("tests.pipeline_logging", logging.INFO)
+        self.handler = CaptureHandler()
+        self.logger.addHandler(self.handler)
+        self.addCleanup(self.logger.removeHandler, self.handler)
+    
+    def test_storm_is_rate_limited_and_reported(self):
+        """Test repeats beyond the burst are suppressed and summarized on stop."""
+        logs = PipelineLogging(interval=60.0, burst=3).start(self.logger)
+        for frame in range(100):
+            self.logger.warning("Failed to read frame %d", frame)
+        stats = logs.get_stats()
+        logs.stop()
+        
+        self.assertEqual(stats['suppressed'], 97)
+        self.assertEqual(self.handler.messages[:3], ["Failed to read frame 0", "Failed to read frame 1",
+                                                     "Failed to read frame 2"])
+        self.assertIn("97 log messages suppressed", self.handler.messages[-1])
+        self.assertEqual(len(self.handler.messages), 4)
+    
+    def test_next_window_reports_suppressed_count(self):
+        """Test the first record of a new window says how many were suppressed."""
+        logs = PipelineLogging(interval=0.05, burst=1).start(self.logger)
+        for _ in range(2):
+            for _ in range(5):
+                self.logger.error("Detection error: %s", "bad landmarks")
+            time.sleep(0.06)
+        logs.stop()
+        
+        self.assertEqual(self.handler.messages, [
+            "Detection error: bad landmarks",
+            "Detection error: bad landmarks (4 similar messages suppressed)",
+            "4 log messages suppressed since their last report (1 distinct messages)"])
+    
+    def test_call_sites_are_limited_separately(self):
+        """Test different messages do not share a budget."""
+        logs = PipelineLogging(interval=60.0, burst=1).start(self.logger)
+        for _ in range(3):
+            self.logger.warning("first")
+            self.logger.warning("second")
+        logs.stop()
+        
+        self.assertEqual(self.handler.messages[:2], ["first", "second"])
+    
+    def test_formatting_happens_on_listener_thread(self):
+        """Test suppressed records are never formatted and the rest off the caller thread."""
+        argument = CountingArg()
+        logs = PipelineLogging(interval=60.0, burst=2).start(self.logger)
+        for _ in range(50):
+            self.logger.warning("Camera error: %s", argument)
+        logs.stop()
+        
+        self.assertEqual(argument.formatted, 2)
+        self.assertNotIn(threading.current_thread().name, self.handler.threads[:2])
+    
+    def test_full_queue_drops_instead_of_blocking(self):
+        """Test a stalled handler makes records drop rather than block the caller."""
+        gate = threading.Event()
+        self.handler.gate = gate
+        logs = PipelineLogging(interval=60.0, burst=1000, queue_size=2).start(self.logger)
+        
+        started = time.perf_counter()
+        for index in range(20):
+            self.logger.info("frame %d", index)
+        elapsed = time.perf_counter() - started
+        gate.set()
+        stats = logs.get_stats()
+        logs.stop()
+        
+        self.assertLess(elapsed, 1.0)
+        self.assertGreater(stats['dropped'], 0)
+        self.assertIn("log messages dropped", self.handler.messages[-1])
+    
+    def test_stop_restores_handlers(self):
+        """Test stopping puts the original handlers back."""
+        logs = PipelineLogging().start(self.logger)
+        self.assertEqual(self.logger.handlers, [logs.queue_handler])
+        
+        logs.stop()
+        
+        self.assertEqual(self.logger.handlers, [self.handler])
+    
+    def test_filter_alone(self):
+        """Test RateLimitFilter can be attached to any handler."""
+        rate_limit = RateLimitFilter(interval=60.0, burst=2)
+        record = logging.LogRecord("x", logging.WARNING, __file__, 1, "message", None, None)
+        
+        results = [rate_limit.filter(record) for _ in range(4)]
+        
+        self.assertEqual(results, [True, True, False, False])
+        self.assertEqual(rate_limit.suppressed_total, 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+import sys
+import os
+from unittest.mock import Mock
+
+# Add the src directory to the path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from modules.performance_tracker import PerformanceTracker
+from modules.quality_controller import QualityController, QualityLevel, DEFAULT_QUALITY_LEVELS
+
+class TestQualityController(unittest.TestCase):
+    """Test cases for QualityController class."""
+    
+    def setUp(self):
+        self.detector = Mock()
+        self.detector.performance_tracker = PerformanceTracker(latency_window=10)
+        self.camera = Mock()
+        self.camera.get_dimensions.return_value = (640, 480)
+        self.controller = QualityController(self.detector, self.camera, target_fps=30,
+                                            degrade_after=5, upgrade_after=10, cooldown_frames=0)
+    
+    def feed(self, latency, frames):
+        """Record a latency and run the controller for a number of frames."""
+        for _ in range(frames):
+            self.detector.performance_tracker.record_latency(latency)
+            self.controller.update()
+    
+    def test_initialization(self):
+        """Test the best level is applied on startup."""
+        self.assertEqual(self.controller.level_index, 0)
+        self.assertEqual(self.controller.budget, 1.0 / 30)
+        self.detector.set_quality.assert_called_once_with(1.0, 1, True)
+    
+    def test_requires_target(self):
+        """Test that a target FPS or latency SLO is required."""
+        with self.assertRaises(ValueError):
+            QualityController(self.detector, target_fps=None)
+    
+    def test_degrades_when_over_budget(self):
+        """Test sustained slow frames step the quality down."""
+        self.feed(0.1, 9)
+        
+        self.assertEqual(self.controller.level_index, 1)
+        self.assertEqual(self.controller.current_level, DEFAULT_QUALITY_LEVELS[1])
+    
+    def test_hysteresis_holds_level(self):
+        """Test latency between the upgrade and degrade thresholds keeps the level."""
+        self.feed(0.1, 9)
+        self.feed(0.03, 50)
+        
+        self.assertEqual(self.controller.level_index, 1)
+    
+    def test_upgrades_when_under_budget(self):
+        """Test sustained fast frames step the quality back up."""
+        self.feed(0.1, 9)
+        self.feed(0.005, 30)
+        
+        self.assertEqual(self.controller.level_index, 0)
+    
+    def test_resolution_change_applied_to_camera(self):
+        """Test the camera is reconfigured when the level changes resolution."""
+        levels = [QualityLevel(640, 480, 1.0, 1, True), QualityLevel(320, 240, 1.0, 2, True)]
+        controller = QualityController(self.detector, self.camera, levels=levels,
+                                       degrade_after=5, cooldown_frames=0)
+        for _ in range(10):
+            self.detector.performance_tracker.record_latency(0.1)
+            controller.update()
+        
+        self.camera.set_resolution.assert_called_once_with(320, 240)
+        self.detector.set_quality.assert_called_with(1.0, 2, True)
+    
+    def test_unrefined_levels_skipped_by_default(self):
+        """Test levels without iris refinement are excluded unless allowed."""
+        self.assertTrue(all(level.refine_landmarks for level in self.controller.levels))
+        
+        controller = QualityController(self.detector, allow_unrefined=True)
+        self.assertEqual(len(controller.levels), len(DEFAULT_QUALITY_LEVELS))
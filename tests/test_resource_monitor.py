@@ -0,0 +1,106 @@
+import unittest
+import os
+import signal
+import sys
+import threading
+import tracemalloc
+
+# Add the src directory to the path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from modules.resource_monitor import ResourceMonitor, ResourceSample
+from modules.performance_tracker import PerformanceTracker
+
+def make_sample(t, rss, fds=10, threads=4, traced=-1):
+    return ResourceSample(float(t), rss, fds, threads, traced)
+
+class TestResourceMonitor(unittest.TestCase):
+    """Test cases for ResourceMonitor class."""
+    
+    def setUp(self):
+        self.monitor = ResourceMonitor(interval=3600, history_size=50, growth_window=5,
+                                       use_tracemalloc=False)
+    
+    def test_sample(self):
+        """Test a sample reports current process resources."""
+        sample = self.monitor.sample()
+        
+        self.assertGreater(sample.rss_bytes, 0)
+        self.assertGreater(sample.open_fds, 0)
+        self.assertGreaterEqual(sample.threads, 1)
+        self.assertEqual(sample.traced_bytes, -1)
+        self.assertEqual(len(self.monitor.samples), 1)
+    
+    def test_ring_is_bounded(self):
+        """Test old samples are dropped once the ring is full."""
+        for _ in range(60):
+            self.monitor.sample()
+        
+        self.assertEqual(len(self.monitor.samples), 50)
+    
+    def test_flags_monotonic_growth(self):
+        """Test steady growth is flagged while fluctuation is not."""
+        for t in range(5):
+            self.monitor.samples.append(make_sample(t, (100 + t * 5) << 20, fds=10 + t))
+        self.assertEqual(self.monitor.growing(), ['rss_bytes', 'open_fds'])
+        
+        self.monitor.samples.clear()
+        for t, rss in enumerate([100, 110, 105, 120, 130]):
+            self.monitor.samples.append(make_sample(t, rss << 20))
+        self.assertEqual(self.monitor.growing(), [])
+    
+    def test_growth_below_tolerance_ignored(self):
+        """Test RSS creeping by less than the tolerance is not flagged."""
+        for t in range(5):
+            self.monitor.samples.append(make_sample(t, (100 << 20) + t * 1024))
+        
+        self.assertEqual(self.monitor.growing(), [])
+    
+    def test_tracemalloc_top_allocators(self):
+        """Test tracemalloc allocation sites appear in the report."""
+        monitor = ResourceMonitor(interval=3600, top_allocators=3, use_tracemalloc=True)
+        was_tracing = tracemalloc.is_tracing()
+        monitor.start()
+        try:
+            self.blocks = [bytearray(1024) for _ in range(200)]
+            monitor.sample()
+        finally:
+            monitor.stop()
+        
+        self.assertEqual(len(monitor.top_allocations), 3)
+        self.assertIn("Top allocators", monitor.report())
+        self.assertEqual(tracemalloc.is_tracing(), was_tracing)
+    
+    def test_background_sampling_and_stop(self):
+        """Test the background thread samples immediately and stops cleanly."""
+        self.monitor.start()
+        self.monitor.stop()
+        
+        self.assertGreaterEqual(len(self.monitor.samples), 1)
+        self.assertNotIn("ResourceMonitor", [t.name for t in threading.enumerate()])
+    
+    @unittest.skipUnless(hasattr(signal, 'SIGUSR1'), "SIGUSR1 not available")
+    def test_signal_report(self):
+        """Test the signal handler logs a report."""
+        previous = signal.getsignal(signal.SIGUSR1)
+        self.addCleanup(signal.signal, signal.SIGUSR1, previous)
+        self.monitor.sample()
+        
+        self.assertTrue(self.monitor.install_signal_handler())
+        with self.assertLogs(level='INFO') as logs:
+            os.kill(os.getpid(), signal.SIGUSR1)
+        
+        self.assertIn("Resource monitor", logs.output[0])
+    
+    def test_performance_tracker_integration(self):
+        """Test monitoring is attached to and detached from PerformanceTracker."""
+        tracker = PerformanceTracker()
+        self.assertEqual(tracker.get_resource_report(), "Resource monitoring is disabled")
+        
+        tracker.enable_resource_monitoring(interval=3600, use_tracemalloc=False)
+        self.assertIsNotNone(tracker.resource_monitor)
+        tracker.disable_resource_monitoring()
+        self.assertIsNone(tracker.resource_monitor)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,7 +5,9 @@ import os
 # Add the src directory to the path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from modules.result_smoother import ResultSmoother
+import numpy as np
+
+from modules.result_smoother import BatchResultSmoother, ResultSmoother
 
 class TestResultSmoother(unittest.TestCase):
     """Test cases for ResultSmoother class."""
@@ -69,3 +71,64 @@ class TestResultSmoother(unittest.TestCase):
         
         self.smoother.clear_history()
         self.assertEqual(len(self.smoother.concentration_history), 0)
+    
+    def test_custom_vote_window(self):
+        """Test a shorter vote window reacts after fewer frames."""
+        smoother = ResultSmoother(history_size=10, vote_window=3)
+        for _ in range(3):
+            smoother.smooth_result(True)
+        
+        smoother.smooth_result(False)
+        result = smoother.smooth_result(False)
+        
+        self.assertFalse(result)  # 2 out of the last 3
+    
+    def test_resize_keeps_recent_results(self):
+        """Test shrinking the history keeps the most recent results."""
+        for result in [True] * 6 + [False] * 3:
+            self.smoother.smooth_result(result)
+        
+        self.smoother.resize(history_size=4, vote_window=3)
+        
+        self.assertEqual(self.smoother.concentration_history, [True, False, False, False])
+        self.assertFalse(self.smoother.smooth_result(True))  # 1 out of the last 3
+
+    def test_state_round_trip(self):
+        """Test a smoother restored from get_state() continues like the original."""
+        for result in [True, False, True, True]:
+            self.smoother.smooth_result(result)
+        
+        restored = ResultSmoother(history_size=self.smoother.history_size)
+        restored.set_state(self.smoother.get_state())
+        
+        self.assertEqual(restored.concentration_history, self.smoother.concentration_history)
+        self.assertEqual(restored.smooth_result(False), self.smoother.smooth_result(False))
+
+class TestBatchResultSmoother(unittest.TestCase):
+    """Test cases for BatchResultSmoother class."""
+    
+    def test_matches_result_smoother_per_stream(self):
+        """Test every slot smooths exactly like its own ResultSmoother."""
+        rng = np.random.default_rng(3)
+        batch = BatchResultSmoother(vote_window=5, capacity=2)
+        batch.ensure_capacity(6)
+        references = [ResultSmoother(vote_window=5) for _ in range(6)]
+        
+        self.assertGreaterEqual(batch.capacity, 6)
+        for _ in range(40):
+            slots = rng.choice(6, size=4, replace=False)
+            results = rng.random(4) < 0.6
+            smoothed = batch.smooth(slots, results)
+            expected = [references[slot].smooth_result(bool(result)) for slot, result in zip(slots, results)]
+            self.assertEqual(smoothed.tolist(), expected)
+    
+    def test_clear_resets_slot(self):
+        """Test a cleared slot returns raw results until its window fills again."""
+        batch = BatchResultSmoother(vote_window=3)
+        for _ in range(3):
+            batch.smooth(np.array([0, 1]), np.array([True, True]))
+        
+        batch.clear(np.array([0]))
+        
+        self.assertEqual(batch.smooth(np.array([0, 1]), np.array([False, False])).tolist(), [False, True])
+
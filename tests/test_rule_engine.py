@@ -0,0 +1,154 @@
+import unittest
+import math
+import numpy as np
+import sys
+import os
+
+# Add the src directory to the path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from modules.eye_analyzer import EyeAnalyzer
+from modules.head_pose_analyzer import HeadPoseAnalyzer
+from modules.concentration_analyzer import ConcentrationAnalyzer
+from modules.landmark_features import FaceFeatures
+from modules.rule_engine import Rule, RuleEngine, HEAD_POSE_ANGLE_RULES
+
+PARAMS = {
+    'ear_threshold': 0.25,
+    'face_tilt_threshold': 15,
+    'head_pose_threshold': 0.028,
+    'gaze_ratio_threshold': 0.55,
+    'iris_alignment_threshold': 0.14,
+    'roll_threshold': 10.0,
+    'yaw_threshold': 20.0,
+    'vertical_gaze_threshold': 0.7
+}
+
+def legacy_decision(features):
+    """The original early-return decision chain over precomputed features."""
+    eye_analyzer = EyeAnalyzer(PARAMS['ear_threshold'])
+    head_analyzer = HeadPoseAnalyzer(PARAMS['face_tilt_threshold'], PARAMS['head_pose_threshold'])
+    concentration_analyzer = ConcentrationAnalyzer(PARAMS['gaze_ratio_threshold'],
+                                                   PARAMS['iris_alignment_threshold'])
+    
+    if eye_analyzer.eyes_closed(features.left_ear, features.right_ear):
+        return False, "Eyes Closed", 0.0
+    is_tilted, tilt_confidence = head_analyzer.classify_tilt(features.tilt)
+    if is_tilted:
+        return False, "Face Tilted", tilt_confidence
+    _, head_direction, _ = head_analyzer.classify_head_pose(features.iris_z_diff)
+    return concentration_analyzer.analyze_gaze_direction(
+        features.left_gaze_ratio, features.right_gaze_ratio, head_direction)
+
+class TestRuleEngine(unittest.TestCase):
+    """Test cases for RuleEngine class."""
+    
+    def setUp(self):
+        self.engine = RuleEngine()
+        rng = np.random.default_rng(1)
+        count = 2000
+        self.matrix = np.column_stack([
+            rng.uniform(0.1, 0.4, count),       # left_ear
+            rng.uniform(0.1, 0.4, count),       # right_ear
+            rng.uniform(0, 25, count),          # tilt
+            rng.uniform(0.2, 0.8, count),       # left_gaze_ratio
+            rng.uniform(0.2, 0.8, count),       # right_gaze_ratio
+            rng.uniform(-0.06, 0.06, count),    # iris_z_diff
+            np.zeros(count),                    # gaze_missing
+        ])
+    
+    def test_scalar_matches_legacy_chain(self):
+        """Test the default rules reproduce the original decisions exactly."""
+        for row in self.matrix:
+            features = FaceFeatures.from_vector(row)
+            self.assertEqual(self.engine.evaluate(features, PARAMS), legacy_decision(features))
+    
+    def test_batch_matches_scalar(self):
+        """Test the vectorized path agrees with the scalar path."""
+        concentrated, rule_index, confidence = self.engine.evaluate_batch(self.matrix, PARAMS)
+        reasons = self.engine.reasons
+        
+        for i, row in enumerate(self.matrix):
+            expected = self.engine.evaluate(FaceFeatures.from_vector(row), PARAMS)
+            self.assertEqual((bool(concentrated[i]), reasons[rule_index[i]]), expected[:2])
+            self.assertAlmostEqual(confidence[i], expected[2], places=12)
+    
+    def test_missing_measurements(self):
+        """Test missing landmarks and invalid measurements in both paths."""
+        rows = np.array([
+            [0.3, 0.3, math.nan, 0.5, 0.5, 0.0, 0.0],
+            [0.3, 0.3, 0.0, math.nan, math.nan, math.nan, 1.0],
+            [0.3, 0.3, 0.0, math.nan, 0.5, 0.0, 0.0],
+        ])
+        expected = ["Detection Error", "Detection Error", "Invalid Eye Measurements"]
+        
+        _, rule_index, _ = self.engine.evaluate_batch(rows, PARAMS)
+        
+        self.assertEqual([self.engine.reasons[i] for i in rule_index], expected)
+        self.assertEqual([self.engine.evaluate(FaceFeatures.from_vector(row), PARAMS)[1] for row in rows],
+                         expected)
+    
+    def test_head_pose_angle_rules(self):
+        """Test the angle rules use roll and yaw in degrees instead of pixel tilt and iris depth."""
+        engine = RuleEngine(HEAD_POSE_ANGLE_RULES)
+        rows = np.array([
+            [0.3, 0.3, 40.0, 0.5, 0.5, 0.05, 0.0, 0.0, 0.0, 2.0],      # large pixel tilt, level head
+            [0.3, 0.3, 0.0, 0.5, 0.5, 0.0, 0.0, 0.0, 0.0, -15.0],
+            [0.3, 0.3, 0.0, 0.4, 0.5, 0.0, 0.0, 30.0, 0.0, 0.0],
+            [0.3, 0.3, 0.0, 0.5, 0.6, 0.0, 0.0, -30.0, 0.0, 0.0],
+            [0.3, 0.3, 0.0, 0.5, 0.5, 0.0, 0.0, math.nan, math.nan, math.nan],
+        ])
+        expected = ["Eyes on screen", "Face Tilted", "Head: Left Turn", "Looking Right", "Detection Error"]
+        
+        _, rule_index, confidence = engine.evaluate_batch(rows, PARAMS)
+        
+        self.assertEqual([engine.reasons[i] for i in rule_index], expected)
+        for i, row in enumerate(rows):
+            scalar = engine.evaluate(FaceFeatures.from_vector(row), PARAMS)
+            self.assertEqual(scalar[1], expected[i])
+            self.assertAlmostEqual(confidence[i], scalar[2], places=12)
+    
+    def test_looking_down(self):
+        """Test the vertical gaze ratio flags looking down ahead of the horizontal gaze rules."""
+        rows = np.array([
+            [0.3, 0.3, 0.0, 0.5, 0.5, 0.0, 0.0, math.nan, math.nan, math.nan, 0.85, 0.8],
+            [0.3, 0.3, 0.0, 0.5, 0.5, 0.0, 0.0, math.nan, math.nan, math.nan, 0.5, 0.55],
+            [0.3, 0.3, 0.0, 0.5, 0.5, 0.0, 0.0, math.nan, math.nan, math.nan, math.nan, math.nan],
+        ])
+        expected = ["Looking Down", "Eyes on screen", "Eyes on screen"]
+        
+        _, rule_index, confidence = self.engine.evaluate_batch(rows, PARAMS)
+        
+        self.assertEqual([self.engine.reasons[i] for i in rule_index], expected)
+        for i, row in enumerate(rows):
+            features = FaceFeatures.from_vector(row)
+            scalar = self.engine.evaluate(features, PARAMS)
+            self.assertEqual(scalar[1], expected[i])
+            self.assertAlmostEqual(confidence[i], scalar[2], places=12)
+        self.assertAlmostEqual(confidence[0], 0.75)
+        
+        analyzer = ConcentrationAnalyzer(vertical_gaze_threshold=0.7)
+        self.assertEqual(analyzer.analyze_gaze_direction(0.5, 0.5, "center", 0.825)[:2], (False, "Looking Down"))
+    
+    def test_add_rule(self):
+        """Test adding a rule ahead of an existing one."""
+        self.engine.add_rule(Rule("Very Wide Eyes", False,
+                                  lambda f, p, ops: (f.left_ear > 0.35) & (f.right_ear > 0.35),
+                                  lambda f, p, ops: 0.5),
+                             before="Face Tilted")
+        features = FaceFeatures(0.38, 0.38, 20.0, 0.5, 0.5, 0.0, 0.0)
+        
+        self.assertEqual(self.engine.evaluate(features, PARAMS), (False, "Very Wide Eyes", 0.5))
+        concentrated, rule_index, confidence = self.engine.evaluate_batch(np.array([features]), PARAMS)
+        self.assertEqual(self.engine.reasons[rule_index[0]], "Very Wide Eyes")
+        self.assertEqual(confidence[0], 0.5)
+    
+    def test_no_rule_matches(self):
+        """Test the fallback when no rule matches."""
+        engine = RuleEngine([Rule("Never", True, lambda f, p, ops: f.tilt < 0)])
+        features = FaceFeatures(0.3, 0.3, 1.0, 0.5, 0.5, 0.0, 0.0)
+        
+        self.assertEqual(engine.evaluate(features, PARAMS), (False, "Detection Error", 0.0))
+        concentrated, rule_index, _ = engine.evaluate_batch(np.array([features]), PARAMS)
+        self.assertEqual(rule_index[0], -1)
+        self.assertFalse(concentrated[0])
@@ -0,0 +1,79 @@
+import unittest
+import sys
+import os
+import time
+import threading
+
+# Add the src directory to the path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from modules.runtime_tuning import (CoreLayout, available_cores, benchmark_layout, plan_layouts,
+                                    pin_thread, set_opencv_threads)
+
+def sleep_workload():
+    return lambda: time.sleep(0.005)
+
+def failing_workload():
+    raise RuntimeError("No face detected in 30 benchmark frames")
+
+class TestRuntimeTuning(unittest.TestCase):
+    """Test cases for the runtime thread and affinity controls."""
+    
+    def test_plan_splits_cores(self):
+        """Test cores are split into disjoint contiguous shares."""
+        layouts = plan_layouts(3, cores=range(8))
+        
+        self.assertEqual([layout.cores for layout in layouts], [(0, 1), (2, 3, 4), (5, 6, 7)])
+        self.assertEqual([layout.opencv_threads for layout in layouts], [2, 3, 3])
+    
+    def test_plan_reserve_and_oversubscription(self):
+        """Test reserved cores are skipped and extra instances share cores."""
+        layouts = plan_layouts(3, cores=[0, 1, 2], reserve=1, opencv_threads=1)
+        
+        self.assertEqual(layouts, [CoreLayout((1,), 1), CoreLayout((2,), 1), CoreLayout((1,), 1)])
+        with self.assertRaises(ValueError):
+            plan_layouts(1, cores=[0], reserve=1)
+        with self.assertRaises(ValueError):
+            plan_layouts(0)
+    
+    def test_set_opencv_threads(self):
+        """Test the previous thread count is returned so it can be restored."""
+        previous = set_opencv_threads(1)
+        try:
+            self.assertEqual(set_opencv_threads(previous), 1)
+        finally:
+            set_opencv_threads(previous)
+    
+    @unittest.skipUnless(hasattr(os, 'sched_setaffinity'), "CPU affinity not supported")
+    def test_pin_thread_affects_only_that_thread(self):
+        """Test pinning a worker thread leaves the calling thread's mask alone."""
+        cores = available_cores()
+        seen = []
+        
+        def worker():
+            seen.append(pin_thread(cores[:1]))
+            seen.append(os.sched_getaffinity(threading.get_native_id()))
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+        
+        self.assertEqual(seen, [True, {cores[0]}])
+        self.assertEqual(sorted(os.sched_getaffinity(0)), cores)
+        self.assertFalse(pin_thread(()))
+    
+    def test_benchmark_layout(self):
+        """Test instances run concurrently and report throughput and latency."""
+        result = benchmark_layout([CoreLayout((), 1)] * 2, duration=0.3, workload=sleep_workload)
+        
+        self.assertEqual(result.instances, 2)
+        self.assertFalse(result.pinned)
+        self.assertGreater(result.total_fps, result.fps_per_instance)
+        self.assertGreaterEqual(result.p95_latency, 0.005)
+
+    def test_benchmark_layout_reports_workload_errors(self):
+        """Test a workload failing during warm-up stops the benchmark instead of timing nothing."""
+        with self.assertRaisesRegex(RuntimeError, "No face detected"):
+            benchmark_layout([CoreLayout((), 1)] * 2, failing_workload, duration=0.3)
+
+if __name__ == '__main__':
+    unittest.main()
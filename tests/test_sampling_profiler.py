@@ -0,0 +1,74 @@
+import unittest
+import os
+import sys
+import tempfile
+import threading
+import time
+
+# Add the src directory to the path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from modules.sampling_profiler import SamplingProfiler
+
+def busy_wait(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+class TestSamplingProfiler(unittest.TestCase):
+    """Test cases for SamplingProfiler class."""
+    
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.profiler = SamplingProfiler(interval=0.002, output_dir=self.tmpdir.name)
+    
+    def test_profiles_thread_for_duration(self):
+        """Test a timed profile samples the target thread and writes collapsed stacks."""
+        self.assertTrue(self.profiler.start(duration=0.2, thread_id=threading.get_ident()))
+        busy_wait(0.3)
+        path = self.profiler.stop()
+        
+        self.assertTrue(os.path.exists(path))
+        with open(path) as profile:
+            lines = profile.read().splitlines()
+        self.assertGreater(self.profiler.samples, 10)
+        self.assertTrue(any("busy_wait (test_sampling_profiler.py" in line for line in lines))
+        for line in lines:
+            stack, count = line.rsplit(" ", 1)
+            self.assertTrue(stack.startswith("MainThread;"))
+            self.assertGreater(int(count), 0)
+    
+    def test_all_threads_excludes_sampler(self):
+        """Test sampling every thread includes workers but not the sampler itself."""
+        stop = threading.Event()
+        worker = threading.Thread(target=stop.wait, name="Worker")
+        worker.start()
+        self.profiler.start()
+        time.sleep(0.05)
+        self.profiler.stop()
+        stop.set()
+        worker.join()
+        
+        roots = {stack.split(";")[0] for stack in self.profiler.stacks}
+        self.assertIn("Worker", roots)
+        self.assertNotIn("SamplingProfiler", roots)
+    
+    def test_start_while_running(self):
+        """Test a second start is refused while a profile is running."""
+        self.profiler.start()
+        self.assertFalse(self.profiler.start())
+        self.profiler.stop()
+        self.assertFalse(self.profiler.running)
+    
+    def test_explicit_output_path(self):
+        """Test profiles can be written to a chosen path."""
+        path = os.path.join(self.tmpdir.name, "nested", "run.collapsed")
+        self.profiler.start(output_path=path)
+        time.sleep(0.02)
+        
+        self.assertEqual(self.profiler.stop(), path)
+        self.assertTrue(os.path.exists(path))
+
+if __name__ == '__main__':
+    unittest.main()
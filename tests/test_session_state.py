@@ -0,0 +1,42 @@
+import unittest
+import numpy as np
+import sys
+import os
+
+# Add the src directory to the path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from modules.session_state import decode_state, encode_state, pack_array, unpack_array
+
+class TestSessionState(unittest.TestCase):
+    """Test cases for the session snapshot encoding."""
+    
+    def test_arrays_round_trip_exactly(self):
+        """Test packed arrays come back with the same dtype, shape and values."""
+        arrays = [np.cumsum(np.random.default_rng(0).random(500)) + 1e6,
+                  np.arange(12, dtype=np.int64).reshape(3, 4),
+                  np.full((6, 8), 7, dtype=np.uint8),
+                  np.empty((0, 3))]
+        for array in arrays:
+            restored = unpack_array(pack_array(array))
+            self.assertEqual(restored.dtype, array.dtype)
+            np.testing.assert_array_equal(restored, array)
+    
+    def test_timestamps_compress(self):
+        """Test a run of frame timestamps packs to well under its raw size."""
+        timestamps = 1000 + np.arange(9000) / 30
+        
+        self.assertLess(len(pack_array(timestamps)['data']), timestamps.nbytes / 4)
+    
+    def test_state_round_trip_and_validation(self):
+        """Test encoded state decodes to the same dict and foreign data is rejected."""
+        state = {'history': [True, False], 'clock': 12.5, 'faces': {'0': None}}
+        data = encode_state(state)
+        
+        self.assertEqual(decode_state(data), state)
+        for invalid in (b'', b'GZ', b'XYZ\x01' + data[4:], data[:3] + b'\x09' + data[4:], data[:-4]):
+            with self.assertRaises(ValueError):
+                decode_state(invalid)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+import unittest
+import numpy as np
+import sys
+import os
+
+# Add the src directory to the path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from modules.landmark_features import (LANDMARK_INDICES, F_LEFT_EAR, F_RIGHT_EAR, F_TILT, F_LEFT_GAZE,
+                                       F_RIGHT_GAZE, F_IRIS_Z_DIFF, extract_features, gather_landmarks)
+from modules.head_pose_estimator import HeadPoseEstimator
+from modules.synthetic_landmarks import (SyntheticFaceGenerator, NUM_LANDMARKS, concat_tracks)
+
+WIDTH, HEIGHT = 640, 480
+
+class TestSyntheticLandmarks(unittest.TestCase):
+    """Test cases for SyntheticFaceGenerator."""
+    
+    def setUp(self):
+        self.generator = SyntheticFaceGenerator(seed=3)
+    
+    def features(self, track, **kwargs):
+        points = self.generator.render(track, indices=LANDMARK_INDICES, **kwargs)
+        return extract_features(points, WIDTH, HEIGHT)
+    
+    def test_shapes(self):
+        """Test full and gathered renders have the expected shapes."""
+        track = self.generator.steady(10)
+        
+        self.assertEqual(self.generator.render(track).shape, (10, NUM_LANDMARKS, 3))
+        self.assertEqual(self.generator.render(track, indices=LANDMARK_INDICES).shape,
+                         (10, len(LANDMARK_INDICES), 3))
+    
+    def test_gathered_render_matches_full(self):
+        """Test rendering a subset gives the same points as gathering from the full mesh."""
+        track = self.generator.head_turn(20)
+        full = self.generator.render(track)
+        
+        np.testing.assert_allclose(self.generator.render(track, indices=LANDMARK_INDICES),
+                                   full[:, LANDMARK_INDICES])
+    
+    def test_steady_face_is_attentive(self):
+        """Test a steady face has open eyes, level head and centered gaze."""
+        features = self.features(self.generator.steady(300))
+        
+        self.assertTrue(np.all(features[:, F_LEFT_EAR] > 0.25))
+        self.assertTrue(np.all(features[:, F_TILT] < 15))
+        self.assertTrue(np.all(np.abs(features[:, F_LEFT_GAZE] - features[:, F_RIGHT_GAZE]) < 0.14))
+        self.assertTrue(np.all(np.abs(features[:, F_IRIS_Z_DIFF]) < 0.028))
+    
+    def test_blinks(self):
+        """Test blinks close both eyes for a few frames at roughly the requested rate."""
+        track = self.generator.with_blinks(self.generator.steady(30 * 60), rate_per_minute=20)
+        features = self.features(track)
+        closed = (features[:, F_LEFT_EAR] < 0.25) & (features[:, F_RIGHT_EAR] < 0.25)
+        onsets = np.count_nonzero(closed[1:] & ~closed[:-1])
+        
+        self.assertGreater(onsets, 8)
+        self.assertLess(onsets, 35)
+        self.assertLess(closed.mean(), 0.2)
+    
+    def test_gaze_sweep(self):
+        """Test a gaze sweep moves the gaze ratios in opposite directions."""
+        features = self.features(self.generator.gaze_sweep(120, amplitude=0.25))
+        difference = features[:, F_LEFT_GAZE] - features[:, F_RIGHT_GAZE]
+        
+        self.assertGreater(difference.max(), 0.4)
+        self.assertLess(difference.min(), -0.4)
+    
+    def test_head_pose_matches_track(self):
+        """Test solvePnP recovers the generated head pose."""
+        track = concat_tracks(self.generator.head_turn(90), self.generator.tilt(90))
+        points = self.generator.render(track, indices=LANDMARK_INDICES)
+        estimator = HeadPoseEstimator()
+        
+        poses = np.array([estimator.estimate(face, WIDTH, HEIGHT) for face in points])
+        
+        np.testing.assert_allclose(poses[:, 0], track.yaw, atol=1.5)
+        np.testing.assert_allclose(poses[:, 2], track.roll, atol=1.5)
+    
+    def test_occlusion_and_multiple_faces(self):
+        """Test occluded faces become NaN and are dropped from FaceMesh-style results."""
+        tracks = [self.generator.steady(50, center_x=0.3), self.generator.steady(50, center_x=0.7)]
+        occluded = [np.zeros(50, dtype=bool), np.arange(50) < 10]
+        
+        faces = self.generator.render_faces(tracks, occluded)
+        results = list(self.generator.to_results(faces))
+        
+        self.assertEqual(faces.shape, (50, 2, NUM_LANDMARKS, 3))
+        self.assertEqual(len(results[0].multi_face_landmarks), 1)
+        self.assertEqual(len(results[20].multi_face_landmarks), 2)
+        np.testing.assert_allclose(gather_landmarks(results[20].multi_face_landmarks[1]),
+                                   faces[20, 1, LANDMARK_INDICES])
+    
+    def test_occlusion_mask(self):
+        """Test occlusion drop-outs cover a small share of frames."""
+        mask = self.generator.occlusions(30 * 600, rate_per_minute=2, mean_duration=0.5)
+        
+        self.assertGreater(mask.mean(), 0)
+        self.assertLess(mask.mean(), 0.1)
+    
+    def test_noise(self):
+        """Test noise jitters landmarks by roughly the requested amount."""
+        track = self.generator.steady(200)
+        clean = self.generator.render(track, indices=LANDMARK_INDICES)
+        noisy = SyntheticFaceGenerator(seed=3).render(track, indices=LANDMARK_INDICES, noise=0.002)
+        
+        self.assertAlmostEqual(np.std(noisy - clean), 0.002, delta=0.0003)
+    
+    def test_seeded_sequences_repeat(self):
+        """Test the same seed reproduces the same sequence."""
+        first = SyntheticFaceGenerator(seed=7).render(SyntheticFaceGenerator(seed=7).steady(5))
+        second = SyntheticFaceGenerator(seed=7).render(SyntheticFaceGenerator(seed=7).steady(5))
+        
+        np.testing.assert_array_equal(first, second)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+import unittest
+import numpy as np
+import sys
+import os
+import time
+import threading
+from unittest.mock import Mock
+
+# Add the src directory to the path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from modules.threaded_frame_reader import ThreadedFrameReader
+
+class FakeCamera:
+    """Camera returning a fixed number of numbered frames, released one at a time."""
+    def __init__(self, num_frames=3):
+        self.remaining = num_frames
+        self.release_frame = threading.Semaphore(0)
+        self.fps = None
+    
+    def read_frame(self):
+        self.release_frame.acquire()
+        if self.remaining == 0:
+            return False, None
+        self.remaining -= 1
+        return True, np.full((4, 4, 3), self.remaining, dtype=np.uint8)
+    
+    def get_dimensions(self):
+        return 4, 4
+
+class TestThreadedFrameReader(unittest.TestCase):
+    """Test cases for ThreadedFrameReader class."""
+    
+    def setUp(self):
+        self.camera = FakeCamera()
+        self.reader = ThreadedFrameReader(self.camera)
+        self.addCleanup(self.stop_reader)
+    
+    def stop_reader(self):
+        for _ in range(5):
+            self.camera.release_frame.release()
+        self.reader.stop()
+    
+    def test_latest_before_capture(self):
+        """Test latest() returns None when nothing was captured yet."""
+        self.reader.start()
+        self.assertIsNone(self.reader.latest())
+    
+    def test_next_returns_timestamped_packets(self):
+        """Test next() blocks for new frames and stamps them."""
+        self.reader.start()
+        
+        self.camera.release_frame.release()
+        first = self.reader.next(timeout=1.0)
+        self.camera.release_frame.release()
+        second = self.reader.next(timeout=1.0)
+        
+        self.assertEqual(first.sequence, 1)
+        self.assertEqual(second.sequence, 2)
+        self.assertGreater(second.timestamp, first.timestamp)
+    
+    def test_next_times_out_without_new_frame(self):
+        """Test next() does not return the same frame twice."""
+        self.reader.start()
+        self.camera.release_frame.release()
+        self.assertIsNotNone(self.reader.next(timeout=1.0))
+        
+        self.assertIsNone(self.reader.next(timeout=0.05))
+    
+    def test_counts_consumer_drops(self):
+        """Test frames overwritten before being consumed are counted."""
+        self.reader.start()
+        self.camera.release_frame.release()
+        self.camera.release_frame.release()
+        
+        # Wait until both frames were captured
+        deadline = time.monotonic() + 5.0
+        while self.reader.get_stats()['frames_captured'] < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.reader.get_stats()['frames_captured'], 2)
+        packet = self.reader.latest()
+        
+        self.assertEqual(packet.sequence, 2)
+        self.assertEqual(self.reader.get_stats()['dropped_by_consumer'], 1)
+    
+    def test_read_failure_stops_reader(self):
+        """Test a failed read marks the reader as failed."""
+        self.camera.remaining = 0
+        self.reader.start()
+        self.camera.release_frame.release()
+        
+        self.assertIsNone(self.reader.next(timeout=1.0))
+        self.assertTrue(self.reader.failed)
+    
+    def test_set_resolution_delegates_to_camera(self):
+        """Test resolution changes are forwarded to the camera."""
+        camera = Mock()
+        camera.fps = 30
+        camera.set_resolution.return_value = (320, 240)
+        reader = ThreadedFrameReader(camera)
+        
+        self.assertEqual(reader.set_resolution(320, 240), (320, 240))
+        camera.set_resolution.assert_called_once_with(320, 240)
+    
+    def test_pacing_releases_frames_at_source_rate(self):
+        """Test a paced reader spaces capture times by the frame interval instead of reading ahead."""
+        camera = Mock(cpu_cores=())
+        camera.read_frame.side_effect = [(True, np.zeros((4, 4, 3), dtype=np.uint8))] * 5 + [(False, None)]
+        reader = ThreadedFrameReader(camera, expected_fps=50, pace=True)
+        
+        started = time.perf_counter()
+        reader.start()
+        packets = []
+        while (packet := reader.next(timeout=1.0)) is not None:
+            packets.append(packet)
+        reader.stop()
+        
+        self.assertGreaterEqual(time.perf_counter() - started, 0.08)
+        self.assertEqual(packets[-1].sequence, 5)
+        steps = [(b.timestamp - a.timestamp) / (b.sequence - a.sequence) for a, b in zip(packets, packets[1:])]
+        for step in steps:
+            self.assertAlmostEqual(step, 0.02)
+        with self.assertRaises(ValueError):
+            ThreadedFrameReader(Mock(fps=None), pace=True)
+    
+    def test_set_fps_updates_frame_interval(self):
+        """Test frame rate changes reach the camera and the drop estimate."""
+        camera = Mock()
+        camera.fps = 30
+        camera.set_fps.return_value = 5
+        reader = ThreadedFrameReader(camera)
+        
+        self.assertEqual(reader.set_fps(5), 5)
+        self.assertAlmostEqual(reader.frame_interval, 0.2)
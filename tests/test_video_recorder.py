@@ -0,0 +1,115 @@
+import unittest
+import numpy as np
+import sys
+import os
+import tempfile
+import threading
+
+# Add the src directory to the path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from modules.video_recorder import VideoRecorder
+
+class FakeWriter:
+    """Collects written frame values per clip; can be held to simulate a slow encoder."""
+    def __init__(self, clips, path, gate):
+        self.frames = clips.setdefault(path, [])
+        self.gate = gate
+        self.released = False
+    
+    def write(self, frame):
+        self.gate.wait()
+        self.frames.append(int(frame[0, 0, 0]))
+    
+    def release(self):
+        self.released = True
+
+def numbered(i):
+    return np.full((4, 6, 3), i, dtype=np.uint8)
+
+class TestVideoRecorder(unittest.TestCase):
+    """Test cases for VideoRecorder class."""
+    
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.clips = {}
+        self.gate = threading.Event()
+        self.gate.set()
+    
+    def make_recorder(self, **kwargs):
+        factory = lambda path, width, height: FakeWriter(self.clips, path, self.gate)
+        return VideoRecorder(self.tmpdir.name, fps=10, writer_factory=factory, **kwargs).start()
+    
+    def test_continuous_recording(self):
+        """Test every frame is written in order after begin_event."""
+        recorder = self.make_recorder(pool_size=20)
+        recorder.begin_event(0.0)
+        for i in range(20):
+            self.assertTrue(recorder.submit(numbered(i), i * 0.1))
+        recorder.close()
+        
+        self.assertEqual(list(self.clips.values()), [list(range(20))])
+        self.assertEqual(recorder.get_stats()['dropped_frames'], 0)
+    
+    def test_frames_are_copied(self):
+        """Test the caller may reuse its frame right after submit."""
+        recorder = self.make_recorder()
+        recorder.begin_event(0.0)
+        frame = numbered(7)
+        recorder.submit(frame, 0.0)
+        frame[:] = 0
+        recorder.close()
+        
+        self.assertEqual(list(self.clips.values()), [[7]])
+    
+    def test_pre_and_post_roll(self):
+        """Test a clip holds the pre-roll and ends post_roll seconds after the event."""
+        recorder = self.make_recorder(pre_roll=0.5, post_roll=0.35)
+        for i in range(20):
+            recorder.submit(numbered(i), i * 0.1)
+        self.assertFalse(self.clips)
+        
+        recorder.trigger(1.9)
+        for i in range(20, 30):
+            recorder.submit(numbered(i), i * 0.1)
+        recorder.close()
+        
+        self.assertEqual(list(self.clips.values()), [list(range(15, 23))])
+        self.assertEqual(recorder.get_stats()['clips'], 1)
+    
+    def test_drops_instead_of_blocking(self):
+        """Test frames are dropped and counted while the encoder is stalled."""
+        self.gate.clear()
+        recorder = self.make_recorder(pool_size=4)
+        recorder.begin_event(0.0)
+        
+        accepted = [recorder.submit(numbered(i), i * 0.1) for i in range(10)]
+        
+        self.assertEqual(sum(accepted), 4)
+        self.assertEqual(recorder.get_stats()['dropped_frames'], 6)
+        self.gate.set()
+        recorder.close()
+        self.assertEqual(list(self.clips.values()), [[0, 1, 2, 3]])
+    
+    def test_frames_paced_by_timestamp(self):
+        """Test slow frames are repeated and fast frames skipped so the clip keeps real time."""
+        recorder = self.make_recorder(pool_size=20)
+        recorder.begin_event(0.0)
+        # 5 FPS, then about 30 FPS, into a 10 FPS clip
+        timestamps = [0.0, 0.2, 0.4, 0.43, 0.46, 0.5, 0.53, 0.56, 0.6]
+        for i, timestamp in enumerate(timestamps):
+            recorder.submit(numbered(i), timestamp)
+        recorder.close()
+        
+        self.assertEqual(list(self.clips.values()), [[0, 1, 1, 2, 2, 4, 7]])
+        stats = recorder.get_stats()
+        self.assertEqual((stats['repeated_frames'], stats['skipped_frames']), (2, 4))
+    
+    def test_pool_must_exceed_pre_roll(self):
+        """Test a pool too small for the pre-roll is rejected."""
+        with self.assertRaises(ValueError):
+            VideoRecorder(self.tmpdir.name, fps=10, pre_roll=1.0, pool_size=10)
+
+if __name__ == '__main__':
+    unittest.main()